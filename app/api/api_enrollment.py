@@ -11,6 +11,8 @@ from app.api.routes.employer_payment_method.endpoints import \
     router as employer_payment_method
 from app.api.routes.employer_type.endpoints import router as employer_type
 from app.api.routes.health.endpoints import router as health
+from app.api.routes.internal.endpoints import router as internal
+from app.api.routes.metrics.endpoints import router as metrics
 from app.api.routes.payment_history.endpoints import router as payment_history
 from app.api.routes.payment_status_type.endpoints import \
     router as payment_status_type
@@ -27,6 +29,8 @@ router.include_router(employer)
 router.include_router(employer_payment_method)
 router.include_router(employer_type)
 router.include_router(health)
+router.include_router(internal)
+router.include_router(metrics)
 router.include_router(payment_history)
 router.include_router(payment_status_type)
 router.include_router(role)
@@ -1,20 +1,206 @@
-from fastapi import Depends
+from typing import Any, List, Optional, Type
+
+from fastapi import Depends, Query, Request, Response
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import PositiveInt
 
 
 from app import crud
 from app.constansts.constants_session import ConstantSessionStatus
+from app.db.base import Base
+from app.db.reference_data import reference_data
+from app.db.search_index import normalize, rank
+from app.middleware.middleware_compression import SCOPE_KEY as COMPRESSION_SCOPE_KEY
+from app.security.permissions import check_role
+from app.security.principal import Principal, principal_cache
 from app.security.tokens import decode_jwt
-from app.utils.exceptions.common_exceptions import HTTPUnauthorizedException
+from app.utils.etag import etag_matches
+from app.utils.exceptions.common_exceptions import HTTPNotModifiedException, HTTPUnauthorizedException
+from app.utils.pagination import SEARCH_RANK, encode_cursor
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_session(token: str = Depends(oauth2_schema)):
+def get_session(token: str = Depends(oauth2_schema)) -> Principal:
+    """
+    Get the principal of the bearer token, cached by token to skip session and role lookups
+    """
     data = decode_jwt(token)
     if not data:
         raise HTTPUnauthorizedException()
-    session = crud.session.get_by_attribute(order_by="creation_date", desc=True, user_id=data.get("user_id"))
-    if not session or session.token != token or session.status == ConstantSessionStatus.logged_out:
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    result = crud.session.get_by_token_with_role(token)
+    if not result:
+        raise HTTPUnauthorizedException()
+    session, role_name = result
+    if (
+        session.token != token
+        or session.user_id != data.get("user_id")
+        or session.status == ConstantSessionStatus.logged_out
+    ):
         raise HTTPUnauthorizedException()
-    return session
+    principal = Principal(
+        id=session.id,
+        token=session.token,
+        status=session.status,
+        user_id=session.user_id,
+        role=role_name,
+    )
+    principal_cache.set(token, principal)
+    return principal
+
+
+def parse_include(include: Optional[str]) -> List[str]:
+    """
+    Split the `include` parameter into relationship names
+    """
+    if not include:
+        return []
+    return [name.strip() for name in include.split(",") if name.strip()]
+
+
+class CursorPagination:
+    """
+    Keyset pagination parameters, the cursor of the next page is returned in `X-Next-Cursor` header
+    """
+
+    header = "X-Next-Cursor"
+
+    def __init__(
+        self,
+        response: Response,
+        after: Optional[str] = Query(
+            None,
+            description="The cursor of the page to fetch, taken from `X-Next-Cursor` header of the previous page",
+        ),
+        limit: PositiveInt = Query(
+            100,
+            description="The amount of the objects per page to fetch\n\n"
+            "**Note:** must be a positive integer",
+        ),
+        order_by: str = Query(
+            "id",
+            description="The indexed parameter to sort the objects by",
+        ),
+    ):
+        self.response = response
+        self.after = after
+        self.limit = limit
+        self.order_by = order_by
+
+    @property
+    def fetch_limit(self) -> int:
+        """
+        The amount of objects to fetch, one over the page size tells whether there is a next page
+        """
+        return self.limit + 1
+
+    def paginate(self, objs: List[Base], limit: Optional[int] = None) -> List[Base]:
+        """
+        Cut the objects fetched with one extra to the page, the cursor is set only if the extra one was found
+        """
+        limit = limit or self.limit
+        if len(objs) > limit:
+            objs = objs[:limit]
+            last_obj = objs[-1]
+            self.response.headers[self.header] = encode_cursor(
+                self.order_by, getattr(last_obj, self.order_by), last_obj.id
+            )
+        return objs
+
+
+class SearchPagination(CursorPagination):
+    """
+    Pagination of search results, sorted by relevance unless another indexed parameter is given
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        after: Optional[str] = Query(
+            None,
+            description="The cursor of the page to fetch, taken from `X-Next-Cursor` header of the previous page",
+        ),
+        limit: PositiveInt = Query(
+            100,
+            description="The amount of the objects per page to fetch\n\n"
+            "**Note:** must be a positive integer",
+        ),
+        order_by: str = Query(
+            SEARCH_RANK,
+            description="The indexed parameter to sort the objects by, `rank` sorts by relevance",
+        ),
+        # declared and documented by the search route, the rank cursor holds the rank of the last result
+        parameter: str = Query(..., include_in_schema=False),
+        keyword: str = Query(..., include_in_schema=False),
+    ):
+        super().__init__(response, after, limit, order_by)
+        self.parameter = parameter
+        self.keyword = keyword
+
+    def paginate(self, objs: List[Base], limit: Optional[int] = None) -> List[Base]:
+        if self.order_by != SEARCH_RANK:
+            return super().paginate(objs, limit)
+        limit = limit or self.limit
+        if len(objs) > limit:
+            objs = objs[:limit]
+            last_obj = objs[-1]
+            self.response.headers[self.header] = encode_cursor(
+                SEARCH_RANK,
+                list(rank(normalize(self.keyword), normalize(self.searched_value(last_obj)))),
+                last_obj.id,
+            )
+        return objs
+
+    def searched_value(self, obj: Base) -> Any:
+        """
+        Get the searched value of the object, the parameters of its user are read from the user
+        like the search query of employees and employers joins them
+        """
+        if hasattr(type(obj), self.parameter):
+            return getattr(obj, self.parameter)
+        return getattr(obj.user, self.parameter)
+
+
+class HTTPCache:
+    """
+    Cache policy of a router: `Cache-Control` of its GET responses, which are given a weak ETag of their content
+    and answered with 304 on a matching `If-None-Match` (see ETagMiddleware)
+    """
+
+    def __init__(self, cache_control: str):
+        self.cache_control = cache_control
+
+    def __call__(self, request: Request, response: Response) -> None:
+        if request.method == "GET":
+            response.headers["Cache-Control"] = self.cache_control
+            response.headers["Vary"] = "Authorization"
+
+
+class ReferenceETag:
+    """
+    ETag of the routes served from the reference data cache: the version of the cached table.
+    A matching `If-None-Match` is answered with 304 before the route is called, without a database query
+    """
+
+    def __init__(self, model: Type[Base]):
+        self.model = model
+
+    def __call__(self, request: Request, response: Response, session: Principal = Depends(get_session)) -> None:
+        etag = reference_data.etag(self.model)
+        response.headers["ETag"] = etag
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            # the role check of the route is skipped along with the route
+            allowed_roles = getattr(request.scope.get("endpoint"), "allowed_roles", None)
+            if allowed_roles is not None:
+                check_role(session, allowed_roles)
+            raise HTTPNotModifiedException(headers=dict(response.headers))
+
+
+def skip_compression(request: Request) -> None:
+    """
+    Send the responses of the route uncompressed (see CompressionMiddleware)
+    """
+    request.scope[COMPRESSION_SCOPE_KEY] = False
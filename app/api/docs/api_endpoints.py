@@ -13,3 +13,6 @@ class CRUDEndpointsDescriptions:
         self.update = f"""**Note:** update the {model_name} in the database"""
         self.fetch_one = f""" **Note:** fetch a single {model_name} by **ID** from the database"""
         self.delete = f"""**Note:** delete the {model_name} from the database"""
+        self.create_many = f"""**Note:** create {model_name}s in the database in a single transaction"""
+        self.update_many = f"""**Note:** update {model_name}s in the database in a single transaction"""
+        self.delete_many = f"""**Note:** delete {model_name}s by **IDs** from the database in a single transaction"""
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from fastapi import Path, Query
 
 
@@ -43,6 +45,13 @@ class CRUDParamsDescriptions:
     def max_results_search(self):
         return Query(
             None,
-            description=f"The total amount of the {self.obj_name}s matching search parameters to fetch\n\n"
+            description=f"The total amount of the {self.obj_name}s matching search parameters to fetch, overrides `limit`\n\n"
             "**Note:** must be a positive integer",
         )
+
+    def include(self, relationships: Iterable[str]):
+        return Query(
+            None,
+            description=f"The comma separated relationships of the {self.obj_name} to load with it: "
+            f"**{', '.join(relationships)}**",
+        )
@@ -4,27 +4,41 @@ from fastapi import Depends, status
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import AccountType
 from app.manager.manager_account_type import account_type
 from app.schemas.schema_account_type import AccountTypeResponse, AccountTypeCreate, AccountTypeUpdate
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Account Type"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Account Type"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
+)
 descriptions = CRUDEndpointsDescriptions(model_name="AccountType", search_parameters=["name"])
 parameters = CRUDParamsDescriptions(obj_name="AccountType")
 
 
-@router.get("/account_type", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/account_type",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(AccountType))],
+)
 @permission({ConstantRole.admin})
 def fetch_account_types(
-    session: Session = Depends(get_session)
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[AccountTypeResponse]:
-    return account_type.fetch_all(session)
+    return pagination.paginate(
+        account_type.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
 
 
 @router.get("/account_type/search", status_code=status.HTTP_200_OK, description=descriptions.search)
@@ -33,16 +47,21 @@ def search_account_types(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[AccountTypeResponse]:
-    return account_type.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        account_type.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/account_type", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.admin})
 def create_account_type(
     account_type_in: AccountTypeCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> AccountTypeResponse:
     return account_type.create(account_type_in, session)
 
@@ -51,16 +70,21 @@ def create_account_type(
 @permission({ConstantRole.admin})
 def update_account_type(
     account_type_in: AccountTypeUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> AccountTypeResponse:
     return account_type.update(account_type_in, session)
 
 
-@router.get("/account_type/{account_type_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
+@router.get(
+    "/account_type/{account_type_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(AccountType))],
+)
 @permission({ConstantRole.admin})
 def fetch_account_type(
     account_type_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> AccountTypeResponse:
     return account_type.fetch_one(account_type_id, session)
 
@@ -69,6 +93,6 @@ def fetch_account_type(
 @permission({ConstantRole.admin})
 def delete_account_type(
     account_type_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return account_type.delete(account_type_id, session)
\ No newline at end of file
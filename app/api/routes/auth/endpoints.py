@@ -11,8 +11,8 @@ router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Authenticatio
 
 
 @router.post("/auth/login", status_code=status.HTTP_201_CREATED)
-def login(data: OAuth2PasswordRequestForm = Depends()) -> Token:
-    return AuthManager.login(data)
+async def login(data: OAuth2PasswordRequestForm = Depends()) -> Token:
+    return await AuthManager.login(data)
 
 
 @router.get("/auth/logout", status_code=status.HTTP_200_OK)
@@ -2,29 +2,48 @@ from typing import List, Optional
 
 from fastapi import Depends, status
 from fastapi_utils.inferring_router import InferringRouter
-from pydantic import PositiveInt
+from pydantic import PositiveInt, conlist
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, SearchPagination, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import Bank
 from app.manager.manager_bank import bank
 from app.schemas.schema_bank import BankCreate, BankResponse, BankUpdate
+from app.schemas.schema_bulk import BULK_MAX_ITEMS, BulkDelete, BulkResponse
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.responses import SerializedResponse
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Bank"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Bank"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
+)
 descriptions = CRUDEndpointsDescriptions(
     model_name="Bank", search_parameters=["name", "mfo"]
 )
 parameters = CRUDParamsDescriptions(obj_name="Bank")
 
 
-@router.get("/bank", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/bank",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(Bank))],
+)
 @permission({ConstantRole.employer})
-def fetch_banks(session: Session = Depends(get_session)) -> List[BankResponse]:
-    return bank.fetch_all(session)
+def fetch_banks(
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[BankResponse]:
+    objs = pagination.paginate(
+        bank.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
+    return SerializedResponse(objs, BankResponse, headers=pagination.response.headers)
 
 
 @router.get("/bank/search", status_code=status.HTTP_200_OK)
@@ -33,16 +52,21 @@ def search_banks(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: SearchPagination = Depends(),
 ) -> List[BankResponse]:
-    return bank.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        bank.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/bank", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.employer})
 def create_bank(
     bank_in: BankCreate,
-    session: Session = Depends(get_session)
+    session: Principal = Depends(get_session)
 ) -> BankResponse:
     return bank.create(bank_in, session)
 
@@ -51,20 +75,48 @@ def create_bank(
 @permission({ConstantRole.employer})
 def update_bank(
     bank_in: BankUpdate,
-    session: Session = Depends(get_session)
+    session: Principal = Depends(get_session)
 ) -> BankResponse:
     return bank.update(bank_in, session)
 
 
+@router.post("/bank/bulk", status_code=status.HTTP_201_CREATED, description=descriptions.create_many)
+@permission({ConstantRole.employer})
+def create_banks(
+    banks_in: conlist(BankCreate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=bank.create_many(banks_in, session))
+
+
+@router.put("/bank/bulk", status_code=status.HTTP_200_OK, description=descriptions.update_many)
+@permission({ConstantRole.employer})
+def update_banks(
+    banks_in: conlist(BankUpdate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=bank.update_many(banks_in, session))
+
+
+@router.delete("/bank/bulk", status_code=status.HTTP_204_NO_CONTENT, description=descriptions.delete_many)
+@permission({ConstantRole.employer})
+def delete_banks(
+    banks_in: BulkDelete,
+    session: Principal = Depends(get_session),
+):
+    return bank.delete_many(banks_in.ids, session)
+
+
 @router.get(
     "/bank/{bank_id}",
     status_code=status.HTTP_200_OK,
     description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(Bank))],
 )
 @permission({ConstantRole.employer})
 def fetch_bank(
     bank_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> BankResponse:
     return bank.fetch_one(bank_id, session)
 
@@ -73,6 +125,6 @@ def fetch_bank(
 @permission({ConstantRole.employer})
 def delete_bank(
     bank_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return bank.delete(bank_id, session)
@@ -2,19 +2,26 @@ from typing import Optional, List
 
 from fastapi_utils.inferring_router import InferringRouter
 from fastapi import status, Depends
+from pydantic import conlist
 from pydantic.types import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, SearchPagination, get_session, parse_include
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
 from app.manager.manager_employee import employee
+from app.schemas.schema_bulk import BULK_MAX_ITEMS, BulkDelete, BulkResponse
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
-from app.schemas.schema_employee import EmployeeCreate, EmployeeResponse, EmployeeUpdate
+from app.schemas.schema_employee import EmployeeCreate, EmployeeDetailResponse, EmployeeResponse, EmployeeUpdate
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Employee"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Employee"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL))],
+)
 descriptions = CRUDEndpointsDescriptions(
     model_name="Employee",
     search_parameters=["email", "phone", "fullname", "passport", "tax_id", "birth_date"]
@@ -22,10 +29,23 @@ descriptions = CRUDEndpointsDescriptions(
 params = CRUDParamsDescriptions(obj_name="Employee")
 
 
-@router.get("/employee", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/employee",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    response_model_exclude_unset=True,
+)
 @permission({ConstantRole.admin, ConstantRole.employer})
-def fetch_employees(session: Session = Depends(get_session)) -> List[EmployeeResponse]:
-    return employee.fetch_all(session)
+def fetch_employees(
+    include: Optional[str] = params.include(employee.crud.include_relationships),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[EmployeeDetailResponse]:
+    return pagination.paginate(
+        employee.fetch_all(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by, parse_include(include)
+        )
+    )
 
 
 @router.get("/employee/search", status_code=status.HTTP_200_OK, description=descriptions.search)
@@ -34,42 +54,80 @@ def search_employees(
     parameter: str = params.search_parameter,
     keyword: str = params.search_keyword,
     max_results: Optional[PositiveInt] = params.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: SearchPagination = Depends(),
 ) -> List[EmployeeResponse]:
-    return employee.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        employee.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/employee", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.admin, ConstantRole.employer})
-def create_employee(
+async def create_employee(
     employee_in: EmployeeCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployeeResponse:
-    return employee.create(employee_in, session)
+    return await employee.create(employee_in, session)
 
 
 @router.put("/employee", status_code=status.HTTP_200_OK, description=descriptions.update)
 @permission({ConstantRole.admin, ConstantRole.employer})
 def update_employee(
     employee_in: EmployeeUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployeeResponse:
     return employee.update(employee_in, session)
 
 
-@router.get("/employee/{employee_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
+@router.post("/employee/bulk", status_code=status.HTTP_201_CREATED, description=descriptions.create_many)
+@permission({ConstantRole.admin, ConstantRole.employer})
+async def create_employees(
+    employees_in: conlist(EmployeeCreate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=await employee.create_many(employees_in, session))
+
+
+@router.put("/employee/bulk", status_code=status.HTTP_200_OK, description=descriptions.update_many)
+@permission({ConstantRole.admin, ConstantRole.employer})
+def update_employees(
+    employees_in: conlist(EmployeeUpdate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=employee.update_many(employees_in, session))
+
+
+@router.delete("/employee/bulk", status_code=status.HTTP_204_NO_CONTENT, description=descriptions.delete_many)
+@permission({ConstantRole.admin, ConstantRole.employer})
+def delete_employees(
+    employees_in: BulkDelete,
+    session: Principal = Depends(get_session),
+):
+    return employee.delete_many(employees_in.ids, session)
+
+
+@router.get(
+    "/employee/{employee_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    response_model_exclude_unset=True,
+)
 @permission({ConstantRole.admin, ConstantRole.employer})
 def fetch_employee(
     employee_id: PositiveInt = params.get_id,
-    session: Session = Depends(get_session),
-) -> EmployeeResponse:
-    return employee.fetch_one(employee_id, session)
+    include: Optional[str] = params.include(employee.crud.include_relationships),
+    session: Principal = Depends(get_session),
+) -> EmployeeDetailResponse:
+    return employee.fetch_one(employee_id, session, parse_include(include))
 
 
 @router.delete("/employee/{employee_id}", status_code=status.HTTP_204_NO_CONTENT, description=descriptions.delete)
 @permission({ConstantRole.admin, ConstantRole.employer})
 def delete_employee(
     employee_id: PositiveInt = params.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return employee.delete(employee_id, session)
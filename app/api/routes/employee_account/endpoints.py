@@ -2,21 +2,28 @@ from typing import List, Optional
 
 from fastapi import Depends, status
 from fastapi_utils.inferring_router import InferringRouter
-from pydantic import PositiveInt
+from pydantic import PositiveInt, conlist
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, SearchPagination, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
 from app.manager.manager_employee_account import employee_account
 from app.schemas.schema_employee_account import (EmployeeAccountCreate,
                                                  EmployeeAccountResponse,
                                                  EmployeeAccountUpdate)
+from app.schemas.schema_bulk import BULK_MAX_ITEMS, BulkDelete, BulkResponse
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.responses import SerializedResponse
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Employee Account"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Employee Account"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL))],
+)
 descriptions = CRUDEndpointsDescriptions(
     model_name="Employee Account", search_parameters=["name", "number", "issuer"]
 )
@@ -30,9 +37,13 @@ parameters = CRUDParamsDescriptions(obj_name="Employee Account")
 )
 @permission({ConstantRole.employee})
 def fetch_employee_accounts(
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[EmployeeAccountResponse]:
-    return employee_account.fetch_all(session)
+    objs = pagination.paginate(
+        employee_account.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
+    return SerializedResponse(objs, EmployeeAccountResponse, headers=pagination.response.headers)
 
 
 @router.get(
@@ -45,9 +56,14 @@ def search_employee_accounts(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: SearchPagination = Depends(),
 ) -> List[EmployeeAccountResponse]:
-    return employee_account.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        employee_account.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post(
@@ -58,7 +74,7 @@ def search_employee_accounts(
 @permission({ConstantRole.employee})
 def create_employee_account(
     employee_account_in: EmployeeAccountCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployeeAccountResponse:
     return employee_account.create(employee_account_in, session)
 
@@ -69,11 +85,38 @@ def create_employee_account(
 @permission({ConstantRole.employee})
 def update_employee_account(
     employee_account_in: EmployeeAccountUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployeeAccountResponse:
     return employee_account.update(employee_account_in, session)
 
 
+@router.post("/employee_account/bulk", status_code=status.HTTP_201_CREATED, description=descriptions.create_many)
+@permission({ConstantRole.employee})
+def create_employee_accounts(
+    employee_accounts_in: conlist(EmployeeAccountCreate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=employee_account.create_many(employee_accounts_in, session))
+
+
+@router.put("/employee_account/bulk", status_code=status.HTTP_200_OK, description=descriptions.update_many)
+@permission({ConstantRole.employee})
+def update_employee_accounts(
+    employee_accounts_in: conlist(EmployeeAccountUpdate, min_items=1, max_items=BULK_MAX_ITEMS),
+    session: Principal = Depends(get_session),
+) -> BulkResponse:
+    return BulkResponse(count=employee_account.update_many(employee_accounts_in, session))
+
+
+@router.delete("/employee_account/bulk", status_code=status.HTTP_204_NO_CONTENT, description=descriptions.delete_many)
+@permission({ConstantRole.employee})
+def delete_employee_accounts(
+    employee_accounts_in: BulkDelete,
+    session: Principal = Depends(get_session),
+):
+    return employee_account.delete_many(employee_accounts_in.ids, session)
+
+
 @router.get(
     "/employee_account/{employee_account_id}",
     status_code=status.HTTP_200_OK,
@@ -82,7 +125,7 @@ def update_employee_account(
 @permission({ConstantRole.employee})
 def fetch_employee_account(
     employee_account_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployeeAccountResponse:
     return employee_account.fetch_one(employee_account_id, session)
 
@@ -95,6 +138,6 @@ def fetch_employee_account(
 @permission({ConstantRole.employee})
 def delete_employee_account(
     employee_account_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return employee_account.delete(employee_account_id, session)
@@ -1,75 +1,122 @@
-from typing import List, Optional
-
-from fastapi import status, Depends
-from fastapi_utils.inferring_router import InferringRouter
-from pydantic import PositiveInt
-
-from app.api.dependencies import get_session
-from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
-from app.api.docs.api_params import CRUDParamsDescriptions
-from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
-from app.manager.manager_employer import employer
-from app.schemas.schema_employer import EmployerCreate, EmployerResponse, EmployerUpdate
-from app.security.permissions import permission
-from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
-
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Employer"])
-descriptions = CRUDEndpointsDescriptions(
-    model_name="Employer",
-    search_parameters=["email", "phone", "name", "address", "edrpou"]
-)
-parameters = CRUDParamsDescriptions(obj_name="Employer")
-
-
-@router.get("/employer", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
-@permission({ConstantRole.admin})
-def fetch_employers(session: Session = Depends(get_session)) -> List[EmployerResponse]:
-    return employer.fetch_all(session)
-
-
-@router.get("/employer/search", status_code=status.HTTP_200_OK, description=descriptions.search)
-@permission({ConstantRole.admin})
-def search_employers(
-    parameter: str = parameters.search_parameter,
-    keyword: str = parameters.search_keyword,
-    max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
-) -> List[EmployerResponse]:
-    return employer.search(parameter, keyword, max_results, session)
-
-
-@router.post("/employer", status_code=status.HTTP_201_CREATED, description=descriptions.create)
-@permission({ConstantRole.admin})
-def create_employer(
-    employer_in: EmployerCreate,
-    session: Session = Depends(get_session),
-) -> EmployerResponse:
-    return employer.create(employer_in, session)
-
-
-@router.put("/employer", status_code=status.HTTP_200_OK, description=descriptions.update)
-@permission({ConstantRole.admin})
-def update_employer(
-    employer_in: EmployerUpdate,
-    session: Session = Depends(get_session),
-) -> EmployerResponse:
-    return employer.update(employer_in, session)
-
-
-@router.get("/employer/{employer_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
-@permission({ConstantRole.admin})
-def fetch_employer(
-    employer_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
-) -> EmployerResponse:
-    return employer.fetch_one(employer_id, session)
-
-
-@router.delete("/employer/{employer_id}", status_code=status.HTTP_204_NO_CONTENT)
-@permission({ConstantRole.admin})
-def delete_employer(
-    employer_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
-):
-    return employer.delete(employer_id, session)
+from typing import List, Optional
+
+from fastapi import Depends, File, UploadFile, status
+from fastapi_utils.inferring_router import InferringRouter
+from pydantic import PositiveInt
+
+from app.api.dependencies import CursorPagination, HTTPCache, SearchPagination, get_session, parse_include
+from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
+from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
+from app.constansts.constants_role import ConstantRole
+from app.manager.manager_employer import employer
+from app.manager.manager_roster import roster
+from app.schemas.schema_employer import EmployerCreate, EmployerDetailResponse, EmployerResponse, EmployerUpdate
+from app.schemas.schema_roster import ROSTER_COLUMNS, ROSTER_REQUIRED_COLUMNS, RosterResponse
+from app.security.permissions import permission
+from app.security.principal import Principal
+from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Employer"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL))],
+)
+descriptions = CRUDEndpointsDescriptions(
+    model_name="Employer",
+    search_parameters=["email", "phone", "name", "address", "edrpou"]
+)
+parameters = CRUDParamsDescriptions(obj_name="Employer")
+
+
+@router.get(
+    "/employer",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    response_model_exclude_unset=True,
+)
+@permission({ConstantRole.admin})
+def fetch_employers(
+    include: Optional[str] = parameters.include(employer.crud.include_relationships),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[EmployerDetailResponse]:
+    return pagination.paginate(
+        employer.fetch_all(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by, parse_include(include)
+        )
+    )
+
+
+@router.get("/employer/search", status_code=status.HTTP_200_OK, description=descriptions.search)
+@permission({ConstantRole.admin})
+def search_employers(
+    parameter: str = parameters.search_parameter,
+    keyword: str = parameters.search_keyword,
+    max_results: Optional[PositiveInt] = parameters.max_results_search,
+    session: Principal = Depends(get_session),
+    pagination: SearchPagination = Depends(),
+) -> List[EmployerResponse]:
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        employer.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
+
+
+@router.post("/employer", status_code=status.HTTP_201_CREATED, description=descriptions.create)
+@permission({ConstantRole.admin})
+async def create_employer(
+    employer_in: EmployerCreate,
+    session: Principal = Depends(get_session),
+) -> EmployerResponse:
+    return await employer.create(employer_in, session)
+
+
+@router.put("/employer", status_code=status.HTTP_200_OK, description=descriptions.update)
+@permission({ConstantRole.admin})
+def update_employer(
+    employer_in: EmployerUpdate,
+    session: Principal = Depends(get_session),
+) -> EmployerResponse:
+    return employer.update(employer_in, session)
+
+
+@router.post(
+    "/employer/{employer_id}/roster",
+    status_code=status.HTTP_201_CREATED,
+    description="**Note:** create the employees of the employer from a CSV file with the header: "
+    f"{', '.join(ROSTER_COLUMNS)}. The {', '.join(ROSTER_REQUIRED_COLUMNS)} columns are required, empty `account_*` "
+    "columns create no employee account. Invalid rows are skipped and reported with their errors",
+)
+@permission({ConstantRole.admin, ConstantRole.employer})
+async def upload_employer_roster(
+    employer_id: PositiveInt = parameters.get_id,
+    file: UploadFile = File(..., description="The CSV roster of the employees"),
+    session: Principal = Depends(get_session),
+) -> RosterResponse:
+    return await roster.upload(employer_id, file, session)
+
+
+@router.get(
+    "/employer/{employer_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    response_model_exclude_unset=True,
+)
+@permission({ConstantRole.admin})
+def fetch_employer(
+    employer_id: PositiveInt = parameters.get_id,
+    include: Optional[str] = parameters.include(employer.crud.include_relationships),
+    session: Principal = Depends(get_session),
+) -> EmployerDetailResponse:
+    return employer.fetch_one(employer_id, session, parse_include(include))
+
+
+@router.delete("/employer/{employer_id}", status_code=status.HTTP_204_NO_CONTENT)
+@permission({ConstantRole.admin})
+def delete_employer(
+    employer_id: PositiveInt = parameters.delete_id,
+    session: Principal = Depends(get_session),
+):
+    return employer.delete(employer_id, session)
@@ -4,20 +4,24 @@ from fastapi import Depends, status
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
 from app.manager.manager_employer_payment_method import employer_payment_method
 from app.schemas.schema_employer_payment_method import (
     EmployerPaymentMethodCreate, EmployerPaymentMethodResponse,
     EmployerPaymentMethodUpdate)
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.responses import SerializedResponse
 
 router = InferringRouter(
-    route_class=ExceptionRouteHandler, tags=["Employer Payment Method"]
+    route_class=ExceptionRouteHandler,
+    tags=["Employer Payment Method"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL))],
 )
 descriptions = CRUDEndpointsDescriptions(
     model_name="Employer Payment Method", search_parameters=["iban"]
@@ -32,9 +36,13 @@ parameters = CRUDParamsDescriptions(obj_name="Employer Payment Method")
 )
 @permission({ConstantRole.employer})
 def fetch_employer_payment_methods(
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[EmployerPaymentMethodResponse]:
-    return employer_payment_method.fetch_all(session)
+    objs = pagination.paginate(
+        employer_payment_method.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
+    return SerializedResponse(objs, EmployerPaymentMethodResponse, headers=pagination.response.headers)
 
 
 @router.get(
@@ -47,9 +55,14 @@ def search_employer_payment_methods(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[EmployerPaymentMethodResponse]:
-    return employer_payment_method.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        employer_payment_method.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post(
@@ -60,7 +73,7 @@ def search_employer_payment_methods(
 @permission({ConstantRole.employer})
 def create_employer_payment_method(
     employer_payment_method_in: EmployerPaymentMethodCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerPaymentMethodResponse:
     return employer_payment_method.create(employer_payment_method_in, session)
 
@@ -73,7 +86,7 @@ def create_employer_payment_method(
 @permission({ConstantRole.employer})
 def update_employer_payment_method(
     employer_payment_method_in: EmployerPaymentMethodUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerPaymentMethodResponse:
     return employer_payment_method.update(employer_payment_method_in, session)
 
@@ -86,7 +99,7 @@ def update_employer_payment_method(
 @permission({ConstantRole.employer})
 def fetch_employer_payment_method(
     employer_payment_method_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerPaymentMethodResponse:
     return employer_payment_method.fetch_one(employer_payment_method_id, session)
 
@@ -99,6 +112,6 @@ def fetch_employer_payment_method(
 @permission({ConstantRole.employer})
 def delete_employer_payment_method(
     employer_payment_method_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return employer_payment_method.delete(employer_payment_method_id, session)
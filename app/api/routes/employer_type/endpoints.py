@@ -4,25 +4,41 @@ from fastapi import status, Depends
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import EmployerType
 from app.manager.manager_employer_type import employer_type
 from app.schemas.schema_employer_type import EmployerTypeCreate, EmployerTypeResponse, EmployerTypeUpdate
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Employer Type"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Employer Type"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
+)
 descriptions = CRUDEndpointsDescriptions(model_name="Employer Type", search_parameters=["name"])
 parameters = CRUDParamsDescriptions(obj_name="Employer Type")
 
 
-@router.get("/employer_type", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/employer_type",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(EmployerType))],
+)
 @permission({ConstantRole.admin})
-def fetch_employer_types(session: Session = Depends(get_session)) -> List[EmployerTypeResponse]:
-    return employer_type.fetch_all(session)
+def fetch_employer_types(
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[EmployerTypeResponse]:
+    return pagination.paginate(
+        employer_type.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
 
 
 @router.get("/employer_type/search", status_code=status.HTTP_200_OK, description=descriptions.search)
@@ -31,16 +47,21 @@ def search_employer_types(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[EmployerTypeResponse]:
-    return employer_type.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        employer_type.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/employer_type", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.admin})
 def create_employer_type(
     employer_type_in: EmployerTypeCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerTypeResponse:
     return employer_type.create(employer_type_in, session)
 
@@ -49,16 +70,21 @@ def create_employer_type(
 @permission({ConstantRole.admin})
 def update_employer_type(
     employer_type_in: EmployerTypeUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerTypeResponse:
     return employer_type.update(employer_type_in, session)
 
 
-@router.get("/employer_type/{employer_type_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
+@router.get(
+    "/employer_type/{employer_type_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(EmployerType))],
+)
 @permission({ConstantRole.admin})
 def fetch_employer_type(
     employer_type_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> EmployerTypeResponse:
     return employer_type.fetch_one(employer_type_id, session)
 
@@ -67,6 +93,6 @@ def fetch_employer_type(
 @permission({ConstantRole.admin})
 def delete_employer_type(
     employer_type_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return employer_type.delete(employer_type_id, session)
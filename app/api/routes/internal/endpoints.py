@@ -0,0 +1,110 @@
+from typing import List
+
+from fastapi import Depends, status
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.api.dependencies import get_session
+from app.constansts.constants_role import ConstantRole
+from app.db.pool import async_pool_metrics, pool_metrics
+from app.db.query_stats import query_metrics
+from app.db.reference_data import reference_data
+from app.db.search_index import search_index
+from app.db.session_purge import session_purge
+from app.schemas.schema_cache import CacheStatsResponse
+from app.schemas.schema_compression import CompressionStatsResponse
+from app.schemas.schema_password_hasher import PasswordHasherStatsResponse
+from app.schemas.schema_pool import PoolStatsResponse
+from app.schemas.schema_query_stats import QueryStatsResponse
+from app.schemas.schema_search_index import SearchIndexStatsResponse
+from app.schemas.schema_session_purge import SessionPurgeStatsResponse
+from app.security.passwords import password_hasher
+from app.security.permissions import permission
+from app.security.principal import Principal, principal_cache
+from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.http_metrics import compression_metrics
+
+router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Internal"])
+
+
+@router.get(
+    "/internal/db/pool",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch live statistics of the database connection pools",
+)
+@permission({ConstantRole.su})
+def fetch_pool_stats(
+    session: Principal = Depends(get_session),
+) -> List[PoolStatsResponse]:
+    return [metrics.stats() for metrics in (pool_metrics, async_pool_metrics) if metrics.engine is not None]
+
+
+@router.get(
+    "/internal/db/queries",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch statements and database time per request, and routes with repeated statements (N+1)",
+)
+@permission({ConstantRole.su})
+def fetch_query_stats(
+    session: Principal = Depends(get_session),
+) -> QueryStatsResponse:
+    return query_metrics.stats()
+
+
+@router.get(
+    "/internal/db/session_purge",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch sessions deleted and time spent by the purge of expired and logged out sessions",
+)
+@permission({ConstantRole.su})
+def fetch_session_purge_stats(
+    session: Principal = Depends(get_session),
+) -> SessionPurgeStatsResponse:
+    return session_purge.stats()
+
+
+@router.get(
+    "/internal/http/compression",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch bytes saved and CPU time spent by response compression by encoding",
+)
+@permission({ConstantRole.su})
+def fetch_compression_stats(
+    session: Principal = Depends(get_session),
+) -> CompressionStatsResponse:
+    return compression_metrics.stats()
+
+
+@router.get(
+    "/internal/cache",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch hit/miss statistics of the in-process caches",
+)
+@permission({ConstantRole.su})
+def fetch_cache_stats(
+    session: Principal = Depends(get_session),
+) -> List[CacheStatsResponse]:
+    return [principal_cache.stats(), *reference_data.stats()]
+
+
+@router.get(
+    "/internal/password_hasher",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch queue statistics of the password hashing process pool",
+)
+@permission({ConstantRole.su})
+def fetch_password_hasher_stats(
+    session: Principal = Depends(get_session),
+) -> PasswordHasherStatsResponse:
+    return password_hasher.stats()
+
+
+@router.get(
+    "/internal/search_index",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** fetch size and age of the in-process search indexes",
+)
+@permission({ConstantRole.su})
+def fetch_search_index_stats(
+    session: Principal = Depends(get_session),
+) -> SearchIndexStatsResponse:
+    return search_index.stats()
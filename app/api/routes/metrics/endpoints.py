@@ -0,0 +1,20 @@
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.dependencies import skip_compression
+from app.utils.prometheus import CONTENT_TYPE, render_metrics
+
+# scraped often on the internal network, compressing would be CPU spent for little
+router = APIRouter(tags=["metrics"], dependencies=[Depends(skip_compression)])
+
+
+class MetricsEndpoints:
+    @staticmethod
+    @router.get("/metrics")
+    async def fetch_metrics():
+        # async to read the threadpool limiter of the event loop
+        return Response(
+            status_code=status.HTTP_200_OK,
+            content=render_metrics(current_default_thread_limiter()),
+            media_type=CONTENT_TYPE,
+        )
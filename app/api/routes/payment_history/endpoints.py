@@ -1,20 +1,29 @@
+from datetime import date
 from typing import List, Optional
 
-from fastapi import Depends, status
+from fastapi import Depends, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.constansts.constants_export_format import ConstantExportFormat
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
 from app.manager.manager_payment_history import payment_history
-from app.schemas.schema_payment_history import PaymentHistoryResponse
+from app.schemas.schema_payment_history import PaymentHistoryResponse, PayrollRunCreate, PayrollRunResponse
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.responses import SerializedResponse
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Payment History"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Payment History"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL))],
+)
 descriptions = CRUDEndpointsDescriptions(
     model_name="PaymentHistory", search_parameters=["amount", "creation_date"]
 )
@@ -28,9 +37,13 @@ parameters = CRUDParamsDescriptions(obj_name="PaymentHistory")
 )
 @permission({ConstantRole.admin, ConstantRole.employer, ConstantRole.employee})
 def fetch_payment_histories(
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[PaymentHistoryResponse]:
-    return payment_history.fetch_all(session)
+    objs = pagination.paginate(
+        payment_history.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
+    return SerializedResponse(objs, PaymentHistoryResponse, headers=pagination.response.headers)
 
 
 @router.get(
@@ -43,9 +56,60 @@ def search_payment_histories(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[PaymentHistoryResponse]:
-    return payment_history.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        payment_history.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
+
+
+@router.get(
+    "/payment_history/export",
+    status_code=status.HTTP_200_OK,
+    description="**Note:** stream all payment histories matching the filters as a CSV or NDJSON file, "
+    "ordered by ID",
+    response_class=StreamingResponse,
+)
+@permission({ConstantRole.admin})
+def export_payment_histories(
+    export_format: ConstantExportFormat = Query(
+        ConstantExportFormat.csv,
+        alias="format",
+        description="The FORMAT of the file: `csv` or `ndjson`",
+    ),
+    date_from: Optional[date] = Query(
+        None,
+        description="The first CREATION DATE of the payments\n\n**Note:** must be a date with format: yyyy-mm-dd",
+    ),
+    date_to: Optional[date] = Query(
+        None,
+        description="The last CREATION DATE of the payments\n\n**Note:** must be a date with format: yyyy-mm-dd",
+    ),
+    employer_id: Optional[PositiveInt] = Query(None, description="The ID of the paying employer"),
+    payment_status_type_id: Optional[PositiveInt] = Query(None, description="The ID of the payment status"),
+    session: Principal = Depends(get_session),
+):
+    return payment_history.export(
+        export_format, session, date_from, date_to, employer_id, payment_status_type_id
+    )
+
+
+@router.post(
+    "/payment_history/payroll",
+    status_code=status.HTTP_201_CREATED,
+    description="**Note:** create in process payments for the employees of the employer, or of all employers "
+    "with the day of month of salary or prepayment date on the run date, once per run date and payment type. "
+    "`dry_run` only counts them",
+)
+@permission({ConstantRole.admin})
+def run_payroll(
+    payroll_in: PayrollRunCreate,
+    session: Principal = Depends(get_session),
+) -> PayrollRunResponse:
+    return payment_history.run_payroll(payroll_in, session)
 
 
 @router.get(
@@ -56,6 +120,6 @@ def search_payment_histories(
 @permission({ConstantRole.admin, ConstantRole.employer, ConstantRole.employee})
 def fetch_payment_history(
     payment_history_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> PaymentHistoryResponse:
     return payment_history.fetch_one(payment_history_id, session)
@@ -4,20 +4,24 @@ from fastapi import Depends, status
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import PaymentStatusType
 from app.manager.manager_payment_status_type import payment_status_type
 from app.schemas.schema_payment_status_type import (PaymentStatusTypeCreate,
                                                     PaymentStatusTypeResponse,
                                                     PaymentStatusTypeUpdate)
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
 
 router = InferringRouter(
-    route_class=ExceptionRouteHandler, tags=["Payment Status Type"]
+    route_class=ExceptionRouteHandler,
+    tags=["Payment Status Type"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
 )
 descriptions = CRUDEndpointsDescriptions(
     model_name="Payment Status Type", search_parameters=["name"]
@@ -29,12 +33,16 @@ parameters = CRUDParamsDescriptions(obj_name="Payment Status Type")
     "/payment_status_type",
     status_code=status.HTTP_200_OK,
     description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(PaymentStatusType))],
 )
 @permission({ConstantRole.admin})
 def fetch_payment_status_types(
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[PaymentStatusTypeResponse]:
-    return payment_status_type.fetch_all(session)
+    return pagination.paginate(
+        payment_status_type.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
 
 
 @router.get(
@@ -47,9 +55,14 @@ def search_payment_status_types(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[PaymentStatusTypeResponse]:
-    return payment_status_type.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        payment_status_type.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post(
@@ -60,7 +73,7 @@ def search_payment_status_types(
 @permission({ConstantRole.admin})
 def create_payment_status_type(
     payment_status_type_in: PaymentStatusTypeCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> PaymentStatusTypeResponse:
     return payment_status_type.create(payment_status_type_in, session)
 
@@ -73,7 +86,7 @@ def create_payment_status_type(
 @permission({ConstantRole.admin})
 def update_payment_status_type(
     payment_status_type_in: PaymentStatusTypeUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> PaymentStatusTypeResponse:
     return payment_status_type.update(payment_status_type_in, session)
 
@@ -82,11 +95,12 @@ def update_payment_status_type(
     "/payment_status_type/{payment_status_type_id}",
     status_code=status.HTTP_200_OK,
     description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(PaymentStatusType))],
 )
 @permission({ConstantRole.admin})
 def fetch_payment_status_type(
     payment_status_type_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> PaymentStatusTypeResponse:
     return payment_status_type.fetch_one(payment_status_type_id, session)
 
@@ -99,6 +113,6 @@ def fetch_payment_status_type(
 @permission({ConstantRole.admin})
 def delete_payment_status_type(
     payment_status_type_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return payment_status_type.delete(payment_status_type_id, session)
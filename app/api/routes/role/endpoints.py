@@ -4,25 +4,41 @@ from fastapi import status, Depends
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import Role
 from app.manager.manager_role import role
 from app.schemas.schema_role import RoleCreate, RoleResponse, RoleUpdate
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Role"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Role"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
+)
 descriptions = CRUDEndpointsDescriptions(model_name="Role", search_parameters=["name"])
 parameters = CRUDParamsDescriptions(obj_name="Role")
 
 
-@router.get("/role", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/role",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(Role))],
+)
 @permission({ConstantRole.admin})
-def fetch_roles(session: Session = Depends(get_session)) -> List[RoleResponse]:
-    return role.fetch_all(session)
+def fetch_roles(
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[RoleResponse]:
+    return pagination.paginate(
+        role.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
 
 
 @router.get("/role/search", status_code=status.HTTP_200_OK, description=descriptions.search)
@@ -31,16 +47,21 @@ def search_roles(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[RoleResponse]:
-    return role.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        role.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/role", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.admin})
 def create_role(
     role_in: RoleCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> RoleResponse:
     return role.create(role_in, session)
 
@@ -49,16 +70,21 @@ def create_role(
 @permission({ConstantRole.admin})
 def update_role(
     role_in: RoleUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> RoleResponse:
     return role.update(role_in, session)
 
 
-@router.get("/role/{role_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
+@router.get(
+    "/role/{role_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(Role))],
+)
 @permission({ConstantRole.admin})
 def fetch_role(
     role_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> RoleResponse:
     return role.fetch_one(role_id, session)
 
@@ -67,6 +93,6 @@ def fetch_role(
 @permission({ConstantRole.admin})
 def delete_role(
     role_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return role.delete(role_id, session)
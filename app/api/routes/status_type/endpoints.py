@@ -4,25 +4,41 @@ from fastapi import status, Depends
 from fastapi_utils.inferring_router import InferringRouter
 from pydantic import PositiveInt
 
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, HTTPCache, ReferenceETag, get_session
 from app.api.docs.api_endpoints import CRUDEndpointsDescriptions
 from app.api.docs.api_params import CRUDParamsDescriptions
+from app.config.cache_config import cache_cfg
 from app.constansts.constants_role import ConstantRole
-from app.db.models import Session
+from app.db.models import StatusType
 from app.manager.manager_status_type import status_type
 from app.schemas.schema_status_type import StatusTypeCreate, StatusTypeResponse, StatusTypeUpdate
 from app.security.permissions import permission
+from app.security.principal import Principal
 from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
 
-router = InferringRouter(route_class=ExceptionRouteHandler, tags=["Status Type"])
+router = InferringRouter(
+    route_class=ExceptionRouteHandler,
+    tags=["Status Type"],
+    dependencies=[Depends(HTTPCache(cache_cfg.HTTP_CACHE_CONTROL_REFERENCE))],
+)
 descriptions = CRUDEndpointsDescriptions(model_name="Status Type", search_parameters=["name"])
 parameters = CRUDParamsDescriptions(obj_name="Status Type")
 
 
-@router.get("/status_type", status_code=status.HTTP_200_OK, description=descriptions.fetch_all)
+@router.get(
+    "/status_type",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_all,
+    dependencies=[Depends(ReferenceETag(StatusType))],
+)
 @permission({ConstantRole.admin})
-def fetch_status_types(session: Session = Depends(get_session)) -> List[StatusTypeResponse]:
-    return status_type.fetch_all(session)
+def fetch_status_types(
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
+) -> List[StatusTypeResponse]:
+    return pagination.paginate(
+        status_type.fetch_all(session, pagination.after, pagination.fetch_limit, pagination.order_by)
+    )
 
 
 @router.get("/status_type/search", status_code=status.HTTP_200_OK, description=descriptions.search)
@@ -31,16 +47,21 @@ def search_status_types(
     parameter: str = parameters.search_parameter,
     keyword: str = parameters.search_keyword,
     max_results: Optional[PositiveInt] = parameters.max_results_search,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
+    pagination: CursorPagination = Depends(),
 ) -> List[StatusTypeResponse]:
-    return status_type.search(parameter, keyword, max_results, session)
+    limit = max_results or pagination.limit
+    return pagination.paginate(
+        status_type.search(parameter, keyword, limit + 1, session, pagination.after, pagination.order_by),
+        limit,
+    )
 
 
 @router.post("/status_type", status_code=status.HTTP_201_CREATED, description=descriptions.create)
 @permission({ConstantRole.admin})
 def create_status_type(
     status_type_in: StatusTypeCreate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> StatusTypeResponse:
     return status_type.create(status_type_in, session)
 
@@ -49,16 +70,21 @@ def create_status_type(
 @permission({ConstantRole.admin})
 def update_status_type(
     status_type_in: StatusTypeUpdate,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> StatusTypeResponse:
     return status_type.update(status_type_in, session)
 
 
-@router.get("/status_type/{status_type_id}", status_code=status.HTTP_200_OK, description=descriptions.fetch_one)
+@router.get(
+    "/status_type/{status_type_id}",
+    status_code=status.HTTP_200_OK,
+    description=descriptions.fetch_one,
+    dependencies=[Depends(ReferenceETag(StatusType))],
+)
 @permission({ConstantRole.admin})
 def fetch_status_type(
     status_type_id: PositiveInt = parameters.get_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ) -> StatusTypeResponse:
     return status_type.fetch_one(status_type_id, session)
 
@@ -67,6 +93,6 @@ def fetch_status_type(
 @permission({ConstantRole.admin})
 def delete_status_type(
     status_type_id: PositiveInt = parameters.delete_id,
-    session: Session = Depends(get_session),
+    session: Principal = Depends(get_session),
 ):
     return status_type.delete(status_type_id, session)
@@ -0,0 +1,144 @@
+"""
+Compare requests/sec and p99 latency of sync (`def`) and async (`async def`) routes at high concurrency.
+
+Both routes fetch a page of roles through `DBSessionMiddleware`, the sync one with `CRUDBase` in the threadpool,
+the async one with `AsyncCRUDBase` on the event loop. The app is driven in-process over ASGI, without network.
+
+`--latency` adds a round trip delay per query to emulate a networked database on a local SQLite file,
+the sync route blocks a worker thread on it while the async route awaits it.
+Requires an async driver for the async URL, e.g. `pip install aiosqlite`.
+
+Usage: python -m app.benchmarks.bench_async_routes --url sqlite:///bench.db \
+    --async-url sqlite+aiosqlite:///bench.db --requests 2000 --concurrency 50 200 --latency 5
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import await_only
+
+from app import crud
+from app.crud.crud_base_async import AsyncCRUDBase
+from app.db.base import Base
+from app.db.models import Role
+from app.db.session import (AsyncSessionLocal, SessionLocal,
+                            connect_async_engine, dispose_async_engine,
+                            session_scope)
+from app.middleware.middleware_db_session import DBSessionMiddleware
+
+async_role = AsyncCRUDBase(Role)
+
+
+def create_app() -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/sync/role")
+    def fetch_roles_sync():
+        return crud.role.get_multi(limit=20)
+
+    @bench_app.get("/async/role")
+    async def fetch_roles_async():
+        return await async_role.get_multi(limit=20)
+
+    bench_app.add_middleware(DBSessionMiddleware)
+    return bench_app
+
+
+def configure(url: str, async_url: str, pool_size: int, latency: float) -> None:
+    pool_args = dict(pool_size=pool_size, max_overflow=0, pool_timeout=60)
+    # sync route threads share the pooled connections
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    bench_engine = create_engine(url, connect_args=connect_args, poolclass=QueuePool, **pool_args)
+    bench_async_engine = create_async_engine(async_url, poolclass=AsyncAdaptedQueuePool, **pool_args)
+    SessionLocal.configure(bind=bench_engine)
+    AsyncSessionLocal.configure(bind=bench_async_engine)
+    Base.metadata.create_all(bench_engine)
+    if latency:
+        @event.listens_for(bench_engine, "before_cursor_execute")
+        def sleep_sync(*args):
+            time.sleep(latency)
+
+        @event.listens_for(bench_async_engine.sync_engine, "before_cursor_execute")
+        def sleep_async(*args):
+            await_only(asyncio.sleep(latency))
+
+
+def seed(rows: int) -> None:
+    with session_scope() as session:
+        if session.query(Role).count() < rows:
+            session.add_all([Role(name=f"bench-role-{i}") for i in range(rows)])
+
+
+def request(bench_app: FastAPI, path: str) -> Callable[[], Awaitable[int]]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def call() -> int:
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        await bench_app(dict(scope), receive, send)
+        return statuses[0]
+
+    return call
+
+
+async def run(call: Callable[[], Awaitable[int]], concurrency: int, requests: int) -> Tuple[float, float]:
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            status_code = await call()
+            latencies.append(time.perf_counter() - started)
+            if status_code != 200:
+                raise RuntimeError(f"Unexpected status {status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return requests / elapsed, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+async def main(requests: int, concurrency: List[int]) -> None:
+    bench_app = create_app()
+    await connect_async_engine()
+    sync_call, async_call = request(bench_app, "/sync/role"), request(bench_app, "/async/role")
+    await run(sync_call, 10, 100)
+    await run(async_call, 10, 100)
+    print(f"{'concurrency':>12} {'sync req/s':>11} {'sync p99 ms':>12} {'async req/s':>12} {'async p99 ms':>13}")
+    for count in concurrency:
+        sync_rps, sync_p99 = await run(sync_call, count, requests)
+        async_rps, async_p99 = await run(async_call, count, requests)
+        print(f"{count:>12} {sync_rps:>11.1f} {sync_p99:>12.1f} {async_rps:>12.1f} {async_p99:>13.1f}")
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite:///bench.db")
+    parser.add_argument("--async-url", default="sqlite+aiosqlite:///bench.db")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--pool-size", type=int, default=50, help="Connection pool size of both engines")
+    parser.add_argument("--latency", type=float, default=0, help="Emulated round trip per query, ms")
+    args = parser.parse_args()
+    configure(args.url, args.async_url, args.pool_size, args.latency / 1000)
+    seed(rows=100)
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,88 @@
+"""
+Compare throughput of per-row CRUD operations with bulk create_many/update_many/delete_many.
+
+The per-row path commits each row like a request per object did, the bulk path runs one executemany
+per operation in a single transaction.
+
+`--latency` adds a round trip delay per statement to emulate a networked database on a local SQLite file.
+
+Usage: python -m app.benchmarks.bench_bulk --url sqlite:///bench.db --rows 5000 --latency 1
+"""
+import argparse
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, event
+
+from app.crud.crud_bank import CRUDBank
+from app.db.base import Base
+from app.db.models import Bank
+from app.db.session import SessionLocal, session_scope
+
+
+def bank_data(rows: int) -> List[Dict]:
+    return [
+        {
+            "name": f"bench-bank-{i}",
+            "mfo": str(100000 + i),
+            "is_active": True,
+            "creation_date": datetime.utcnow(),
+            "deactivation_date": date(2030, 1, 1),
+        }
+        for i in range(rows)
+    ]
+
+
+def per_row(rows: int) -> Dict[str, float]:
+    crud_bank = CRUDBank(Bank, SessionLocal())
+    started = time.perf_counter()
+    objs = [crud_bank.create(obj_in) for obj_in in bank_data(rows)]
+    created = time.perf_counter()
+    for obj in objs:
+        crud_bank.update(obj, {"is_active": False})
+    updated = time.perf_counter()
+    for obj in objs:
+        crud_bank.delete(obj.id)
+    deleted = time.perf_counter()
+    crud_bank.session.close()
+    return {"create": created - started, "update": updated - created, "delete": deleted - updated}
+
+
+def bulk(rows: int) -> Dict[str, float]:
+    crud_bank = CRUDBank(Bank)
+    started = time.perf_counter()
+    with session_scope():
+        crud_bank.create_many(bank_data(rows))
+    created = time.perf_counter()
+    with session_scope() as session:
+        ids = [obj_id for obj_id, in session.query(Bank.id).filter(Bank.name.like("bench-bank-%"))]
+        crud_bank.update_many([{"id": obj_id, "is_active": False} for obj_id in ids])
+    updated = time.perf_counter()
+    with session_scope():
+        crud_bank.delete_many(ids)
+    deleted = time.perf_counter()
+    return {"create": created - started, "update": updated - created, "delete": deleted - updated}
+
+
+def main(url: str, rows: int, latency: float) -> None:
+    if url:
+        bench_engine = create_engine(url)
+        SessionLocal.configure(bind=bench_engine)
+        Base.metadata.create_all(bench_engine)
+        if latency:
+            event.listen(bench_engine, "before_cursor_execute", lambda *args: time.sleep(latency))
+    results: Dict[str, Callable[[int], Dict[str, float]]] = {"per-row": per_row, "bulk": bulk}
+    print(f"{'path':>8} {'create rows/s':>14} {'update rows/s':>14} {'delete rows/s':>14}")
+    for name, run in results.items():
+        elapsed = run(rows)
+        print(f"{name:>8} " + " ".join(f"{rows / elapsed[operation]:>14.1f}" for operation in elapsed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL, the configured database by default")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0, help="Emulated round trip per statement, ms")
+    args = parser.parse_args()
+    main(args.url, args.rows, args.latency / 1000)
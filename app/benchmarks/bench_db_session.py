@@ -0,0 +1,82 @@
+"""
+Compare throughput of one shared session with request-scoped sessions under concurrent load.
+
+The shared session is guarded by a lock, as a session must not be used by several threads at once,
+so it shows how the import-time global session serializes requests.
+
+`--latency` adds a round trip delay per query to emulate a networked database on a local SQLite file.
+
+Usage: python -m app.benchmarks.bench_db_session --url sqlite:///bench.db --requests 2000 --latency 2
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+
+from app import crud
+from app.crud.crud_role import CRUDRole
+from app.db.base import Base
+from app.db.models import Role
+from app.db.session import SessionLocal, session_scope
+
+
+def seed(rows: int) -> None:
+    with session_scope() as session:
+        if session.query(Role).count() < rows:
+            session.add_all([Role(name=f"bench-role-{i}") for i in range(rows)])
+
+
+def shared_session_request(latency: float) -> Callable[[], None]:
+    lock = threading.Lock()
+    shared_crud = CRUDRole(Role, SessionLocal())
+
+    def request() -> None:
+        with lock:
+            shared_crud.get_multi()
+            time.sleep(latency)
+            shared_crud.session.commit()
+
+    return request
+
+
+def scoped_session_request(latency: float) -> Callable[[], None]:
+    def request() -> None:
+        with session_scope():
+            crud.role.get_multi()
+            time.sleep(latency)
+
+    return request
+
+
+def run(request: Callable[[], None], workers: int, requests: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(request) for _ in range(requests)]:
+            future.result()
+    return requests / (time.perf_counter() - started)
+
+
+def main(url: str, requests: int, workers: List[int], latency: float) -> None:
+    if url:
+        bench_engine = create_engine(url)
+        SessionLocal.configure(bind=bench_engine)
+        Base.metadata.create_all(bench_engine)
+    seed(rows=100)
+    print(f"{'workers':>8} {'shared req/s':>14} {'scoped req/s':>14}")
+    for worker_count in workers:
+        shared = run(shared_session_request(latency), worker_count, requests)
+        scoped = run(scoped_session_request(latency), worker_count, requests)
+        print(f"{worker_count:>8} {shared:>14.1f} {scoped:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL, the configured database by default")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--latency", type=float, default=0, help="Emulated round trip per query, ms")
+    args = parser.parse_args()
+    main(args.url, args.requests, args.workers, args.latency / 1000)
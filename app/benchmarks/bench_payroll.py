@@ -0,0 +1,85 @@
+"""
+Measure throughput of the payroll run: one set-based INSERT ... SELECT of the payments of all due employers.
+
+The database is seeded with employers due on the run date, each with an active payment method,
+and employees with a default active account.
+
+Usage: python -m app.benchmarks.bench_payroll --url sqlite:///bench.db --employees 100000 --employers 100
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, func, insert
+
+from app.constansts.constants_payment_status_type import ConstantPaymentStatusType
+from app.db.base import Base
+from app.db.models import (Employee, EmployeeAccount, Employer, EmployerPaymentMethod, PaymentHistory,
+                           PaymentStatusType)
+from app.db.session import SessionLocal, session_scope
+from app.manager.manager_payment_history import payment_history
+from app.schemas.schema_payment_history import PayrollRunCreate
+from app.security.principal import Principal
+
+
+def seed(employees: int, employers: int, run_date: date) -> None:
+    with session_scope() as session:
+        if not session.query(PaymentStatusType).filter_by(name=ConstantPaymentStatusType.in_process).first():
+            session.add(PaymentStatusType(name=ConstantPaymentStatusType.in_process))
+        first_employer_id = (session.query(func.max(Employer.id)).scalar() or 0) + 1
+        first_employee_id = (session.query(func.max(Employee.id)).scalar() or 0) + 1
+        employer_ids = range(first_employer_id, first_employer_id + employers)
+        employee_ids = range(first_employee_id, first_employee_id + employees)
+        session.execute(
+            insert(Employer),
+            [{"id": employer_id, "name": f"bench-employer-{employer_id}", "salary_date": run_date}
+             for employer_id in employer_ids],
+        )
+        session.execute(
+            insert(EmployerPaymentMethod),
+            [{"employer_id": employer_id, "is_active": True, "creation_date": datetime.utcnow()}
+             for employer_id in employer_ids],
+        )
+        session.execute(
+            insert(Employee),
+            [{"id": employee_id, "fullname": f"bench-employee-{employee_id}",
+              "employer_id": employer_ids[i % employers]}
+             for i, employee_id in enumerate(employee_ids)],
+        )
+        session.execute(
+            insert(EmployeeAccount),
+            [{"employee_id": employee_id, "is_active": True, "is_default": True, "creation_date": datetime.utcnow()}
+             for employee_id in employee_ids],
+        )
+
+
+def main(url: str, employees: int, employers: int) -> None:
+    if url:
+        bench_engine = create_engine(url)
+        SessionLocal.configure(bind=bench_engine)
+        Base.metadata.create_all(bench_engine)
+    run_date = date.today()
+    seed(employees, employers, run_date)
+    principal = Principal(id=0, token="", status="", user_id=0, role="su")
+    for dry_run in (True, False, False):
+        started = time.perf_counter()
+        with session_scope():
+            result = payment_history.run_payroll(
+                PayrollRunCreate(run_date=run_date, amount=100, dry_run=dry_run), principal
+            )
+        elapsed = time.perf_counter() - started
+        print(
+            f"dry_run={dry_run!s:<5} employees={result['employees']:>8} payments={result['payments']:>8} "
+            f"already_paid={result['skipped_already_paid']:>8} {result['employees'] / elapsed:>12.1f} employees/s"
+        )
+    with session_scope() as session:
+        print(f"payment_history rows: {session.query(func.count(PaymentHistory.id)).scalar()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL, the configured database by default")
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--employers", type=int, default=100)
+    args = parser.parse_args()
+    main(args.url, args.employees, args.employers)
@@ -0,0 +1,118 @@
+"""
+Compare the serialization CPU time of a page of ORM rows through the response model and the precompiled serializer.
+
+The response model path validates each row with the pydantic schema, runs jsonable_encoder and the standard
+library encoder, like FastAPI does for routes returning ORM objects. The precompiled path builds the dicts
+from the row attributes without validation and encodes them with orjson, or the standard library encoder.
+
+Usage: python -m app.benchmarks.bench_serialization --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.db.models import EmployeeAccount, Employer, User
+from app.schemas.schema_employee_account import EmployeeAccountResponse
+from app.schemas.schema_employer import EmployerResponse
+from app.utils import responses
+from app.utils.responses import SerializedResponse
+
+
+def employee_accounts(rows: int) -> List[EmployeeAccount]:
+    return [
+        EmployeeAccount(
+            id=i,
+            name=f"Account {i}",
+            number=str(4000000000000000 + i),
+            is_active=True,
+            is_default=i % 2 == 0,
+            issuer="Bench Bank",
+            creation_date=datetime(2022, 1, 1) + timedelta(minutes=i),
+            deactivation_date=date(2030, 1, 1),
+            employee_id=i,
+            account_type_id=1,
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def employers(rows: int) -> List[Employer]:
+    return [
+        Employer(
+            id=i,
+            name=f"Employer {i}",
+            address=f"{i} Bench st.",
+            edrpou=f"{i:08}",
+            expire_contract_date=date(2030, 1, 1),
+            salary_date=date(2022, 1, 10),
+            prepayment_date=date(2022, 1, 25),
+            employer_type_id=1,
+            user=User(id=i, email=f"employer{i}@example.com", phone="+380000000000", role_id=3, status_type_id=1),
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def response_model(schema: Any) -> Callable[[List[Any]], bytes]:
+    field = create_response_field(name=f"Response_{schema.__name__}", type_=List[schema])
+
+    def render(objs: List[Any]) -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=objs))
+        return JSONResponse(content).body
+
+    return render
+
+
+def precompiled(schema: Any, use_orjson: bool) -> Callable[[List[Any]], bytes]:
+    encoder = responses.orjson if use_orjson else None
+
+    def render(objs: List[Any]) -> bytes:
+        installed, responses.orjson = responses.orjson, encoder
+        try:
+            return SerializedResponse(objs, schema).body
+        finally:
+            responses.orjson = installed
+
+    return render
+
+
+def measure(render: Callable[[List[Any]], bytes], objs: List[Any], repeat: int) -> Dict[str, float]:
+    body = render(objs)
+    started = time.process_time()
+    for _ in range(repeat):
+        render(objs)
+    elapsed = (time.process_time() - started) / repeat
+    return {"ms": elapsed * 1000, "rows_per_s": len(objs) / elapsed, "bytes": len(body)}
+
+
+def main(rows: int, repeat: int) -> None:
+    for name, schema, objs in (
+        ("employee_account", EmployeeAccountResponse, employee_accounts(rows)),
+        ("employer", EmployerResponse, employers(rows)),
+    ):
+        paths = {"response_model": response_model(schema), "precompiled+json": precompiled(schema, False)}
+        if responses.orjson is not None:
+            paths["precompiled+orjson"] = precompiled(schema, True)
+        baseline = None
+        for path, render in paths.items():
+            result = measure(render, objs, repeat)
+            baseline = baseline or result["ms"]
+            print(
+                f"{name:<17} {path:<19} rows={rows:>6} {result['ms']:>9.2f} ms/page "
+                f"{result['rows_per_s']:>12.0f} rows/s {baseline / result['ms']:>6.1f}x bytes={result['bytes']}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=50, help="Pages serialized per path")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,341 @@
+"""
+Benchmark the hot paths of the API: login, fetch one, fetch all and search on every router, creates and payment history.
+
+The real app is driven in-process over ASGI, without network, against a database recreated and seeded with
+`dataset_generator`. Each scenario reports throughput, p50/p95/p99 latency, SQL queries per request and
+the peak of memory allocated per request (traced on separate sequential requests). Results are written
+as JSON and, with `--baseline`, compared with a previous run: lower throughput or higher p95 beyond the tolerance,
+or more queries per request, are regressions and the exit code is 1.
+
+Usage: python -m app.benchmarks.bench_suite --url sqlite:///bench_suite.db --requests 500 --concurrency 20 \
+    --output bench.json --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.constansts.constants_role import ConstantRole
+from app.constansts.constants_status_type import ConstantStatusType
+from app.db.base import Base
+from app.db.dialect import create_db_engine
+from app.db.models import User
+from app.db.reference_data import reference_data
+from app.db.session import SessionLocal, session_scope
+from app.main import app
+from app.security.passwords import password_hasher
+from app.utils.dataset_generator import DEFAULT_PASSWORD, DatasetGenerator, DBSink, Scale, generate
+
+SU_EMAIL = "bench-su@example.com"
+# routers with the search parameter and keyword of their search scenario
+SEARCHES = {
+    "role": ("name", "employ"),
+    "status_type": ("name", "active"),
+    "employer_type": ("name", "DAT"),
+    "account_type": ("name", "card"),
+    "payment_status_type": ("name", "success"),
+    "bank": ("name", "Bank"),
+    "employer": ("name", "Lion"),
+    "employer_payment_method": ("iban", "UA1"),
+    "employee": ("fullname", "John"),
+    "employee_account": ("number", "123"),
+    "payment_history": ("amount", "123"),
+}
+
+# method, path, body and content type of the request number i
+RequestFactory = Callable[[int], Tuple[str, str, bytes, Optional[str]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: RequestFactory
+    status_code: int = 200
+    authorized: bool = True
+    requests: Optional[int] = None
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    concurrency: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float
+    peak_alloc_kib: float
+
+
+class QueryCounter:
+    def __init__(self, engine: Engine):
+        self.value = 0
+        event.listen(engine, "before_cursor_execute", self.inc)
+
+    def inc(self, *args) -> None:
+        self.value += 1
+
+
+def configure(url: str, pool_size: int) -> Engine:
+    bench_engine = create_db_engine(url, poolclass=QueuePool, pool_size=pool_size, max_overflow=0, pool_timeout=60)
+    SessionLocal.configure(bind=bench_engine)
+    Base.metadata.drop_all(bench_engine)
+    Base.metadata.create_all(bench_engine)
+    return bench_engine
+
+
+def seed(bench_engine: Engine, scale: Scale) -> None:
+    generator = DatasetGenerator(scale)
+    generate(generator, DBSink(bench_engine))
+    with session_scope() as session:
+        session.add(
+            User(
+                id=scale.employers + scale.employees + 1,
+                email=SU_EMAIL,
+                password=generator.password_hash,
+                creation_date=datetime.utcnow(),
+                role_id=DatasetGenerator.reference_id(ConstantRole, ConstantRole.su),
+                status_type_id=DatasetGenerator.reference_id(ConstantStatusType, ConstantStatusType.active),
+            )
+        )
+
+
+def get(path: str, **params: Any) -> RequestFactory:
+    target = f"{path}?{urlencode(params)}" if params else path
+    return lambda i: ("GET", target, b"", None)
+
+
+def scenarios(scale: Scale, create_requests: int) -> List[Scenario]:
+    def login(i: int) -> Tuple[str, str, bytes, Optional[str]]:
+        # employee users, a login replaces the session of the user and the su token must stay valid
+        user_id = scale.employers + 1 + i % scale.employees
+        body = urlencode({"username": f"employee{user_id}@example.com", "password": DEFAULT_PASSWORD})
+        return "POST", "/auth/login", body.encode(), "application/x-www-form-urlencoded"
+
+    def create_employer(i: int) -> Tuple[str, str, bytes, Optional[str]]:
+        return "POST", "/employer", json.dumps({
+            "name": f"bench-employer-{i}",
+            "address": "1 Sumska st. Kharkiv",
+            "edrpou": f"{i:010d}",
+            "employer_type_id": 1,
+            "user": {"email": f"bench-employer-{i}@example.com", "password": DEFAULT_PASSWORD},
+        }).encode(), "application/json"
+
+    def create_employee(i: int) -> Tuple[str, str, bytes, Optional[str]]:
+        return "POST", "/employee", json.dumps({
+            "fullname": f"Bench Employee {i}",
+            "birth_date": date(1990, 1, 1).isoformat(),
+            "employer_id": 1,
+            "user": {"email": f"bench-employee-{i}@example.com", "password": DEFAULT_PASSWORD},
+        }).encode(), "application/json"
+
+    result = [Scenario("login", login, status_code=201, authorized=False, requests=create_requests)]
+    for router, (parameter, keyword) in SEARCHES.items():
+        result.append(Scenario(f"{router}.fetch_one", get(f"/{router}/1")))
+        result.append(Scenario(f"{router}.fetch_all", get(f"/{router}")))
+        result.append(Scenario(f"{router}.search", get(f"/{router}/search", parameter=parameter, keyword=keyword)))
+    result.append(Scenario("payment_history.fetch_all.limit_100", get("/payment_history", limit=100)))
+    result.append(Scenario("employer.create", create_employer, status_code=201, requests=create_requests))
+    result.append(Scenario("employee.create", create_employee, status_code=201, requests=create_requests))
+    return result
+
+
+# status code and body of the response to the method, path, body and content type
+ASGICall = Callable[[str, str, bytes, Optional[str]], Awaitable[Tuple[int, bytes]]]
+
+
+def asgi_call(token: Optional[str]) -> ASGICall:
+    async def call(method: str, target: str, body: bytes, content_type: Optional[str]) -> Tuple[int, bytes]:
+        path, _, query = target.partition("?")
+        headers = [(b"host", b"bench")]
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        if content_type:
+            headers.append((b"content-type", content_type.encode()))
+            headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": query.encode(), "headers": headers, "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        statuses: List[int] = []
+        chunks: List[bytes] = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await app(scope, receive, send)
+        return statuses[0], b"".join(chunks)
+
+    return call
+
+
+async def login_su() -> str:
+    body = urlencode({"username": SU_EMAIL, "password": DEFAULT_PASSWORD}).encode()
+    status_code, response = await asgi_call(None)("POST", "/auth/login", body, "application/x-www-form-urlencoded")
+    if status_code != 201:
+        raise RuntimeError(f"Login of the benchmark user failed with status {status_code}")
+    return json.loads(response)["access_token"]
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000
+
+
+async def run_scenario(
+    scenario: Scenario,
+    call: ASGICall,
+    numbers: Iterator[int],
+    requests: int,
+    concurrency: int,
+    queries: QueryCounter,
+    alloc_requests: int,
+) -> ScenarioResult:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            status_code, _ = await call(*scenario.request(next(numbers)))
+            latencies.append(time.perf_counter() - started)
+            errors += status_code != scenario.status_code
+
+    for _ in range(min(10, requests)):
+        await call(*scenario.request(next(numbers)))
+    queries_before = queries.value
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries_per_request = (queries.value - queries_before) / requests
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(alloc_requests):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        await call(*scenario.request(next(numbers)))
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return ScenarioResult(
+        requests=requests,
+        concurrency=concurrency,
+        errors=errors,
+        throughput=requests / elapsed,
+        p50_ms=percentile(latencies, 0.50),
+        p95_ms=percentile(latencies, 0.95),
+        p99_ms=percentile(latencies, 0.99),
+        queries_per_request=queries_per_request,
+        peak_alloc_kib=sum(peaks) / len(peaks) / 1024 if peaks else 0.0,
+    )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Get the regressions of the results against the baseline, scenarios missing in either one are skipped
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']:.1f} < {base['throughput']:.1f} req/s")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']:.2f} > {base['p95_ms']:.2f} ms")
+        if result["queries_per_request"] > base["queries_per_request"] + 0.01:
+            regressions.append(
+                f"{name}: {result['queries_per_request']:.2f} > {base['queries_per_request']:.2f} queries per request"
+            )
+    return regressions
+
+
+async def main(args: argparse.Namespace, scale: Scale, queries: QueryCounter) -> Dict[str, Any]:
+    reference_data.load_all()
+    token = await login_su()
+    authorized_call, anonymous_call = asgi_call(token), asgi_call(None)
+    numbers = count()
+    results: Dict[str, Any] = {
+        "created": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "url": args.url,
+        "scale": asdict(scale),
+        "scenarios": {},
+    }
+    print(f"{'scenario':<40} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} "
+          f"{'alloc KiB':>10} {'errors':>7}")
+    for scenario in scenarios(scale, args.create_requests):
+        if args.only and not any(scenario.name.startswith(prefix) for prefix in args.only):
+            continue
+        result = await run_scenario(
+            scenario,
+            authorized_call if scenario.authorized else anonymous_call,
+            numbers,
+            scenario.requests or args.requests,
+            args.concurrency,
+            queries,
+            args.alloc_requests,
+        )
+        results["scenarios"][scenario.name] = asdict(result)
+        print(f"{scenario.name:<40} {result.throughput:>9.1f} {result.p50_ms:>8.2f} {result.p95_ms:>8.2f} "
+              f"{result.p99_ms:>8.2f} {result.queries_per_request:>8.2f} {result.peak_alloc_kib:>10.1f} "
+              f"{result.errors:>7}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite:///bench_suite.db", help="Database URL, the database is recreated")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per read scenario")
+    parser.add_argument("--create-requests", type=int, default=50, help="Requests per login and create scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--alloc-requests", type=int, default=10, help="Sequential requests traced for allocations")
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--employers", type=int, default=50)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--payments", type=int, default=50000)
+    parser.add_argument("--only", nargs="*", default=None, help="Prefixes of the scenarios to run")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", default=None, help="JSON results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative change before a regression")
+    args = parser.parse_args()
+
+    bench_scale = Scale(employers=args.employers, employees=args.employees, payments=args.payments)
+    engine = configure(args.url, args.pool_size)
+    seed(engine, bench_scale)
+    try:
+        bench_results = asyncio.run(main(args, bench_scale, QueryCounter(engine)))
+    finally:
+        password_hasher.shutdown()
+    with open(args.output, "w") as output_file:
+        json.dump(bench_results, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            found = compare(bench_results, json.load(baseline_file), args.tolerance)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if found else 0)
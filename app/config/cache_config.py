@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class CacheConfig(BaseSettings):
+    # seconds before reference data is reloaded, bounds staleness across worker processes
+    REFERENCE_DATA_TTL: float = 300
+    # Cache-Control of GET responses, revalidated with their ETag
+    HTTP_CACHE_CONTROL: str = "private, no-cache"
+    HTTP_CACHE_CONTROL_REFERENCE: str = "private, max-age=60"
+
+
+cache_cfg = CacheConfig()
@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class CompressionConfig(BaseSettings):
+    # responses smaller than this amount of bytes are sent uncompressed, streamed responses are always compressed
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+    COMPRESSION_GZIP_LEVEL: int = 6
+    # brotli is used only if the brotli package is installed
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+
+compression_cfg = CompressionConfig()
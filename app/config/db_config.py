@@ -1,3 +1,5 @@
+from typing import Optional
+
 from dotenv import load_dotenv
 from pydantic import BaseSettings, Field
 
@@ -5,15 +7,21 @@ load_dotenv()
 
 
 class DBConfig(BaseSettings):
-    DB_USER: str
-    DB_HOST: str
-    DB_NAME: str
-    DB_DRIVER: str
-    DB_PASSWORD: str = Field(..., env="MSSQL_SA_PASSWORD")
-    DB_PORT: str = Field(..., env="MSSQL_TCP_PORT")
-    DB_HOST_LOCAL: str
-    DB_PORT_LOCAL: str
-    DB_NAME_TEST: str
+    DB_URL: Optional[str] = None
+    DB_URL_TEST: str = "sqlite://"
+    DB_USER: Optional[str] = None
+    DB_HOST: Optional[str] = None
+    DB_NAME: Optional[str] = None
+    DB_DRIVER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = Field(None, env="MSSQL_SA_PASSWORD")
+    DB_PORT: Optional[str] = Field(None, env="MSSQL_TCP_PORT")
+    DB_ASYNC_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_FAST_EXECUTEMANY: bool = True
 
 
 db_cfg = DBConfig()
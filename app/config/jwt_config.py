@@ -8,6 +8,9 @@ class JWTConfig(BaseSettings):
     JWT_SECRET_KEY: str = Field(..., env="SECRET_KEY")
     JWT_ALGORITHM: str
     JWT_TOKEN_EXPIRE_TIME: str
+    # seconds a cached principal is trusted, bounds staleness across worker processes
+    PRINCIPAL_CACHE_TTL: float = 60
+    PRINCIPAL_CACHE_SIZE: int = 10000
 
 
 jwt_cfg = JWTConfig()
@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class PasswordConfig(BaseSettings):
+    # bcrypt cost factor, stored hashes with another cost are rehashed on the next login
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    # passwords being hashed or waiting, new ones are rejected above this limit, rosters take up to half of it
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+
+password_cfg = PasswordConfig()
@@ -0,0 +1,14 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class QueryStatsConfig(BaseSettings):
+    # debug mode, report the queries of a request in X-DB-Query-Count, X-DB-Query-Time and X-DB-Repeated-Query
+    QUERY_STATS_HEADERS: bool = False
+    # executions of the same statement in a request from which it is reported as N+1
+    QUERY_STATS_REPEAT_THRESHOLD: int = 10
+
+
+query_stats_cfg = QueryStatsConfig()
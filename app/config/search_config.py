@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class SearchConfig(BaseSettings):
+    # disabled index falls back to LIKE '%keyword%' queries
+    SEARCH_INDEX_ENABLED: bool = True
+    # seconds before an index is rebuilt, bounds staleness across worker processes
+    SEARCH_INDEX_TTL: float = 300
+    SEARCH_INDEX_BUILD_BATCH: int = 10000
+
+
+search_cfg = SearchConfig()
@@ -0,0 +1,16 @@
+from dotenv import load_dotenv
+from pydantic import BaseSettings
+
+load_dotenv()
+
+
+class SessionConfig(BaseSettings):
+    # seconds between purges of expired and logged out sessions, 0 disables the purge
+    SESSION_PURGE_INTERVAL: float = 3600
+    # rows per DELETE, far under the 5000 locks SQL Server escalates a statement to a table lock at
+    SESSION_PURGE_BATCH: int = 500
+    # seconds logged out sessions are kept before they are purged, counted from the login
+    SESSION_LOGGED_OUT_RETENTION: float = 86400
+
+
+session_cfg = SessionConfig()
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ConstantExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ConstantPaymentType(str, Enum):
+    salary = "salary"
+    prepayment = "prepayment"
@@ -4,7 +4,7 @@ from app.schemas.schema_bank import BankCreate, BankUpdate
 
 
 class CRUDBank(CRUDBase[Bank, BankCreate, BankUpdate]):
-    pass
+    search_columns = ("name", "mfo")
 
 
 bank = CRUDBank(Bank)
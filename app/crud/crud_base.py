@@ -1,15 +1,20 @@
 import logging
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy import and_
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
 from app.db.base import Base
-from app.db.session import get_session
-from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
+from app.db.search_index import matches, page_ids, search_index
+from app.db.session import get_current_session
+from app.utils.batching import MAX_IN_PARAMETERS, chunked
+from app.utils.exceptions.common_exceptions import (HTTPBadRequestException, HTTPInternalServerException,
+                                                    HTTPNotFoundException)
+from app.utils.pagination import SEARCH_RANK, keyset_paginate, rank_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -17,31 +22,76 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType], session: Session = next(get_session())):
+    # columns searched through the in-process trigram index instead of LIKE '%keyword%'
+    search_columns: Tuple[str, ...] = ()
+    # relationships loaded with every object, e.g. the ones of the response schema
+    eager_relationships: Tuple[str, ...] = ()
+    # relationship paths loaded by each `include` value
+    include_relationships: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, model: Type[ModelType], session: Optional[Session] = None):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         **Parameters**
         * `model`: A SQLAlchemy model class
         * `schema`: A Pydantic model (schema) class
-        * `session`: A database session
+        * `session`: A database session, if not set the session of the current request is used
         """
         self.model = model
-        self.session = session
+        self._session = session
+        search_index.register(model, self.search_columns)
+
+    @property
+    def session(self) -> Session:
+        if self._session is not None:
+            return self._session
+        return get_current_session()
+
+    def query(self, include: Iterable[str] = ()) -> Query:
+        return self.session.query(self.model).options(*self.loader_options(include))
+
+    def loader_options(self, include: Iterable[str] = ()) -> List[LoaderOption]:
+        """
+        Get the loader options of the eager relationships and the relationship paths of each `include` value
+        """
+        paths = list(self.eager_relationships)
+        for name in include:
+            if name not in self.include_relationships:
+                raise HTTPBadRequestException(detail=f"Invalid include: {name}")
+            paths.extend(self.include_relationships[name])
+        return [self.loader_option(path) for path in dict.fromkeys(paths)]
 
-    def get(self, id: Any) -> Optional[ModelType]:
-        obj = self.session.query(self.model).filter(self.model.id == id).first()
+    def loader_option(self, path: str) -> LoaderOption:
+        """
+        Load the dotted relationship path: many-to-one with a JOIN, collections with one SELECT ... IN per level
+        """
+        option = None
+        entity = self.model
+        for name in path.split("."):
+            attribute = getattr(entity, name)
+            loader = selectinload if attribute.property.uselist else joinedload
+            option = loader(attribute) if option is None else getattr(option, loader.__name__)(attribute)
+            entity = attribute.property.mapper.class_
+        return option
+
+    def get(self, id: Any, include: Iterable[str] = ()) -> Optional[ModelType]:
+        obj = self.query(include).filter(self.model.id == id).first()
         if not obj:
             raise HTTPNotFoundException(self.model.__name__, id)
         return obj
 
-    def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        obj_list = (
-            self.session.query(self.model)
-            .order_by(self.model.id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        order_by: str = "id",
+        include: Iterable[str] = (),
+    ) -> List[ModelType]:
+        query = self.paginate(self.query(include), after, order_by)
+        if not after:
+            query = query.offset(skip)
+        obj_list = query.limit(limit).all()
         if not obj_list:
             raise HTTPNotFoundException(self.model.__name__)
         return obj_list
@@ -55,23 +105,124 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             order_by_arg = order_by_arg.desc()
         return self.session.query(self.model).filter(and_(*filter_args)).order_by(order_by_arg).first()
 
+    def get_multi_by_attribute(
+        self, attribute: str, values: Iterable[Any], include: Optional[Iterable[str]] = None
+    ) -> List[ModelType]:
+        """
+        Get objects with the attribute value in values, queried in batches of IN parameters.
+        Relationships are loaded eagerly only if `include` is given
+        """
+        column = getattr(self.model, attribute)
+        query = self.session.query(self.model) if include is None else self.query(include)
+        obj_list = []
+        for batch in chunked(set(values), MAX_IN_PARAMETERS):
+            obj_list.extend(query.filter(column.in_(batch)).all())
+        return obj_list
+
+    def get_ids_by_attribute(self, attribute: str, values: Iterable[Any]) -> Dict[Any, int]:
+        """
+        Get IDs of the objects by the attribute value, queried in batches of IN parameters without loading the objects
+        """
+        column = getattr(self.model, attribute)
+        ids = {}
+        for batch in chunked(set(values), MAX_IN_PARAMETERS):
+            ids.update(self.session.query(column, self.model.id).filter(column.in_(batch)))
+        return ids
+
+    def get_missing_ids(self, ids: Iterable[int]) -> List[int]:
+        ids = set(ids)
+        existing_ids: Set[int] = set()
+        for batch in chunked(ids, MAX_IN_PARAMETERS):
+            existing_ids.update(
+                obj_id for obj_id, in self.session.query(self.model.id).filter(self.model.id.in_(batch))
+            )
+        return sorted(ids - existing_ids)
+
     def search_by_parameter(
-        self, parameter: str, keyword: str, limit: int = 100, skip: int = 0
+        self,
+        parameter: str,
+        keyword: str,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[str] = None,
+        order_by: str = "id",
     ) -> List[ModelType]:
-        if not hasattr(self.model, parameter):
-            raise HTTPBadRequestException(detail="Invalid search parameter")
-        results = (
-            self.session.query(self.model)
-            .filter(getattr(self.model, parameter).contains(keyword))
-            .order_by(self.model.id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        """
+        Search the objects which parameter contains the keyword, sorted by relevance with `order_by="rank"`.
+        Indexed columns sorted by relevance or ID are served from the trigram index
+        """
+        if search_index.is_indexed(self.model, parameter) and order_by in (SEARCH_RANK, "id"):
+            results = self.search_indexed(parameter, keyword, limit, skip, after, order_by)
+        else:
+            query = self.search_query(parameter, keyword)
+            if order_by == SEARCH_RANK:
+                # relevance is not computed by the database, the results are sorted by ID
+                cursor = rank_cursor(after)
+                query = query.order_by(self.model.id)
+                query = query.filter(self.model.id > cursor[-1]) if cursor else query.offset(skip)
+            else:
+                query = self.paginate(query, after, order_by)
+                if not after:
+                    query = query.offset(skip)
+            results = query.limit(limit).all()
         if not results:
             raise HTTPNotFoundException(self.model.__name__)
         return results
 
+    def search_query(self, parameter: str, keyword: str) -> Query:
+        if not hasattr(self.model, parameter):
+            raise HTTPBadRequestException(detail="Invalid search parameter")
+        return self.query().filter(
+            getattr(self.model, parameter).contains(keyword)
+        )
+
+    def search_indexed(
+        self,
+        parameter: str,
+        keyword: str,
+        limit: int,
+        skip: int,
+        after: Optional[str],
+        order_by: str,
+    ) -> List[ModelType]:
+        """
+        Get the page of IDs from the trigram index and fetch the rows.
+        Rows deleted or changed since the index was updated are fixed in the index and the page is fetched again
+        """
+        for _ in range(2):
+            hits = search_index.search(self.session, self.model, parameter, keyword)
+            ids = page_ids(hits, keyword, limit, skip, after, order_by)
+            objs = self.get_multi_by_attribute("id", ids, include=())
+            if not search_index.refresh(self.model, parameter, keyword, ids, objs):
+                break
+        objs_by_id = {obj.id: obj for obj in objs if matches(getattr(obj, parameter), keyword)}
+        return [objs_by_id[obj_id] for obj_id in ids if obj_id in objs_by_id]
+
+    def paginate(self, query: Query, after: Optional[str], order_by: str = "id") -> Query:
+        """
+        Order the query by indexed column and ID, and seek past the row encoded in keyset cursor.
+        Unlike offset, seeking costs the same for any page depth
+        """
+        return keyset_paginate(self.model, query, after, order_by)
+
+    def save(self, is_flush: bool = False) -> None:
+        """
+        Flush changes, commit them only if the session is bound to this CRUD object.
+        The session of the current request is committed once, when the request is done
+        """
+        try:
+            if is_flush or self._session is None:
+                self.session.flush()
+            else:
+                self.session.commit()
+        except SQLAlchemyError as err:
+            logging.exception(err)
+            # the whole unit of work is rolled back, the request must not be answered as if it was saved
+            self.session.rollback()
+            if isinstance(err, IntegrityError):
+                raise HTTPBadRequestException(detail=f"Invalid {self.model.__name__} data")
+            raise HTTPInternalServerException()
+
     def create(
         self, obj_in: Union[CreateSchemaType, Dict[str, Any]], is_flush: bool = False
     ) -> ModelType:
@@ -81,14 +232,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj_in_data = obj_in.dict(exclude_unset=True)
         db_obj = self.model(**obj_in_data)
         self.session.add(db_obj)
-        try:
-            if is_flush:
-                self.session.flush()
-            else:
-                self.session.commit()
-        except SQLAlchemyError as err:
-            logging.exception(err)
-            self.session.rollback()
+        self.save(is_flush)
         return db_obj
 
     def update(
@@ -106,27 +250,66 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         self.session.add(db_obj)
+        self.save(is_flush)
+        return db_obj
+
+    def create_many(
+        self, objs_in: List[Union[CreateSchemaType, Dict[str, Any]]], is_flush: bool = False
+    ) -> int:
+        """
+        Insert the objects with a single executemany (fast_executemany on pyodbc), IDs are not fetched back
+        """
+        mappings = [self.get_mapping(obj_in) for obj_in in objs_in]
+        self.execute_bulk(self.session.bulk_insert_mappings, mappings)
+        search_index.track_insert(self.session, self.model)
+        self.save(is_flush)
+        return len(mappings)
+
+    def update_many(
+        self, objs_in: List[Union[UpdateSchemaType, Dict[str, Any]]], is_flush: bool = False
+    ) -> int:
+        """
+        Update the objects by ID with a single executemany, objects must contain `id`
+        """
+        mappings = [self.get_mapping(obj_in) for obj_in in objs_in]
+        self.execute_bulk(self.session.bulk_update_mappings, mappings)
+        search_index.track_update(self.session, self.model, mappings)
+        self.save(is_flush)
+        return len(mappings)
+
+    def delete_many(self, ids: List[int], is_flush: bool = False) -> int:
+        missing_ids = self.get_missing_ids(ids)
+        if missing_ids:
+            raise HTTPNotFoundException(self.model.__name__, missing_ids[0])
+        count = 0
+        for batch in chunked(set(ids), MAX_IN_PARAMETERS):
+            count += self.session.query(self.model).filter(self.model.id.in_(batch)).delete(
+                synchronize_session=False
+            )
+        search_index.track_delete(self.session, self.model, ids)
+        self.save(is_flush)
+        return count
+
+    def get_mapping(self, obj_in: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get column values of the object, nested schemas and other non-column fields are dropped
+        """
+        obj_in_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        columns = self.model.__table__.columns
+        return {key: value for key, value in obj_in_data.items() if key in columns}
+
+    def execute_bulk(self, bulk_method: Callable, mappings: List[Dict[str, Any]]) -> None:
         try:
-            if is_flush:
-                self.session.flush()
-            else:
-                self.session.commit()
+            bulk_method(self.model, mappings)
         except SQLAlchemyError as err:
             logging.exception(err)
             self.session.rollback()
-        return db_obj
+            raise HTTPBadRequestException(detail=f"Invalid {self.model.__name__} data")
 
     def delete(self, id: int, is_flush: bool = False) -> ModelType:
         obj = self.session.query(self.model).get(id)
         if not obj:
             raise HTTPNotFoundException(self.model.__name__, id)
         self.session.delete(obj)
-        try:
-            if is_flush:
-                self.session.flush()
-            else:
-                self.session.commit()
-        except SQLAlchemyError as err:
-            logging.exception(err)
-            self.session.rollback()
+        self.save(is_flush)
         return obj
@@ -0,0 +1,180 @@
+import logging
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.crud.crud_base import CreateSchemaType, ModelType, UpdateSchemaType
+from app.db.search_index import matches, page_ids, search_index
+from app.db.session import get_current_async_session
+from app.utils.batching import MAX_IN_PARAMETERS, chunked
+from app.utils.exceptions.common_exceptions import (HTTPBadRequestException, HTTPInternalServerException,
+                                                    HTTPNotFoundException)
+from app.utils.pagination import SEARCH_RANK, keyset_paginate, rank_cursor
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType], session: Optional[AsyncSession] = None, options: Sequence = ()):
+        """
+        Async CRUD object with the same methods as `CRUDBase`, run on the async engine.
+        **Parameters**
+        * `model`: A SQLAlchemy model class
+        * `session`: An async database session, if not set the async session of the current request is used
+        * `options`: Loader options applied to every select, relationships must be loaded eagerly
+        as lazy loading is not available on async session
+        """
+        self.model = model
+        self._session = session
+        self.options = options
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is not None:
+            return self._session
+        return get_current_async_session()
+
+    def select(self) -> Select:
+        return select(self.model).options(*self.options)
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        result = await self.session.execute(self.select().filter(self.model.id == id))
+        obj = result.scalars().first()
+        if not obj:
+            raise HTTPNotFoundException(self.model.__name__, id)
+        return obj
+
+    async def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        query = keyset_paginate(self.model, self.select(), after, order_by)
+        if not after:
+            query = query.offset(skip)
+        result = await self.session.execute(query.limit(limit))
+        obj_list = result.scalars().all()
+        if not obj_list:
+            raise HTTPNotFoundException(self.model.__name__)
+        return obj_list
+
+    async def get_by_attribute(self, order_by: str = None, desc: bool = False, **kwargs) -> ModelType:
+        filter_args = []
+        for key, value in kwargs.items():
+            filter_args.append(getattr(self.model, key) == value)
+        order_by_arg = getattr(self.model, order_by) if order_by else self.model.id
+        if desc:
+            order_by_arg = order_by_arg.desc()
+        result = await self.session.execute(self.select().filter(and_(*filter_args)).order_by(order_by_arg))
+        return result.scalars().first()
+
+    async def search_by_parameter(
+        self,
+        parameter: str,
+        keyword: str,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        if search_index.is_indexed(self.model, parameter) and order_by in (SEARCH_RANK, "id"):
+            results = await self.search_indexed(parameter, keyword, limit, skip, after, order_by)
+        else:
+            if not hasattr(self.model, parameter):
+                raise HTTPBadRequestException(detail="Invalid search parameter")
+            query = self.select().filter(getattr(self.model, parameter).contains(keyword))
+            if order_by == SEARCH_RANK:
+                # relevance is not computed by the database, the results are sorted by ID
+                cursor = rank_cursor(after)
+                query = query.order_by(self.model.id)
+                query = query.filter(self.model.id > cursor[-1]) if cursor else query.offset(skip)
+            else:
+                query = keyset_paginate(self.model, query, after, order_by)
+                if not after:
+                    query = query.offset(skip)
+            result = await self.session.execute(query.limit(limit))
+            results = result.scalars().all()
+        if not results:
+            raise HTTPNotFoundException(self.model.__name__)
+        return results
+
+    async def search_indexed(
+        self,
+        parameter: str,
+        keyword: str,
+        limit: int,
+        skip: int,
+        after: Optional[str],
+        order_by: str,
+    ) -> List[ModelType]:
+        for _ in range(2):
+            hits = await self.session.run_sync(search_index.search, self.model, parameter, keyword)
+            ids = page_ids(hits, keyword, limit, skip, after, order_by)
+            objs = []
+            for batch in chunked(ids, MAX_IN_PARAMETERS):
+                result = await self.session.execute(self.select().filter(self.model.id.in_(batch)))
+                objs.extend(result.scalars().all())
+            if not search_index.refresh(self.model, parameter, keyword, ids, objs):
+                break
+        objs_by_id = {obj.id: obj for obj in objs if matches(getattr(obj, parameter), keyword)}
+        return [objs_by_id[obj_id] for obj_id in ids if obj_id in objs_by_id]
+
+    async def save(self, is_flush: bool = False) -> None:
+        """
+        Flush changes, commit them only if the session is bound to this CRUD object.
+        The async session of the current request is committed once, when the request is done
+        """
+        try:
+            if is_flush or self._session is None:
+                await self.session.flush()
+            else:
+                await self.session.commit()
+        except SQLAlchemyError as err:
+            logging.exception(err)
+            # the whole unit of work is rolled back, the request must not be answered as if it was saved
+            await self.session.rollback()
+            if isinstance(err, IntegrityError):
+                raise HTTPBadRequestException(detail=f"Invalid {self.model.__name__} data")
+            raise HTTPInternalServerException()
+
+    async def create(
+        self, obj_in: Union[CreateSchemaType, Dict[str, Any]], is_flush: bool = False
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            obj_in_data = obj_in
+        else:
+            obj_in_data = obj_in.dict(exclude_unset=True)
+        db_obj = self.model(**obj_in_data)
+        self.session.add(db_obj)
+        await self.save(is_flush)
+        return db_obj
+
+    async def update(
+        self,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        is_flush: bool = False,
+    ) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        self.session.add(db_obj)
+        await self.save(is_flush)
+        return db_obj
+
+    async def delete(self, id: int, is_flush: bool = False) -> ModelType:
+        obj = await self.session.get(self.model, id)
+        if not obj:
+            raise HTTPNotFoundException(self.model.__name__, id)
+        await self.session.delete(obj)
+        await self.save(is_flush)
+        return obj
@@ -1,14 +1,18 @@
-from typing import List
-
 from sqlalchemy import and_
+from sqlalchemy.orm import Query
 
-from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
 from app.crud.crud_base import CRUDBase, ModelType
 from app.db.models import Employee, User
 from app.schemas.schema_employee import EmployeeCreate, EmployeeUpdate
 
 
 class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
+    search_columns = ("fullname", "passport", "tax_id")
+    eager_relationships = ("user",)
+    include_relationships = {
+        "employee_accounts": ("employee_accounts",),
+    }
+
     def get_by_attribute(self, **kwargs) -> ModelType:
         filter_user_args = []
         filter_employee_args = []
@@ -29,35 +33,14 @@ class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
                 return obj.employee
         return obj
 
-    def search_by_parameter(
-        self, parameter: str, keyword: str, limit: int = 100, skip: int = 0
-    ) -> List[ModelType]:
+    def search_query(self, parameter: str, keyword: str) -> Query:
         if hasattr(User, parameter):
-            filter_arg = getattr(User, parameter)
-            users = (
-                self.session.query(User)
-                .filter(filter_arg.contains(keyword))
-                .order_by(User.id)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
-            results = [user.employee for user in users if user.employee]
-        elif hasattr(self.model, parameter):
-            filter_arg = getattr(self.model, parameter)
-            results = (
-                self.session.query(self.model)
-                .filter(filter_arg.contains(keyword))
-                .order_by(self.model.id)
-                .offset(skip)
-                .limit(limit)
-                .all()
+            return (
+                self.query()
+                .join(User)
+                .filter(getattr(User, parameter).contains(keyword))
             )
-        else:
-            raise HTTPBadRequestException(detail="Invalid search parameter")
-        if not results:
-            raise HTTPNotFoundException(self.model.__name__)
-        return results
+        return super().search_query(parameter, keyword)
 
 
 employee: CRUDEmployee = CRUDEmployee(Employee)
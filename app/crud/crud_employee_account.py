@@ -10,7 +10,7 @@ class CRUDEmployeeAccount(
         EmployeeAccountUpdate
     ]
 ):
-    pass
+    search_columns = ("name", "number", "issuer")
 
 
 employee_account = CRUDEmployeeAccount(EmployeeAccount)
@@ -1,14 +1,20 @@
-from typing import List
-
 from sqlalchemy import and_
+from sqlalchemy.orm import Query
 
 from app.crud.crud_base import CRUDBase, ModelType
 from app.db.models import Employer, User
 from app.schemas.schema_employer import EmployerCreate, EmployerUpdate
-from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
 
 
 class CRUDEmployer(CRUDBase[Employer, EmployerCreate, EmployerUpdate]):
+    search_columns = ("name", "address", "edrpou")
+    eager_relationships = ("user",)
+    include_relationships = {
+        "employees": ("employees.user",),
+        "employees.employee_accounts": ("employees.user", "employees.employee_accounts"),
+        "employer_payment_methods": ("employer_payment_methods",),
+    }
+
     def get_by_attribute(self, **kwargs) -> ModelType:
         filter_user_args = []
         filter_employer_args = []
@@ -29,35 +35,14 @@ class CRUDEmployer(CRUDBase[Employer, EmployerCreate, EmployerUpdate]):
                 return obj.employer
         return obj
 
-    def search_by_parameter(
-        self, parameter: str, keyword: str, limit: int = 100, skip: int = 0
-    ) -> List[ModelType]:
+    def search_query(self, parameter: str, keyword: str) -> Query:
         if hasattr(User, parameter):
-            filter_arg = getattr(User, parameter)
-            users = (
-                self.session.query(User)
-                .filter(filter_arg.contains(keyword))
-                .order_by(User.id)
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
-            results = [user.employer for user in users if user.employer]
-        elif hasattr(self.model, parameter):
-            filter_arg = getattr(self.model, parameter)
-            results = (
-                self.session.query(self.model)
-                .filter(filter_arg.contains(keyword))
-                .order_by(self.model.id)
-                .offset(skip)
-                .limit(limit)
-                .all()
+            return (
+                self.query()
+                .join(User)
+                .filter(getattr(User, parameter).contains(keyword))
             )
-        else:
-            raise HTTPBadRequestException(detail="Invalid search parameter")
-        if not results:
-            raise HTTPNotFoundException(self.model.__name__)
-        return results
+        return super().search_query(parameter, keyword)
 
 
 employer: CRUDEmployer = CRUDEmployer(Employer)
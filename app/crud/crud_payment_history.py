@@ -1,5 +1,16 @@
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from sqlalchemy import (BigInteger, Date, DateTime, Integer, String, and_, case, exists, extract, func, insert, literal,
+                        select, true, union_all)
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import CompoundSelect, Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.constansts.constants_payment_type import ConstantPaymentType
 from app.crud.crud_base import CRUDBase
-from app.db.models import PaymentHistory
+from app.db.models import Employee, EmployeeAccount, Employer, EmployerPaymentMethod, PaymentHistory
 from app.schemas.schema_payment_history import PaymentHistoryCreate, PaymentHistoryUpdate
 
 
@@ -10,7 +21,181 @@ class CRUDPaymentHistory(
         PaymentHistoryUpdate
     ]
 ):
-    pass
+    export_columns = (
+        "id",
+        "amount",
+        "creation_date",
+        "employee_account_id",
+        "employer_payment_method_id",
+        "payment_status_type_id",
+    )
+
+    def get_payroll_summary(
+        self, employer_id: Optional[int], run_date: date, payment_type: Optional[ConstantPaymentType]
+    ) -> Dict[str, Any]:
+        """
+        Count employees of the payroll run, the payments to be made and the ones skipped, in a single query
+        """
+        rows = self.payroll_query(employer_id, run_date, payment_type).subquery()
+        has_account = rows.c.employee_account_id.isnot(None)
+        has_method = rows.c.employer_payment_method_id.isnot(None)
+        is_paid = self.is_paid(rows.c.employee_account_id, run_date, rows.c.payment_type)
+        employees, employers, payments, no_account, no_method, paid = self.session.execute(
+            select(
+                func.count(func.distinct(rows.c.employee_id)),
+                func.count(func.distinct(rows.c.employer_id)),
+                func.sum(case((and_(has_account, has_method, ~is_paid), 1), else_=0)),
+                func.sum(case((~has_account, 1), else_=0)),
+                func.sum(case((and_(has_account, ~has_method), 1), else_=0)),
+                func.sum(case((and_(has_account, has_method, is_paid), 1), else_=0)),
+            )
+        ).one()
+        return {
+            "employers": employers,
+            "employees": employees,
+            "payments": payments or 0,
+            "skipped_no_account": no_account or 0,
+            "skipped_no_payment_method": no_method or 0,
+            "skipped_already_paid": paid or 0,
+        }
+
+    def create_payroll(
+        self,
+        employer_id: Optional[int],
+        run_date: date,
+        payment_type: Optional[ConstantPaymentType],
+        amount: int,
+        payment_status_type_id: int,
+        creation_date: datetime,
+        is_flush: bool = False,
+    ) -> int:
+        """
+        Insert the payments of the payroll run with a single INSERT ... SELECT, rows never leave the database.
+        Accounts paid by a run of the same date and payment type are skipped, so a repeated run pays nobody twice
+        """
+        rows = self.payroll_query(employer_id, run_date, payment_type).subquery()
+        payable = select(
+            literal(amount, BigInteger),
+            literal(creation_date, DateTime),
+            rows.c.employee_account_id,
+            rows.c.employer_payment_method_id,
+            literal(payment_status_type_id, Integer),
+            literal(run_date, Date),
+            rows.c.payment_type,
+        ).where(
+            rows.c.employee_account_id.isnot(None),
+            rows.c.employer_payment_method_id.isnot(None),
+            ~self.is_paid(rows.c.employee_account_id, run_date, rows.c.payment_type),
+        )
+        result = self.session.execute(
+            insert(self.model).from_select(
+                [
+                    "amount",
+                    "creation_date",
+                    "employee_account_id",
+                    "employer_payment_method_id",
+                    "payment_status_type_id",
+                    "run_date",
+                    "payment_type",
+                ],
+                payable,
+            )
+        )
+        self.save(is_flush)
+        return result.rowcount
+
+    @classmethod
+    def payroll_query(
+        cls, employer_id: Optional[int], run_date: date, payment_type: Optional[ConstantPaymentType] = None
+    ) -> Union[Select, CompoundSelect]:
+        """
+        Get employees of the employer, or of all employers due on the run date, with the payment type,
+        the latest default active account of the employee and the latest active payment method of the employer,
+        NULL if there is none. An employer is due for each payment type which date has the day of month of the run
+        """
+        account = (
+            select(EmployeeAccount.employee_id, func.max(EmployeeAccount.id).label("employee_account_id"))
+            .where(EmployeeAccount.is_active == true(), EmployeeAccount.is_default == true())
+            .group_by(EmployeeAccount.employee_id)
+            .subquery()
+        )
+        method = (
+            select(
+                EmployerPaymentMethod.employer_id,
+                func.max(EmployerPaymentMethod.id).label("employer_payment_method_id"),
+            )
+            .where(EmployerPaymentMethod.is_active == true())
+            .group_by(EmployerPaymentMethod.employer_id)
+            .subquery()
+        )
+
+        def employees(payment_type: ConstantPaymentType) -> Select:
+            return (
+                select(
+                    Employee.id.label("employee_id"),
+                    Employee.employer_id,
+                    account.c.employee_account_id,
+                    method.c.employer_payment_method_id,
+                    literal(payment_type.value, String(50)).label("payment_type"),
+                )
+                .join(account, account.c.employee_id == Employee.id, isouter=True)
+                .join(method, method.c.employer_id == Employee.employer_id, isouter=True)
+            )
+
+        if employer_id is not None:
+            return employees(payment_type or ConstantPaymentType.salary).where(Employee.employer_id == employer_id)
+        queries = [
+            employees(due_type)
+            .join(Employer, Employer.id == Employee.employer_id)
+            .where(cls.is_due(getattr(Employer, f"{due_type.value}_date"), run_date))
+            for due_type in ([payment_type] if payment_type else ConstantPaymentType)
+        ]
+        return queries[0] if len(queries) == 1 else union_all(*queries)
+
+    @staticmethod
+    def is_due(payment_date: ColumnElement, run_date: date) -> ColumnElement:
+        """
+        Payments recur monthly on the day of the payment date, the ones past the end of a shorter month
+        are due on its last day
+        """
+        day = extract("day", payment_date)
+        if run_date.day < monthrange(run_date.year, run_date.month)[1]:
+            return day == run_date.day
+        return day >= run_date.day
+
+    def is_paid(self, employee_account_id: ColumnElement, run_date: date, payment_type: ColumnElement) -> ColumnElement:
+        return exists().where(
+            self.model.employee_account_id == employee_account_id,
+            self.model.run_date == run_date,
+            self.model.payment_type == payment_type,
+        )
+
+    def get_export_partitions(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employer_id: Optional[int] = None,
+        payment_status_type_id: Optional[int] = None,
+        partition_size: int = 1000,
+    ) -> Iterator[List[Row]]:
+        """
+        Stream the payments created in the date range (both days included) as partitions of rows,
+        the rows are fetched from a server-side cursor and never loaded as ORM objects
+        """
+        query = select(*(getattr(self.model, column) for column in self.export_columns)).order_by(self.model.id)
+        if date_from is not None:
+            query = query.where(self.model.creation_date >= datetime.combine(date_from, time.min))
+        if date_to is not None:
+            query = query.where(self.model.creation_date < datetime.combine(date_to + timedelta(days=1), time.min))
+        if employer_id is not None:
+            query = query.join(EmployerPaymentMethod).where(EmployerPaymentMethod.employer_id == employer_id)
+        if payment_status_type_id is not None:
+            query = query.where(self.model.payment_status_type_id == payment_status_type_id)
+        result = self.session.execute(query, execution_options={"stream_results": True})
+        try:
+            yield from result.partitions(partition_size)
+        finally:
+            result.close()
 
 
 payment_history = CRUDPaymentHistory(PaymentHistory)
@@ -1,10 +1,55 @@
+from typing import Any, Optional, Tuple
+
+from app.constansts.constants_session import ConstantSessionStatus
 from app.crud.crud_base import CRUDBase
-from app.db.models import Session
+from app.db.models import Role, Session, User
 from app.schemas.schema_session import SessionCreate, SessionUpdate
+from app.security.digest import token_digest
 
 
 class CRUDSession(CRUDBase[Session, SessionCreate, SessionUpdate]):
-    pass
+    def get_by_token_with_role(self, token: str) -> Optional[Tuple[Session, str]]:
+        """
+        Get the session of the token with the user role name in a single query, seeking the token digest index
+        """
+        return (
+            self.session.query(self.model, Role.name)
+            .join(User, User.id == self.model.user_id)
+            .join(Role, Role.id == User.role_id)
+            .filter(self.model.token_digest == token_digest(token))
+            .order_by(self.model.id.desc())
+            .first()
+        )
+
+    def log_out_user(self, user_id: int, is_flush: bool = False) -> int:
+        """
+        Log out the logged in sessions of the user in a single statement, get the number of sessions logged out
+        """
+        count = (
+            self.session.query(self.model)
+            .filter(self.model.user_id == user_id, self.model.status == ConstantSessionStatus.logged_in)
+            .update({self.model.status: ConstantSessionStatus.logged_out}, synchronize_session=False)
+        )
+        self.save(is_flush)
+        return count
+
+    def purge_batch(self, criterion: Any, after_id: int, batch_size: int) -> Tuple[int, Optional[int]]:
+        """
+        Delete up to `batch_size` sessions matching the criterion with an ID over `after_id`, by primary key so the
+        DELETE locks only those rows. Get the amount of deleted sessions and the last ID scanned, None when done
+        """
+        ids = [
+            obj_id
+            for obj_id, in self.session.query(self.model.id)
+            .filter(criterion, self.model.id > after_id)
+            .order_by(self.model.id)
+            .limit(batch_size)
+        ]
+        if not ids:
+            return 0, None
+        count = self.session.query(self.model).filter(self.model.id.in_(ids)).delete(synchronize_session=False)
+        self.save()
+        return count, ids[-1]
 
 
 session: CRUDSession = CRUDSession(Session)
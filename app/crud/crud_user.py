@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 
 from app.crud.crud_base import CRUDBase, ModelType
 from app.db.models import User
 from app.schemas.schema_user import UserCreate, UserUpdate
 from app.utils.exceptions.common_exceptions import HTTPBadRequestException
 from app.security.passwords import verify_password
+from app.security.principal import invalidate_user_principals
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
@@ -15,5 +16,29 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 return _user
         raise HTTPBadRequestException(detail="Incorrect email or password")
 
+    # role and status changes must not be served from cached principals
+
+    def update(
+        self,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]],
+        is_flush: bool = False,
+    ) -> User:
+        invalidate_user_principals(db_obj.id)
+        return super().update(db_obj, obj_in, is_flush)
+
+    def update_many(self, objs_in: List[Union[UserUpdate, Dict[str, Any]]], is_flush: bool = False) -> int:
+        mappings = [self.get_mapping(obj_in) for obj_in in objs_in]
+        invalidate_user_principals(*(mapping["id"] for mapping in mappings))
+        return super().update_many(mappings, is_flush)
+
+    def delete(self, id: int, is_flush: bool = False) -> User:
+        invalidate_user_principals(id)
+        return super().delete(id, is_flush)
+
+    def delete_many(self, ids: List[int], is_flush: bool = False) -> int:
+        invalidate_user_principals(*ids)
+        return super().delete_many(ids, is_flush)
+
 
 user: CRUDUser = CRUDUser(User)
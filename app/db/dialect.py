@@ -0,0 +1,89 @@
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.config.db_config import db_cfg
+from app.db.pool import PoolMetrics
+
+pool_args = dict(
+    pool_size=db_cfg.DB_POOL_SIZE,
+    max_overflow=db_cfg.DB_MAX_OVERFLOW,
+    pool_timeout=db_cfg.DB_POOL_TIMEOUT,
+    pool_recycle=db_cfg.DB_POOL_RECYCLE,
+    pool_pre_ping=db_cfg.DB_POOL_PRE_PING,
+)
+
+
+def database_url() -> Union[str, URL]:
+    """
+    Get `DB_URL`, or the SQL Server URL assembled from the docker settings if it is not set
+    """
+    if db_cfg.DB_URL:
+        return db_cfg.DB_URL
+    return URL.create(
+        "mssql+pyodbc",
+        username=db_cfg.DB_USER,
+        password=db_cfg.DB_PASSWORD,
+        host=db_cfg.DB_HOST,
+        port=int(db_cfg.DB_PORT) if db_cfg.DB_PORT else None,
+        database=db_cfg.DB_NAME,
+        query={"driver": db_cfg.DB_DRIVER} if db_cfg.DB_DRIVER else {},
+    )
+
+
+def is_memory_database(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_args(url: URL) -> Dict[str, Any]:
+    """
+    Get the engine arguments of the dialect: pool settings, driver options and connect arguments
+    """
+    if is_memory_database(url):
+        # every connection to an in-memory database opens a new empty one, all threads share a single connection
+        return dict(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    args: Dict[str, Any] = dict(poolclass=QueuePool, **pool_args)
+    if url.get_backend_name() == "sqlite":
+        # pooled connections are used by the threadpool workers
+        args["connect_args"] = {"check_same_thread": False}
+    elif url.get_backend_name() == "mssql" and url.get_driver_name() == "pyodbc":
+        args["fast_executemany"] = db_cfg.DB_FAST_EXECUTEMANY
+    return args
+
+
+def _on_sqlite_connect(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _on_sqlite_memory_connect(dbapi_connection, connection_record) -> None:
+    # pysqlite begins transactions itself (not before SELECT) and breaks SAVEPOINT, SQLAlchemy emits BEGIN instead.
+    # Files keep pysqlite transactions, concurrent read-then-write transactions would deadlock
+    dbapi_connection.isolation_level = None
+
+
+def _on_sqlite_begin(connection) -> None:
+    connection.exec_driver_sql("BEGIN")
+
+
+def create_db_engine(url: Union[str, URL], metrics: Optional[PoolMetrics] = None, **kwargs: Any) -> Engine:
+    """
+    Create the engine of the database URL with the arguments of its dialect, `kwargs` override them.
+    SQLite connections enforce foreign keys like SQL Server does, in-memory databases support SAVEPOINT too
+    """
+    url = make_url(url)
+    args = {**engine_args(url), **kwargs}
+    if metrics is not None:
+        args["poolclass"] = metrics.pool_class(args["poolclass"])
+    engine = create_engine(url, **args)
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _on_sqlite_connect)
+    if is_memory_database(url):
+        event.listen(engine, "connect", _on_sqlite_memory_connect)
+        event.listen(engine, "begin", _on_sqlite_begin)
+    if metrics is not None:
+        metrics.instrument(engine)
+    return engine
@@ -1,8 +1,11 @@
-from sqlalchemy import (BigInteger, Boolean, Column, Date, DateTime,
-                        ForeignKey, Integer, String)
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import (BINARY, BigInteger, Boolean, Column, Date, DateTime,
+                        ForeignKey, Index, Integer, String, desc)
+from sqlalchemy.orm import relationship, validates
 
 from app.db.base import Base
+from app.security.digest import token_digest
 
 
 class User(Base):
@@ -59,13 +62,23 @@ class Role(Base):
 
 class Session(Base):
     __tablename__ = "session"
+    __table_args__ = (
+        Index("ix_session_token_digest", "token_digest"),
+        Index("ix_session_user_id_creation_date", "user_id", desc("creation_date")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     token = Column(String(400))
+    token_digest = Column(BINARY(32), nullable=True)
     creation_date = Column(DateTime)
     status = Column(String(50))
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"))
 
+    @validates("token")
+    def validate_token(self, key: str, token: Optional[str]) -> Optional[str]:
+        self.token_digest = token_digest(token) if token is not None else None
+        return token
+
 
 class Employer(Base):
     __tablename__ = "employer"
@@ -108,7 +121,7 @@ class EmployerPaymentMethod(Base):
     is_active = Column(Boolean, default=False)
     creation_date = Column(DateTime)
     deactivation_date = Column(Date)
-    employer_id = Column(Integer, ForeignKey("employer.id", ondelete="CASCADE"))
+    employer_id = Column(Integer, ForeignKey("employer.id", ondelete="CASCADE"), index=True)
     bank_id = Column(Integer, ForeignKey("bank.id", ondelete="CASCADE"))
 
     payment_histories = relationship(
@@ -143,7 +156,7 @@ class Employee(Base):
     tax_id = Column(String(50), index=True, nullable=True)
     birth_date = Column(Date, nullable=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"))
-    employer_id = Column(Integer, ForeignKey("employer.id"))
+    employer_id = Column(Integer, ForeignKey("employer.id"), index=True)
 
     employee_accounts = relationship(
         "EmployeeAccount",
@@ -163,7 +176,7 @@ class EmployeeAccount(Base):
     issuer = Column(String(100))
     creation_date = Column(DateTime)
     deactivation_date = Column(Date)
-    employee_id = Column(Integer, ForeignKey("employee.id", ondelete="CASCADE"))
+    employee_id = Column(Integer, ForeignKey("employee.id", ondelete="CASCADE"), index=True)
     account_type_id = Column(Integer, ForeignKey("account_type.id"))
 
     payment_histories = relationship(
@@ -186,6 +199,14 @@ class AccountType(Base):
 
 class PaymentHistory(Base):
     __tablename__ = "payment_history"
+    __table_args__ = (
+        Index(
+            "ix_payment_history_employee_account_id_run_date_payment_type",
+            "employee_account_id",
+            "run_date",
+            "payment_type",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(BigInteger)
@@ -199,6 +220,9 @@ class PaymentHistory(Base):
     payment_status_type_id = Column(
         Integer, ForeignKey("payment_status_type.id")
     )
+    # the payroll run of the payment, NULL for payments created otherwise
+    run_date = Column(Date, nullable=True)
+    payment_type = Column(String(50), nullable=True)
 
 
 class PaymentStatusType(Base):
@@ -0,0 +1,92 @@
+from time import perf_counter
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.utils.metrics import Counter, Histogram
+
+
+class PoolMetrics:
+    """
+    Live statistics of the engine connection pool: occupancy, checkout wait time and connect latency
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.wait_time = Histogram()
+        self.connect_time = Histogram()
+        self.checkouts = Counter()
+        self.timeouts = Counter()
+        self.connects = Counter()
+        self.invalidations = Counter()
+
+    def pool_class(self, base: Type[Pool] = QueuePool) -> Type[Pool]:
+        """
+        Get the pool class which records checkout wait time (new connections included) and timeouts
+        """
+        metrics = self
+
+        class MeteredPool(base):
+            def connect(self):
+                started = perf_counter()
+                try:
+                    return super().connect()
+                except TimeoutError:
+                    metrics.timeouts.inc()
+                    raise
+                finally:
+                    metrics.wait_time.observe(perf_counter() - started)
+
+        MeteredPool.__name__ = f"Metered{base.__name__}"
+        return MeteredPool
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Listen to connection events of the (sync) engine, the listeners survive pool recreation
+        """
+        self.engine = engine
+        event.listen(engine, "do_connect", self._on_do_connect)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_do_connect(self, dialect, connection_record, cargs, cparams) -> None:
+        connection_record.info["connect_started"] = perf_counter()
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects.inc()
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            self.connect_time.observe(perf_counter() - started)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts.inc()
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations.inc()
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        is_queue_pool = isinstance(pool, QueuePool)
+        return {
+            "name": self.name,
+            "pool": type(pool).__name__,
+            "size": pool.size() if is_queue_pool else None,
+            "checked_in": pool.checkedin() if is_queue_pool else None,
+            "checked_out": pool.checkedout() if is_queue_pool else None,
+            "overflow": pool.overflow() if is_queue_pool else None,
+            "checkouts": self.checkouts.value,
+            "timeouts": self.timeouts.value,
+            "connects": self.connects.value,
+            "invalidations": self.invalidations.value,
+            "wait_time": self.wait_time.to_dict(),
+            "connect_time": self.connect_time.to_dict(),
+        }
+
+
+pool_metrics = PoolMetrics("default")
+async_pool_metrics = PoolMetrics("async")
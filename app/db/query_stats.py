@@ -0,0 +1,107 @@
+import logging
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.query_stats_config import query_stats_cfg
+from app.utils.metrics import Counter, Histogram
+
+# statements per request, from single lookups to N+1 pages
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class QueryStats:
+    """
+    Statements executed in a unit of work (request or test block) and the time spent in the database
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: StatementCounter = StatementCounter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        """
+        Get the statement executed the most times with its count, lazy loads in a loop repeat the same statement
+        """
+        most_common = self.statements.most_common(1)
+        return most_common[0] if most_common else None
+
+    def report(self) -> str:
+        return "\n".join(f"{count} x {statement}" for statement, count in self.statements.most_common())
+
+
+query_stats_context: ContextVar[Optional[QueryStats]] = ContextVar("query_stats_context", default=None)
+
+
+def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if query_stats_context.get() is not None:
+        conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = query_stats_context.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, perf_counter() - started.pop())
+
+
+class QueryMetrics:
+    """
+    Statements and database time per request, and requests which repeat a statement (N+1) by route
+    """
+
+    def __init__(self, repeat_threshold: int = query_stats_cfg.QUERY_STATS_REPEAT_THRESHOLD):
+        self.repeat_threshold = repeat_threshold
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time = Histogram()
+        self.statements = Counter()
+        self.repeated: Dict[str, Counter] = {}
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Record the statements of the (sync) engine in the query stats of the current context
+        """
+        event.listen(engine, "before_cursor_execute", _on_before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _on_after_cursor_execute)
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        self.queries.observe(stats.count)
+        self.db_time.observe(stats.duration)
+        self.statements.inc(stats.count)
+        most_repeated = self.most_repeated(stats)
+        if most_repeated is not None:
+            statement, count = most_repeated
+            self.repeated.setdefault(route, Counter()).inc()
+            logging.warning("N+1 in %s: %s statements, %s x %s", route, stats.count, count, " ".join(statement.split()))
+
+    def most_repeated(self, stats: QueryStats) -> Optional[Tuple[str, int]]:
+        """
+        Get the most repeated statement of the request if it is repeated at least as many times as the threshold
+        """
+        most_repeated = stats.most_repeated()
+        if most_repeated is None or most_repeated[1] < self.repeat_threshold:
+            return None
+        return most_repeated
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.queries.count,
+            "statements": self.statements.value,
+            "repeat_threshold": self.repeat_threshold,
+            "queries": self.queries.to_dict(),
+            "db_time": self.db_time.to_dict(),
+            "repeated": {route: counter.value for route, counter in sorted(self.repeated.items())},
+        }
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,149 @@
+import logging
+import threading
+from collections import defaultdict
+from hashlib import blake2b
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config.cache_config import cache_cfg
+from app.db.base import Base
+from app.db.models import AccountType, Bank, EmployerType, PaymentStatusType, Role, StatusType
+from app.db.session import SessionLocal, session_context
+from app.utils.metrics import Counter
+
+# models changed in the transaction, dropped from the cache once more when it is committed
+CHANGES_KEY = "reference_data_changes"
+
+
+class ReferenceTable:
+    """
+    Snapshot of a small, rarely changed table: rows by ID and row IDs by name.
+    Rows are detached from the session they were loaded with, only their columns are available
+    """
+
+    def __init__(self, rows: List[Base]):
+        self.rows: Dict[int, Base] = {row.id: row for row in rows}
+        self.ids: Dict[str, int] = {}
+        for row in sorted(rows, key=lambda row: row.id):
+            self.ids.setdefault(row.name, row.id)
+        self.digest = self.content_digest(rows)
+        self.loaded_at = monotonic()
+
+    @staticmethod
+    def content_digest(rows: List[Base]) -> str:
+        """
+        Hash of the column values, the same in every process while the table is not changed
+        """
+        if not rows:
+            return blake2b(digest_size=8).hexdigest()
+        keys = [attribute.key for attribute in inspect(type(rows[0])).column_attrs]
+        values = [tuple(getattr(row, key) for key in keys) for row in sorted(rows, key=lambda row: row.id)]
+        return blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+class ReferenceData:
+    """
+    In-process cache of reference tables, loaded at startup and reloaded after `ttl` seconds.
+    Managers of the tables invalidate it on writes, both at once and when the transaction is committed
+    """
+
+    def __init__(self, models: Tuple[Type[Base], ...], ttl: float):
+        self.models = models
+        self.ttl = ttl
+        self.hits: Dict[Type[Base], Counter] = defaultdict(Counter)
+        self.misses: Dict[Type[Base], Counter] = defaultdict(Counter)
+        self._tables: Dict[Type[Base], ReferenceTable] = {}
+        self._lock = threading.Lock()
+
+    def table(self, model: Type[Base]) -> ReferenceTable:
+        table = self._tables.get(model)
+        if table is not None and monotonic() - table.loaded_at <= self.ttl:
+            self.hits[model].inc()
+            return table
+        self.misses[model].inc()
+        return self.load(model)
+
+    def load(self, model: Type[Base]) -> ReferenceTable:
+        with SessionLocal() as session:
+            table = ReferenceTable(session.query(model).all())
+        with self._lock:
+            self._tables[model] = table
+        return table
+
+    def load_all(self) -> None:
+        """
+        Load every table at startup, a database which is not available yet leaves them to be loaded on first use
+        """
+        try:
+            for model in self.models:
+                self.load(model)
+        except SQLAlchemyError as err:
+            logging.exception(err)
+
+    def get(self, model: Type[Base], obj_id: int) -> Optional[Base]:
+        return self.table(model).rows.get(obj_id)
+
+    def get_all(self, model: Type[Base]) -> List[Base]:
+        return list(self.table(model).rows.values())
+
+    def etag(self, model: Type[Base]) -> str:
+        """
+        Weak ETag of the responses built from the table, changed when the table is
+        """
+        return f'W/"{model.__tablename__}-{self.table(model).digest}"'
+
+    def get_by_name(self, model: Type[Base], name: str) -> Optional[Base]:
+        table = self.table(model)
+        obj_id = table.ids.get(name)
+        return table.rows.get(obj_id) if obj_id is not None else None
+
+    def invalidate(self, model: Type[Base]) -> None:
+        """
+        Drop the table now, and once more when the session of the current request commits,
+        so a reload between the write and the commit is not kept
+        """
+        self._drop(model)
+        session = session_context.get()
+        if session is not None:
+            session.info.setdefault(CHANGES_KEY, set()).add(model)
+
+    def _drop(self, model: Type[Base]) -> None:
+        with self._lock:
+            self._tables.pop(model, None)
+
+    def _after_commit(self, session: Session) -> None:
+        for model in session.info.pop(CHANGES_KEY, ()):
+            self._drop(model)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(CHANGES_KEY, None)
+
+    def listen(self) -> None:
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            tables = list(self._tables.items())
+        return [
+            {
+                "name": f"reference:{model.__name__}",
+                "size": len(table.rows),
+                "maxsize": None,
+                "ttl": self.ttl,
+                "hits": self.hits[model].value,
+                "misses": self.misses[model].value,
+            }
+            for model, table in tables
+        ]
+
+
+reference_data = ReferenceData(
+    models=(Role, StatusType, EmployerType, AccountType, PaymentStatusType, Bank),
+    ttl=cache_cfg.REFERENCE_DATA_TTL,
+)
+reference_data.listen()
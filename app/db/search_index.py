@@ -0,0 +1,382 @@
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from time import monotonic
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config.search_config import search_cfg
+from app.db.base import Base
+from app.db.session import SessionLocal
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+from app.utils.metrics import Counter
+from app.utils.pagination import SEARCH_RANK, decode_cursor, rank_cursor
+
+# changes of indexed rows are applied to the index once the transaction is committed
+CHANGES_KEY = "search_index_changes"
+
+
+def normalize(value: Any) -> Optional[str]:
+    return None if value is None else str(value).lower()
+
+
+def matches(value: Any, keyword: str) -> bool:
+    text = normalize(value)
+    return text is not None and normalize(keyword) in text
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def rank(keyword: str, text: str) -> Tuple[int, int]:
+    """
+    Get the sort key of a matched value: exact match, prefix, word prefix, any substring, shorter values first
+    """
+    if text == keyword:
+        category = 0
+    elif text.startswith(keyword):
+        category = 1
+    elif f" {keyword}" in text:
+        category = 2
+    else:
+        category = 3
+    return category, len(text)
+
+
+class TrigramIndex:
+    """
+    Inverted index of one column: trigram -> IDs of the rows which values contain it.
+    Keywords shorter than a trigram are matched by scanning the values in memory
+    """
+
+    def __init__(self):
+        self.values: Dict[int, str] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.max_id = 0
+        self.built_at = monotonic()
+        # rows were inserted in bulk, their IDs are not known
+        self.needs_catch_up = False
+        self._lock = threading.RLock()
+
+    def add(self, obj_id: int, value: Any) -> None:
+        text = normalize(value)
+        with self._lock:
+            self.remove(obj_id)
+            self.max_id = max(self.max_id, obj_id)
+            if text is None:
+                return
+            self.values[obj_id] = text
+            for gram in trigrams(text):
+                self.postings[gram].add(obj_id)
+
+    def remove(self, obj_id: int) -> None:
+        with self._lock:
+            text = self.values.pop(obj_id, None)
+            if text is None:
+                return
+            for gram in trigrams(text):
+                ids = self.postings.get(gram)
+                if ids is not None:
+                    ids.discard(obj_id)
+                    if not ids:
+                        del self.postings[gram]
+
+    def match(self, keyword: str) -> List[Tuple[int, str]]:
+        """
+        Get IDs and values of the rows which values contain the keyword, case-insensitive
+        """
+        keyword = normalize(keyword)
+        grams = trigrams(keyword)
+        with self._lock:
+            if not grams:
+                return [(obj_id, text) for obj_id, text in self.values.items() if keyword in text]
+            postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            # trigrams of the keyword may occur in the value apart from each other
+            return [(obj_id, self.values[obj_id]) for obj_id in candidates if keyword in self.values[obj_id]]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class SearchIndex:
+    """
+    Registry of in-process trigram indexes of searchable columns, built lazily on the first search.
+    Writes done through ORM sessions and bulk CRUD methods are applied on commit,
+    writes of other processes are picked up when the index is rebuilt in the background after `ttl` seconds
+    """
+
+    def __init__(
+        self, enabled: bool, ttl: float, build_batch: int, session_factory: Callable[[], ContextManager[Session]]
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.build_batch = build_batch
+        self.session_factory = session_factory
+        self.columns: Dict[Type[Base], Set[str]] = defaultdict(set)
+        self.searches = Counter()
+        self.builds = Counter()
+        self._indexes: Dict[Tuple[Type[Base], str], TrigramIndex] = {}
+        # changes committed while an index is built, applied to it before it replaces the previous one
+        self._building: Dict[Tuple[Type[Base], str], List[Tuple[str, Optional[int], Optional[Dict]]]] = {}
+        self._build_locks: Dict[Tuple[Type[Base], str], threading.Lock] = {}
+        self._refreshes: Dict[Tuple[Type[Base], str], threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def register(self, model: Type[Base], columns: Iterable[str]) -> None:
+        self.columns[model].update(columns)
+
+    def is_indexed(self, model: Type[Base], column: str) -> bool:
+        return self.enabled and column in self.columns.get(model, ())
+
+    def search(self, session: Session, model: Type[Base], column: str, keyword: str) -> List[Tuple[int, str]]:
+        self.searches.inc()
+        return self.get(session, model, column).match(keyword)
+
+    def get(self, session: Session, model: Type[Base], column: str) -> TrigramIndex:
+        """
+        Get the index of the column. A missing index is built by the first search while concurrent searches wait
+        for it, an expired one is served while it is rebuilt in the background. Rows inserted in bulk are loaded
+        """
+        key = (model, column)
+        with self._lock:
+            index = self._indexes.get(key)
+        if index is None:
+            with self._build_lock(key):
+                with self._lock:
+                    index = self._indexes.get(key)
+                if index is None:
+                    index = self.build(session, model, column)
+        elif monotonic() - index.built_at > self.ttl:
+            self._refresh_in_background(model, column)
+        if index.needs_catch_up:
+            index.needs_catch_up = False
+            self._load(session, model, column, index, min_id=index.max_id)
+        return index
+
+    def build(self, session: Session, model: Type[Base], column: str) -> TrigramIndex:
+        """
+        Build a new index, searches keep using the previous one until it is replaced.
+        Changes committed while the rows are loaded are applied to the new index before it replaces the previous one
+        """
+        key = (model, column)
+        index = TrigramIndex()
+        with self._lock:
+            self._building[key] = []
+        try:
+            self._load(session, model, column, index)
+        except Exception:
+            with self._lock:
+                self._building.pop(key, None)
+            raise
+        with self._lock:
+            for action, obj_id, values in self._building.pop(key):
+                self._apply(index, column, action, obj_id, values)
+            self._indexes[key] = index
+        self.builds.inc()
+        return index
+
+    def _build_lock(self, key: Tuple[Type[Base], str]) -> threading.Lock:
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    def _refresh_in_background(self, model: Type[Base], column: str) -> None:
+        """
+        Rebuild the expired index in a thread with its own session, one rebuild per index at a time
+        """
+        key = (model, column)
+        with self._lock:
+            if key in self._refreshes:
+                return
+            thread = threading.Thread(
+                target=self._refresh, args=(model, column), name=f"search-index-{model.__name__}.{column}", daemon=True
+            )
+            self._refreshes[key] = thread
+        thread.start()
+
+    def _refresh(self, model: Type[Base], column: str) -> None:
+        key = (model, column)
+        try:
+            with self._build_lock(key), self.session_factory() as session:
+                self.build(session, model, column)
+        except SQLAlchemyError as err:
+            # the expired index is served until a later search starts another rebuild
+            logging.exception(err)
+        finally:
+            with self._lock:
+                self._refreshes.pop(key, None)
+
+    def _load(self, session: Session, model: Type[Base], column: str, index: TrigramIndex, min_id: int = 0) -> None:
+        query = (
+            session.query(model.id, getattr(model, column))
+            .filter(model.id > min_id)
+            .execution_options(stream_results=True)
+            .yield_per(self.build_batch)
+        )
+        for obj_id, value in query:
+            index.add(obj_id, value)
+
+    def refresh(self, model: Type[Base], column: str, keyword: str, ids: Iterable[int], objs: Iterable[Base]) -> bool:
+        """
+        Fix the index entries of the found IDs, which rows are deleted or do not match the keyword any more.
+        Get whether any entry was stale
+        """
+        index = self._indexes.get((model, column))
+        if index is None:
+            return False
+        objs_by_id = {obj.id: obj for obj in objs}
+        is_stale = False
+        for obj_id in ids:
+            obj = objs_by_id.get(obj_id)
+            if obj is None:
+                index.remove(obj_id)
+                is_stale = True
+            elif not matches(getattr(obj, column), keyword):
+                index.add(obj_id, getattr(obj, column))
+                is_stale = True
+        return is_stale
+
+    def invalidate(self, model: Optional[Type[Base]] = None) -> None:
+        with self._lock:
+            for key in [key for key in self._indexes if model is None or key[0] is model]:
+                del self._indexes[key]
+
+    # change tracking
+
+    def track_insert(self, session: Session, model: Type[Base]) -> None:
+        """
+        Track rows inserted in bulk, without IDs known
+        """
+        if model in self.columns:
+            session.info.setdefault(CHANGES_KEY, []).append(("catch_up", model, None, None))
+
+    def track_update(self, session: Session, model: Type[Base], mappings: Iterable[Dict[str, Any]]) -> None:
+        columns = self.columns.get(model)
+        if columns:
+            changes = session.info.setdefault(CHANGES_KEY, [])
+            for mapping in mappings:
+                values = {key: value for key, value in mapping.items() if key in columns}
+                if values:
+                    changes.append(("set", model, mapping["id"], values))
+
+    def track_delete(self, session: Session, model: Type[Base], ids: Iterable[int]) -> None:
+        if model in self.columns:
+            session.info.setdefault(CHANGES_KEY, []).extend(("remove", model, obj_id, None) for obj_id in ids)
+
+    def _after_flush(self, session: Session, flush_context: Any) -> None:
+        changes = []
+        for obj in (*session.new, *session.dirty):
+            columns = self.columns.get(type(obj))
+            if columns:
+                changes.append(("set", type(obj), obj.id, {column: getattr(obj, column) for column in columns}))
+        for obj in session.deleted:
+            if type(obj) in self.columns:
+                changes.append(("remove", type(obj), obj.id, None))
+        if changes:
+            session.info.setdefault(CHANGES_KEY, []).extend(changes)
+
+    def _after_commit(self, session: Session) -> None:
+        for action, model, obj_id, values in session.info.pop(CHANGES_KEY, ()):
+            with self._lock:
+                indexes = {column: index for (key, column), index in self._indexes.items() if key is model}
+                for (key, column), changes in self._building.items():
+                    if key is model:
+                        changes.append((action, obj_id, values))
+            for column, index in indexes.items():
+                self._apply(index, column, action, obj_id, values)
+
+    @staticmethod
+    def _apply(index: TrigramIndex, column: str, action: str, obj_id: Optional[int], values: Optional[Dict]) -> None:
+        if action == "catch_up":
+            index.needs_catch_up = True
+        elif action == "remove":
+            index.remove(obj_id)
+        elif column in values:
+            index.add(obj_id, values[column])
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(CHANGES_KEY, None)
+
+    def listen(self) -> None:
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            indexes = list(self._indexes.items())
+            refreshes = set(self._refreshes)
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "searches": self.searches.value,
+            "builds": self.builds.value,
+            "indexes": [
+                {
+                    "model": model.__name__,
+                    "column": column,
+                    "size": len(index),
+                    "trigrams": len(index.postings),
+                    "age": monotonic() - index.built_at,
+                    "refreshing": (model, column) in refreshes,
+                }
+                for (model, column), index in indexes
+            ],
+        }
+
+
+def page_ids(
+    hits: List[Tuple[int, str]],
+    keyword: str,
+    limit: int,
+    skip: int = 0,
+    after: Optional[str] = None,
+    order_by: str = SEARCH_RANK,
+) -> List[int]:
+    """
+    Get IDs of the page of hits sorted by relevance (`rank` cursor) or by ID (keyset cursor)
+    """
+    if order_by == SEARCH_RANK:
+        return page_by_rank(hits, keyword, rank_cursor(after), skip, limit)
+    if not after:
+        return page_by_id(hits, 0, skip, limit)
+    cursor_order_by, _, last_id = decode_cursor(after)
+    if cursor_order_by != order_by:
+        raise HTTPBadRequestException(detail="Invalid cursor")
+    return page_by_id(hits, last_id, 0, limit)
+
+
+def page_by_rank(
+    hits: List[Tuple[int, str]], keyword: str, after: Optional[Tuple[int, int, int]], skip: int, limit: int
+) -> List[int]:
+    """
+    Get IDs of the page of hits sorted by relevance, after the rank key of the last hit of the previous page.
+    Only `limit` best hits past the cursor are sorted, so any page costs the same
+    """
+    keyword = normalize(keyword)
+    keys: Iterable[Tuple[int, int, int]] = ((*rank(keyword, text), obj_id) for obj_id, text in hits)
+    if after is not None:
+        keys = (key for key in keys if key > after)
+        skip = 0
+    return [key[-1] for key in heapq.nsmallest(skip + limit, keys)[skip:]]
+
+
+def page_by_id(hits: List[Tuple[int, str]], last_id: int, offset: int, limit: int) -> List[int]:
+    """
+    Get IDs of the page of hits sorted by ID, after the last ID of the previous page
+    """
+    return heapq.nsmallest(offset + limit, (obj_id for obj_id, _ in hits if obj_id > last_id))[offset:]
+
+
+search_index = SearchIndex(
+    enabled=search_cfg.SEARCH_INDEX_ENABLED,
+    ttl=search_cfg.SEARCH_INDEX_TTL,
+    build_batch=search_cfg.SEARCH_INDEX_BUILD_BATCH,
+    session_factory=SessionLocal,
+)
+search_index.listen()
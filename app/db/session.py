@@ -1,23 +1,43 @@
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Generator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config.db_config import db_cfg
+from app.db.dialect import create_db_engine, database_url, pool_args
+from app.db.pool import async_pool_metrics, pool_metrics
+from app.db.query_stats import query_metrics
 
-# for local connection
+# the database is set with DB_URL, e.g. "sqlite:///app.db", by default it is the SQL Server of the docker settings
 
-# SQLALCHEMY_DATABASE_URL = \
-#     f"mssql+pyodbc://{db_cfg.DB_USER}:{db_cfg.DB_PASSWORD}@{db_cfg.DB_HOST_LOCAL}:{db_cfg.DB_PORT_LOCAL}/{db_cfg.DB_NAME}?driver={db_cfg.DB_DRIVER}"
+engine = create_db_engine(database_url(), pool_metrics)
+query_metrics.instrument(engine)
 
-# for docker connection
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-SQLALCHEMY_DATABASE_URL = \
-    f"mssql+pyodbc://{db_cfg.DB_USER}:{db_cfg.DB_PASSWORD}@{db_cfg.DB_HOST}:{db_cfg.DB_PORT}/{db_cfg.DB_NAME}?driver={db_cfg.DB_DRIVER}"
+session_context: ContextVar[Optional[Session]] = ContextVar("session_context", default=None)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# async engine is optional, it requires a database URL with an async driver, e.g. "sqlite+aiosqlite:///app.db"
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = (
+    create_async_engine(
+        db_cfg.DB_ASYNC_URL, poolclass=async_pool_metrics.pool_class(AsyncAdaptedQueuePool), **pool_args
+    )
+    if db_cfg.DB_ASYNC_URL
+    else None
+)
+if async_engine is not None:
+    async_pool_metrics.instrument(async_engine.sync_engine)
+    query_metrics.instrument(async_engine.sync_engine)
+
+AsyncSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, class_=AsyncSession, bind=async_engine
+)
+
+async_session_context: ContextVar[Optional[AsyncSession]] = ContextVar("async_session_context", default=None)
 
 
 def get_session() -> Generator:
@@ -29,3 +49,77 @@ def get_session() -> Generator:
         raise
     finally:
         session.close()
+
+
+def get_current_session() -> Session:
+    """
+    Get the session of the current unit of work (request or `session_scope` block)
+    """
+    session = session_context.get()
+    if session is None:
+        raise RuntimeError("No database session in the current context, use session_scope()")
+    return session
+
+
+@contextmanager
+def session_scope() -> Generator[Session, None, None]:
+    """
+    Open a unit of work, the session is committed once on exit and rolled back on error
+    """
+    session = SessionLocal()
+    token = session_context.set(session)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session_context.reset(token)
+        session.close()
+
+
+def is_async_configured() -> bool:
+    return AsyncSessionLocal.kw.get("bind") is not None
+
+
+async def connect_async_engine() -> None:
+    """
+    Open the first connection of the async engine up front, concurrent first connects block each other
+    """
+    if is_async_configured():
+        async with AsyncSessionLocal.kw["bind"].connect():
+            pass
+
+
+async def dispose_async_engine() -> None:
+    if is_async_configured():
+        await AsyncSessionLocal.kw["bind"].dispose()
+
+
+def get_current_async_session() -> AsyncSession:
+    """
+    Get the async session of the current unit of work (request or `async_session_scope` block)
+    """
+    session = async_session_context.get()
+    if session is None:
+        raise RuntimeError("No async database session in the current context, use async_session_scope()")
+    return session
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open an async unit of work, the session is committed once on exit and rolled back on error
+    """
+    session = AsyncSessionLocal()
+    token = async_session_context.set(session)
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        async_session_context.reset(token)
+        await session.close()
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from app import crud
+from app.config.jwt_config import jwt_cfg
+from app.config.session_config import session_cfg
+from app.constansts.constants_session import ConstantSessionStatus
+from app.db.models import Session
+from app.db.session import session_scope
+from app.utils.batching import MAX_IN_PARAMETERS
+from app.utils.metrics import Counter, Family, Histogram
+
+
+class SessionPurge:
+    """
+    Periodically delete the sessions past JWT expiry and the ones logged out longer than the retention window.
+    Rows are deleted by primary key in small batches, one transaction each, so a DELETE holds a few row locks
+    at a time and logins and token checks are not blocked while the table is purged
+    """
+
+    def __init__(self, interval: float, batch_size: int, logged_out_retention: float, token_lifetime: float):
+        self.interval = interval
+        self.batch_size = min(batch_size, MAX_IN_PARAMETERS)
+        self.logged_out_retention = timedelta(seconds=logged_out_retention)
+        self.token_lifetime = timedelta(seconds=token_lifetime)
+        self.runs = Counter()
+        self.failures = Counter()
+        self.batches = Counter()
+        self.purged: Family[Counter] = Family(("reason",), Counter)
+        for reason in ("expired", "logged_out"):
+            self.purged.labels(reason)
+        self.duration = Histogram()
+        self.batch_duration = Histogram()
+        self.last_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def criteria(self, now: datetime) -> Dict[str, Any]:
+        """
+        Get the criterion of the purged sessions by reason, tokens expire the token lifetime after the login
+        """
+        return {
+            "expired": Session.creation_date < now - self.token_lifetime,
+            "logged_out": and_(
+                Session.status == ConstantSessionStatus.logged_out,
+                Session.creation_date < now - self.logged_out_retention,
+            ),
+        }
+
+    def purge(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete the purgeable sessions, get the amount of deleted sessions by reason
+        """
+        now = now or datetime.utcnow()
+        started = perf_counter()
+        try:
+            purged = {reason: self._purge(reason, criterion) for reason, criterion in self.criteria(now).items()}
+        except SQLAlchemyError:
+            self.failures.inc()
+            raise
+        finally:
+            self.runs.inc()
+            self.duration.observe(perf_counter() - started)
+        self.last_run = now
+        return purged
+
+    def _purge(self, reason: str, criterion: Any) -> int:
+        total, after_id = 0, 0
+        while after_id is not None:
+            started = perf_counter()
+            with session_scope():
+                count, after_id = crud.session.purge_batch(criterion, after_id, self.batch_size)
+            self.batch_duration.observe(perf_counter() - started)
+            if after_id is not None:
+                self.batches.inc()
+                self.purged.labels(reason).inc(count)
+                total += count
+        return total
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.purge)
+            except SQLAlchemyError as err:
+                logging.exception(err)
+
+    async def start(self) -> None:
+        """
+        Start the periodic purge in the event loop of the application, the first one an interval after startup
+        """
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs.value,
+            "failures": self.failures.value,
+            "batches": self.batches.value,
+            "purged": {labels["reason"]: counter.value for labels, counter in self.purged.items()},
+            "last_run": self.last_run,
+            "duration": self.duration.to_dict(),
+            "batch_duration": self.batch_duration.to_dict(),
+        }
+
+
+session_purge = SessionPurge(
+    interval=session_cfg.SESSION_PURGE_INTERVAL,
+    batch_size=session_cfg.SESSION_PURGE_BATCH,
+    logged_out_retention=session_cfg.SESSION_LOGGED_OUT_RETENTION,
+    token_lifetime=int(jwt_cfg.JWT_TOKEN_EXPIRE_TIME) * 60,
+)
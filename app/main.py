@@ -2,11 +2,33 @@ from fastapi import FastAPI
 
 from app.api.api_enrollment import router
 from app.api.docs.api_schema import get_openapi_schema
+from app.db.reference_data import reference_data
+from app.db.session import connect_async_engine, dispose_async_engine
+from app.db.session_purge import session_purge
+from app.middleware.middleware_compression import CompressionMiddleware
+from app.middleware.middleware_db_session import DBSessionMiddleware
+from app.middleware.middleware_etag import ETagMiddleware
+from app.middleware.middleware_metrics import MetricsMiddleware
+from app.middleware.middleware_query_stats import QueryStatsMiddleware
+from app.security.passwords import password_hasher
 
 app = FastAPI()
 
 app.include_router(router)
 
+app.add_middleware(DBSessionMiddleware)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+app.add_event_handler("startup", connect_async_engine)
+app.add_event_handler("startup", reference_data.load_all)
+app.add_event_handler("startup", session_purge.start)
+app.add_event_handler("shutdown", session_purge.stop)
+app.add_event_handler("shutdown", dispose_async_engine)
+app.add_event_handler("shutdown", password_hasher.shutdown)
+
 app.openapi_schema = get_openapi_schema(app)
 
 if __name__ == "__main__":
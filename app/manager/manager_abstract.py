@@ -33,3 +33,12 @@ class ManagerAbstract(
 
     def delete(self, *args, **kwargs) -> Response:
         raise NotImplementedError()
+
+    def create_many(self, *args, **kwargs) -> int:
+        raise NotImplementedError()
+
+    def update_many(self, *args, **kwargs) -> int:
+        raise NotImplementedError()
+
+    def delete_many(self, *args, **kwargs) -> Response:
+        raise NotImplementedError()
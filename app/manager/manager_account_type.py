@@ -1,13 +1,13 @@
 from app.crud.crud_account_type import CRUDAccountType
 from app.crud.crud_account_type import account_type as crud_account_type
 from app.db.models import AccountType
-from app.manager.manager_base import ManagerBase
+from app.manager.manager_reference import ReferenceManagerBase
 from app.schemas.schema_account_type import (AccountTypeCreate,
                                              AccountTypeUpdate)
 
 
 class AccountTypeManager(
-    ManagerBase[AccountType, CRUDAccountType, AccountTypeCreate, AccountTypeUpdate]
+    ReferenceManagerBase[AccountType, CRUDAccountType, AccountTypeCreate, AccountTypeUpdate]
 ):
     pass
 
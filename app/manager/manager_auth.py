@@ -1,21 +1,42 @@
 from datetime import datetime
+from typing import Optional
 
 from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud
 from app.constansts.constants_session import ConstantSessionStatus
-from app.db.models import Session
+from app.db.models import User
 from app.schemas.schema_session import SessionCreate, SessionUpdate
 from app.schemas.schema_token import Token
+from app.security.passwords import password_hasher
+from app.security.principal import (Principal, invalidate_principal,
+                                    invalidate_user_principals)
 from app.security.tokens import create_jwt
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
 
 
 class AuthManager:
     @classmethod
-    def login(cls, data: OAuth2PasswordRequestForm) -> Token:
-        user = crud.user.authenticate(data.username, data.password)
+    async def login(cls, data: OAuth2PasswordRequestForm) -> Token:
+        user = await run_in_threadpool(crud.user.get_by_attribute, email=data.username)
+        if not user:
+            raise HTTPBadRequestException(detail="Incorrect email or password")
+        is_valid, new_hash = await password_hasher.verify_and_update(data.password, user.password)
+        if not is_valid:
+            raise HTTPBadRequestException(detail="Incorrect email or password")
+        return await run_in_threadpool(cls.start_session, user, new_hash)
+
+    @classmethod
+    def start_session(cls, user: User, new_hash: Optional[str] = None) -> Token:
+        if new_hash:
+            # the hash was made with another bcrypt cost factor
+            crud.user.update(user, {"password": new_hash}, is_flush=True)
         access_token = create_jwt(data={"user_id": user.id}, set_expire=True)
+        # a new session replaces the previous ones, their tokens are no longer accepted
+        invalidate_user_principals(user.id)
+        crud.session.log_out_user(user.id, is_flush=True)
         crud.session.create(
             SessionCreate(
                 token=access_token,
@@ -27,9 +48,10 @@ class AuthManager:
         return Token(access_token=access_token, token_type="bearer")
 
     @classmethod
-    def logout(cls, session: Session) -> Response:
+    def logout(cls, session: Principal) -> Response:
         crud.session.update(
-            session,
+            crud.session.get(session.id),
             SessionUpdate(id=session.id, status=ConstantSessionStatus.logged_out),
         )
+        invalidate_principal(session.token)
         return Response(status_code=status.HTTP_200_OK)
@@ -1,15 +1,17 @@
 from datetime import datetime
+from typing import List
 
 from app.crud.crud_bank import CRUDBank
 from app.crud.crud_bank import bank as bank_crud
-from app.db.models import Bank, Session
+from app.db.models import Bank
 from app.manager.manager_abstract import ModelType
-from app.manager.manager_base import ManagerBase
+from app.manager.manager_reference import ReferenceManagerBase
 from app.schemas.schema_bank import BankCreate, BankUpdate
+from app.security.principal import Principal
 
 
-class BankManager(ManagerBase[Bank, CRUDBank, BankCreate, BankUpdate]):
-    def create(self, obj_in: BankCreate, session: Session) -> ModelType:
+class BankManager(ReferenceManagerBase[Bank, CRUDBank, BankCreate, BankUpdate]):
+    def create(self, obj_in: BankCreate, session: Principal) -> ModelType:
         obj_in_data = obj_in.dict()
         obj_in_data.update(
             {
@@ -17,7 +19,17 @@ class BankManager(ManagerBase[Bank, CRUDBank, BankCreate, BankUpdate]):
                 "is_active": True,
             }
         )
-        return self.crud.create(obj_in_data)
+        obj = self.crud.create(obj_in_data)
+        self.invalidate()
+        return obj
+
+    def create_many(self, objs_in: List[BankCreate], session: Principal) -> int:
+        creation_date = datetime.utcnow()
+        count = self.crud.create_many(
+            [{**obj_in.dict(), "creation_date": creation_date, "is_active": True} for obj_in in objs_in]
+        )
+        self.invalidate()
+        return count
 
 
 bank: BankManager = BankManager(bank_crud)
@@ -1,11 +1,12 @@
-from typing import List
+from typing import Iterable, List, Optional
 
 from fastapi import Response, status
 
-from app.db.models import Session
 from app.manager.manager_abstract import (CreateSchemaType, CRUDType,
                                           ManagerAbstract, ModelType,
                                           UpdateSchemaType)
+from app.security.principal import Principal
+from app.utils.exceptions.common_exceptions import HTTPNotFoundException
 
 
 class ManagerBase(
@@ -14,24 +15,52 @@ class ManagerBase(
     def __init__(self, crud: CRUDType):
         self.crud = crud
 
-    def fetch_one(self, obj_id: int, session: Session) -> ModelType:
-        return self.crud.get(obj_id)
+    def fetch_one(self, obj_id: int, session: Principal, include: Iterable[str] = ()) -> ModelType:
+        return self.crud.get(obj_id, include)
 
-    def fetch_all(self, session: Session) -> List[ModelType]:
-        return self.crud.get_multi()
+    def fetch_all(
+        self,
+        session: Principal,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        include: Iterable[str] = (),
+    ) -> List[ModelType]:
+        return self.crud.get_multi(limit=limit, after=after, order_by=order_by, include=include)
 
     def search(
-        self, parameter: str, keyword: str, max_results: int, session: Session
+        self,
+        parameter: str,
+        keyword: str,
+        max_results: int,
+        session: Principal,
+        after: Optional[str] = None,
+        order_by: str = "id",
     ) -> List[ModelType]:
-        return self.crud.search_by_parameter(parameter, keyword, max_results)
+        return self.crud.search_by_parameter(
+            parameter, keyword, max_results, after=after, order_by=order_by
+        )
 
-    def create(self, obj_in: CreateSchemaType, session: Session) -> ModelType:
+    def create(self, obj_in: CreateSchemaType, session: Principal) -> ModelType:
         return self.crud.create(obj_in)
 
-    def update(self, obj_in: UpdateSchemaType, session: Session) -> ModelType:
+    def update(self, obj_in: UpdateSchemaType, session: Principal) -> ModelType:
         db_obj = self.crud.get(obj_in.id)
         return self.crud.update(db_obj, obj_in)
 
-    def delete(self, obj_id: int, session: Session) -> Response:
+    def create_many(self, objs_in: List[CreateSchemaType], session: Principal) -> int:
+        return self.crud.create_many(objs_in)
+
+    def update_many(self, objs_in: List[UpdateSchemaType], session: Principal) -> int:
+        missing_ids = self.crud.get_missing_ids(obj_in.id for obj_in in objs_in)
+        if missing_ids:
+            raise HTTPNotFoundException(self.crud.model.__name__, missing_ids[0])
+        return self.crud.update_many(objs_in)
+
+    def delete_many(self, obj_ids: List[int], session: Principal) -> Response:
+        self.crud.delete_many(obj_ids)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    def delete(self, obj_id: int, session: Principal) -> Response:
         self.crud.delete(obj_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,55 @@
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi import Response, status
+
+from app.crud.crud_base_async import AsyncCRUDBase
+from app.manager.manager_abstract import (CreateSchemaType, ModelType,
+                                          UpdateSchemaType)
+from app.security.principal import Principal
+
+AsyncCRUDType = TypeVar("AsyncCRUDType", bound=AsyncCRUDBase)
+
+
+class AsyncManagerBase(Generic[ModelType, AsyncCRUDType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Manager with the same methods as `ManagerBase` to be awaited from `async def` routes
+    """
+
+    def __init__(self, crud: AsyncCRUDType):
+        self.crud = crud
+
+    async def fetch_one(self, obj_id: int, session: Principal) -> ModelType:
+        return await self.crud.get(obj_id)
+
+    async def fetch_all(
+        self,
+        session: Principal,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        return await self.crud.get_multi(limit=limit, after=after, order_by=order_by)
+
+    async def search(
+        self,
+        parameter: str,
+        keyword: str,
+        max_results: int,
+        session: Principal,
+        after: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        return await self.crud.search_by_parameter(
+            parameter, keyword, max_results, after=after, order_by=order_by
+        )
+
+    async def create(self, obj_in: CreateSchemaType, session: Principal) -> ModelType:
+        return await self.crud.create(obj_in)
+
+    async def update(self, obj_in: UpdateSchemaType, session: Principal) -> ModelType:
+        db_obj = await self.crud.get(obj_in.id)
+        return await self.crud.update(db_obj, obj_in)
+
+    async def delete(self, obj_id: int, session: Principal) -> Response:
+        await self.crud.delete(obj_id)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
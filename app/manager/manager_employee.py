@@ -1,38 +1,49 @@
+from collections import Counter
 from datetime import datetime
+from typing import List
 
 from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
 
 from app import crud
 from app.constansts.constants_role import ConstantRole
 from app.constansts.constants_status_type import ConstantStatusType
 from app.crud.crud_employee import CRUDEmployee
 from app.crud.crud_employee import employee as employee_crud
-from app.db.models import Employee, Session
+from app.db.models import Employee, Role, StatusType
+from app.db.reference_data import reference_data
 from app.manager.manager_abstract import ModelType
 from app.manager.manager_base import ManagerBase
 from app.schemas.schema_employee import EmployeeCreate, EmployeeUpdate
-from app.security.passwords import hash_password
-from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+from app.security.passwords import password_hasher
+from app.security.principal import Principal
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
 
 
 class EmployeeManager(
     ManagerBase[Employee, CRUDEmployee, EmployeeCreate, EmployeeUpdate]
 ):
-    def create(self, obj_in: EmployeeCreate, session: Session) -> ModelType:
-        if crud.user.get_by_attribute(email=obj_in.user.email):
+    async def create(self, obj_in: EmployeeCreate, session: Principal) -> ModelType:
+        await run_in_threadpool(self.check_email, obj_in.user.email)
+        password_hash = await password_hasher.hash(obj_in.user.password)
+        return await run_in_threadpool(self.create_with_password, obj_in, password_hash)
+
+    @staticmethod
+    def check_email(email: str) -> None:
+        if crud.user.get_by_attribute(email=email):
             raise HTTPBadRequestException(
                 detail="Account with this email already exists"
             )
-        role_employee = crud.role.get_by_attribute(name=ConstantRole.employee)
-        status_inactive = crud.status_type.get_by_attribute(
-            name=ConstantStatusType.inactive
-        )
+
+    def create_with_password(self, obj_in: EmployeeCreate, password_hash: str) -> ModelType:
+        role_employee = reference_data.get_by_name(Role, ConstantRole.employee)
+        status_inactive = reference_data.get_by_name(StatusType, ConstantStatusType.inactive)
         obj_in_data = obj_in.dict()
         user_data = obj_in_data.pop("user")
         user_data.update(
             {
                 "creation_date": datetime.utcnow(),
-                "password": hash_password(obj_in.user.password),
+                "password": password_hash,
                 "role_id": role_employee.id,
                 "status_type_id": status_inactive.id,
             }
@@ -41,7 +52,7 @@ class EmployeeManager(
         obj_in_data["user_id"] = user.id
         return self.crud.create(obj_in_data)
 
-    def update(self, obj_in: EmployeeUpdate, session: Session) -> ModelType:
+    def update(self, obj_in: EmployeeUpdate, session: Principal) -> ModelType:
         obj = self.crud.get(obj_in.id)
         user = crud.user.get_by_attribute(email=obj_in.user.email)
         if user:
@@ -53,10 +64,77 @@ class EmployeeManager(
         crud.user.update(user, obj_in.user, is_flush=True)
         return self.crud.update(obj, obj_in)
 
-    def delete(self, obj_id: int, session: Session) -> Response:
+    def delete(self, obj_id: int, session: Principal) -> Response:
         obj = self.crud.get(obj_id)
         crud.user.delete(obj.user_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+    async def create_many(self, objs_in: List[EmployeeCreate], session: Principal) -> int:
+        emails = [obj_in.user.email for obj_in in objs_in]
+        duplicates = [email for email, count in Counter(emails).items() if count > 1]
+        if duplicates:
+            raise HTTPBadRequestException(detail=f"Email {duplicates[0]} is used more than once")
+        await run_in_threadpool(self.check_emails, emails)
+        password_hashes = await password_hasher.hash_many([obj_in.user.password for obj_in in objs_in])
+        return await run_in_threadpool(self.create_many_with_passwords, objs_in, password_hashes)
+
+    @staticmethod
+    def check_emails(emails: List[str]) -> None:
+        existing_users = crud.user.get_multi_by_attribute("email", emails)
+        if existing_users:
+            raise HTTPBadRequestException(
+                detail=f"Account with email {existing_users[0].email} already exists"
+            )
+
+    def create_many_with_passwords(self, objs_in: List[EmployeeCreate], password_hashes: List[str]) -> int:
+        emails = [obj_in.user.email for obj_in in objs_in]
+        role_employee = reference_data.get_by_name(Role, ConstantRole.employee)
+        status_inactive = reference_data.get_by_name(StatusType, ConstantStatusType.inactive)
+        creation_date = datetime.utcnow()
+        crud.user.create_many(
+            [
+                {
+                    **obj_in.user.dict(),
+                    "creation_date": creation_date,
+                    "password": password_hash,
+                    "role_id": role_employee.id,
+                    "status_type_id": status_inactive.id,
+                }
+                for obj_in, password_hash in zip(objs_in, password_hashes)
+            ],
+            is_flush=True,
+        )
+        user_ids = {user.email: user.id for user in crud.user.get_multi_by_attribute("email", emails)}
+        return self.crud.create_many(
+            [{**obj_in.dict(exclude={"user"}), "user_id": user_ids[obj_in.user.email]} for obj_in in objs_in]
+        )
+
+    def update_many(self, objs_in: List[EmployeeUpdate], session: Principal) -> int:
+        objs = {obj.id: obj for obj in self.crud.get_multi_by_attribute("id", [obj_in.id for obj_in in objs_in])}
+        for obj_in in objs_in:
+            if obj_in.id not in objs:
+                raise HTTPNotFoundException(self.crud.model.__name__, obj_in.id)
+        user_ids = {obj_in.user.email: objs[obj_in.id].user_id for obj_in in objs_in}
+        if len(user_ids) != len(objs_in):
+            raise HTTPBadRequestException(detail="Email is used more than once")
+        for user in crud.user.get_multi_by_attribute("email", user_ids):
+            if user_ids[user.email] != user.id:
+                raise HTTPBadRequestException(
+                    detail=f"Account with email {user.email} already exists"
+                )
+        crud.user.update_many(
+            [{**obj_in.user.dict(exclude_unset=True), "id": objs[obj_in.id].user_id} for obj_in in objs_in],
+            is_flush=True,
+        )
+        return self.crud.update_many(objs_in)
+
+    def delete_many(self, obj_ids: List[int], session: Principal) -> Response:
+        objs = self.crud.get_multi_by_attribute("id", obj_ids)
+        missing_ids = sorted(set(obj_ids) - {obj.id for obj in objs})
+        if missing_ids:
+            raise HTTPNotFoundException(self.crud.model.__name__, missing_ids[0])
+        crud.user.delete_many([obj.user_id for obj in objs])
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 
 employee: EmployeeManager = EmployeeManager(employee_crud)
@@ -1,13 +1,15 @@
 from datetime import datetime
+from typing import List
 
 from app.crud.crud_employee_account import CRUDEmployeeAccount
 from app.crud.crud_employee_account import \
     employee_account as crud_employee_account
-from app.db.models import EmployeeAccount, Session
+from app.db.models import EmployeeAccount
 from app.manager.manager_abstract import ModelType
 from app.manager.manager_base import ManagerBase
 from app.schemas.schema_employee_account import (EmployeeAccountCreate,
                                                  EmployeeAccountUpdate)
+from app.security.principal import Principal
 
 
 class EmployeeAccountManager(
@@ -18,7 +20,7 @@ class EmployeeAccountManager(
         EmployeeAccountUpdate,
     ]
 ):
-    def create(self, obj_in: EmployeeAccountCreate, session: Session) -> ModelType:
+    def create(self, obj_in: EmployeeAccountCreate, session: Principal) -> ModelType:
         obj_in_data = obj_in.dict()
         obj_in_data.update(
             {
@@ -28,5 +30,11 @@ class EmployeeAccountManager(
         )
         return self.crud.create(obj_in_data)
 
+    def create_many(self, objs_in: List[EmployeeAccountCreate], session: Principal) -> int:
+        creation_date = datetime.utcnow()
+        return self.crud.create_many(
+            [{**obj_in.dict(), "creation_date": creation_date, "is_active": True} for obj_in in objs_in]
+        )
+
 
 employee_account: EmployeeAccountManager = EmployeeAccountManager(crud_employee_account)
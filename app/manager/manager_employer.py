@@ -1,38 +1,47 @@
 from datetime import datetime
 
 from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
 
 from app import crud
 from app.constansts.constants_role import ConstantRole
 from app.constansts.constants_status_type import ConstantStatusType
 from app.crud.crud_employer import CRUDEmployer
 from app.crud.crud_employer import employer as employer_crud
-from app.db.models import Employer, Session
+from app.db.models import Employer, Role, StatusType
+from app.db.reference_data import reference_data
 from app.manager.manager_abstract import ModelType
 from app.manager.manager_base import ManagerBase
 from app.schemas.schema_employer import EmployerCreate, EmployerUpdate
-from app.security.passwords import hash_password
+from app.security.passwords import password_hasher
+from app.security.principal import Principal
 from app.utils.exceptions.common_exceptions import HTTPBadRequestException
 
 
 class EmployerManager(
     ManagerBase[Employer, CRUDEmployer, EmployerCreate, EmployerUpdate]
 ):
-    def create(self, obj_in: EmployerCreate, session: Session) -> ModelType:
-        if crud.user.get_by_attribute(email=obj_in.user.email):
+    async def create(self, obj_in: EmployerCreate, session: Principal) -> ModelType:
+        await run_in_threadpool(self.check_email, obj_in.user.email)
+        password_hash = await password_hasher.hash(obj_in.user.password)
+        return await run_in_threadpool(self.create_with_password, obj_in, password_hash)
+
+    @staticmethod
+    def check_email(email: str) -> None:
+        if crud.user.get_by_attribute(email=email):
             raise HTTPBadRequestException(
                 detail="Account with this email already exists"
             )
-        role_employer = crud.role.get_by_attribute(name=ConstantRole.employer)
-        status_inactive = crud.status_type.get_by_attribute(
-            name=ConstantStatusType.inactive
-        )
+
+    def create_with_password(self, obj_in: EmployerCreate, password_hash: str) -> ModelType:
+        role_employer = reference_data.get_by_name(Role, ConstantRole.employer)
+        status_inactive = reference_data.get_by_name(StatusType, ConstantStatusType.inactive)
         obj_in_data = obj_in.dict()
         user_data = obj_in_data.pop("user")
         user_data.update(
             {
                 "creation_date": datetime.utcnow(),
-                "password": hash_password(obj_in.user.password),
+                "password": password_hash,
                 "role_id": role_employer.id,
                 "status_type_id": status_inactive.id,
             }
@@ -41,7 +50,7 @@ class EmployerManager(
         obj_in_data["user_id"] = user.id
         return self.crud.create(obj_in_data)
 
-    def update(self, obj_in: EmployerUpdate, session: Session) -> ModelType:
+    def update(self, obj_in: EmployerUpdate, session: Principal) -> ModelType:
         obj = self.crud.get(obj_in.id)
         user = crud.user.get_by_attribute(email=obj_in.user.email)
         if user:
@@ -53,7 +62,7 @@ class EmployerManager(
         crud.user.update(user, obj_in.user, is_flush=True)
         return self.crud.update(obj, obj_in)
 
-    def delete(self, obj_id: int, session: Session) -> Response:
+    def delete(self, obj_id: int, session: Principal) -> Response:
         obj = self.crud.get(obj_id)
         crud.user.delete(obj.user_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,11 +3,12 @@ from datetime import datetime
 from app.crud.crud_employer_payment_method import CRUDEmployerPaymentMethod
 from app.crud.crud_employer_payment_method import \
     employer_payment_method as crud_employer_payment_method
-from app.db.models import EmployerPaymentMethod, Session
+from app.db.models import EmployerPaymentMethod
 from app.manager.manager_abstract import ModelType
 from app.manager.manager_base import ManagerBase
 from app.schemas.schema_employer_payment_method import (
     EmployerPaymentMethodCreate, EmployerPaymentMethodUpdate)
+from app.security.principal import Principal
 
 
 class EmployerPaymentMethodManager(
@@ -18,7 +19,7 @@ class EmployerPaymentMethodManager(
         EmployerPaymentMethodUpdate,
     ]
 ):
-    def create(self, obj_in: EmployerPaymentMethodCreate, session: Session) -> ModelType:
+    def create(self, obj_in: EmployerPaymentMethodCreate, session: Principal) -> ModelType:
         obj_in_data = obj_in.dict()
         obj_in_data.update(
             {
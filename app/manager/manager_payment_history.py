@@ -1,9 +1,20 @@
-from typing import List
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, Dict, List, Optional
 
+from fastapi.responses import StreamingResponse
+
+from app import crud
+from app.constansts.constants_export_format import ConstantExportFormat
+from app.constansts.constants_payment_status_type import ConstantPaymentStatusType
 from app.crud.crud_payment_history import CRUDPaymentHistory, payment_history as crud_payment_history
-from app.db.models import PaymentHistory, Session
+from app.db.models import PaymentHistory, PaymentStatusType
+from app.db.reference_data import reference_data
 from app.manager.manager_abstract import CRUDType, ManagerAbstract, ModelType
-from app.schemas.schema_payment_history import PaymentHistoryCreate, PaymentHistoryUpdate
+from app.schemas.schema_payment_history import PaymentHistoryCreate, PaymentHistoryUpdate, PayrollRunCreate
+from app.security.principal import Principal
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+from app.utils.export import streaming_export
 
 
 class PaymentHistoryManager(
@@ -17,16 +28,75 @@ class PaymentHistoryManager(
     def __init__(self, crud: CRUDType):
         self.crud = crud
 
-    def fetch_one(self, obj_id: int, session: Session) -> ModelType:
+    def fetch_one(self, obj_id: int, session: Principal) -> ModelType:
         return self.crud.get(obj_id)
 
-    def fetch_all(self, session: Session) -> List[ModelType]:
-        return self.crud.get_multi()
+    def fetch_all(
+        self,
+        session: Principal,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        return self.crud.get_multi(limit=limit, after=after, order_by=order_by)
 
     def search(
-        self, parameter: str, keyword: str, max_results: int, session: Session
+        self,
+        parameter: str,
+        keyword: str,
+        max_results: int,
+        session: Principal,
+        after: Optional[str] = None,
+        order_by: str = "id",
     ) -> List[ModelType]:
-        return self.crud.search_by_parameter(parameter, keyword, max_results)
+        return self.crud.search_by_parameter(
+            parameter, keyword, max_results, after=after, order_by=order_by
+        )
+
+    def run_payroll(self, obj_in: PayrollRunCreate, session: Principal) -> Dict[str, Any]:
+        """
+        Create `in_process` payments of the employer, or of all employers due on the run date,
+        for every employee with a default active account, once per run date and payment type
+        """
+        started = perf_counter()
+        if obj_in.employer_id is not None:
+            crud.employer.get(obj_in.employer_id)
+        status_in_process = reference_data.get_by_name(PaymentStatusType, ConstantPaymentStatusType.in_process)
+        if status_in_process is None:
+            raise HTTPBadRequestException(detail="Payment status in_process does not exist")
+        creation_date = datetime.utcnow()
+        summary = self.crud.get_payroll_summary(obj_in.employer_id, obj_in.run_date, obj_in.payment_type)
+        if not obj_in.dry_run and summary["payments"]:
+            summary["payments"] = self.crud.create_payroll(
+                obj_in.employer_id,
+                obj_in.run_date,
+                obj_in.payment_type,
+                obj_in.amount,
+                status_in_process.id,
+                creation_date,
+            )
+        return {
+            **summary,
+            "run_date": obj_in.run_date,
+            "dry_run": obj_in.dry_run,
+            "payment_type": obj_in.payment_type,
+            "amount_total": summary["payments"] * obj_in.amount,
+            "duration": perf_counter() - started,
+        }
+
+    def export(
+        self,
+        export_format: ConstantExportFormat,
+        session: Principal,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employer_id: Optional[int] = None,
+        payment_status_type_id: Optional[int] = None,
+    ) -> StreamingResponse:
+        if date_from is not None and date_to is not None and date_from > date_to:
+            raise HTTPBadRequestException(detail="Date from must not be after date to")
+        partitions = self.crud.get_export_partitions(date_from, date_to, employer_id, payment_status_type_id)
+        return streaming_export("payment_history", export_format, self.crud.export_columns, partitions)
 
 
 payment_history: PaymentHistoryManager = PaymentHistoryManager(crud_payment_history)
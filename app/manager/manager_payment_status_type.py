@@ -2,13 +2,13 @@ from app.crud.crud_payment_status_type import CRUDPaymentStatusType
 from app.crud.crud_payment_status_type import \
     payment_status_type as crud_payment_status_type
 from app.db.models import PaymentStatusType
-from app.manager.manager_base import ManagerBase
+from app.manager.manager_reference import ReferenceManagerBase
 from app.schemas.schema_payment_status_type import (PaymentStatusTypeCreate,
                                                     PaymentStatusTypeUpdate)
 
 
 class PaymentStatusTypeManager(
-    ManagerBase[
+    ReferenceManagerBase[
         PaymentStatusType,
         CRUDPaymentStatusType,
         PaymentStatusTypeCreate,
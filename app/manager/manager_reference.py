@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+from fastapi import Response
+
+from app.db.reference_data import reference_data
+from app.manager.manager_abstract import (CreateSchemaType, CRUDType,
+                                          ModelType, UpdateSchemaType)
+from app.manager.manager_base import ManagerBase
+from app.security.principal import Principal
+from app.utils.exceptions.common_exceptions import HTTPNotFoundException
+from app.utils.pagination import keyset_page
+
+
+class ReferenceManagerBase(
+    ManagerBase[ModelType, CRUDType, CreateSchemaType, UpdateSchemaType]
+):
+    """
+    Manager of a reference table: objects are fetched from the in-process reference data cache,
+    writes invalidate it
+    """
+
+    def fetch_one(self, obj_id: int, session: Principal) -> ModelType:
+        obj = reference_data.get(self.crud.model, obj_id)
+        if obj is None:
+            raise HTTPNotFoundException(self.crud.model.__name__, obj_id)
+        return obj
+
+    def fetch_all(
+        self,
+        session: Principal,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> List[ModelType]:
+        objs = keyset_page(
+            self.crud.model, reference_data.get_all(self.crud.model), after, order_by, limit
+        )
+        if not objs:
+            raise HTTPNotFoundException(self.crud.model.__name__)
+        return objs
+
+    def create(self, obj_in: CreateSchemaType, session: Principal) -> ModelType:
+        obj = super().create(obj_in, session)
+        self.invalidate()
+        return obj
+
+    def update(self, obj_in: UpdateSchemaType, session: Principal) -> ModelType:
+        obj = super().update(obj_in, session)
+        self.invalidate()
+        return obj
+
+    def delete(self, obj_id: int, session: Principal) -> Response:
+        response = super().delete(obj_id, session)
+        self.invalidate()
+        return response
+
+    def create_many(self, objs_in: List[CreateSchemaType], session: Principal) -> int:
+        count = super().create_many(objs_in, session)
+        self.invalidate()
+        return count
+
+    def update_many(self, objs_in: List[UpdateSchemaType], session: Principal) -> int:
+        count = super().update_many(objs_in, session)
+        self.invalidate()
+        return count
+
+    def delete_many(self, obj_ids: List[int], session: Principal) -> Response:
+        response = super().delete_many(obj_ids, session)
+        self.invalidate()
+        return response
+
+    def invalidate(self) -> None:
+        reference_data.invalidate(self.crud.model)
@@ -1,11 +1,11 @@
 from app.crud.crud_role import CRUDRole
 from app.crud.crud_role import role as role_crud
 from app.db.models import Role
-from app.manager.manager_base import ManagerBase
+from app.manager.manager_reference import ReferenceManagerBase
 from app.schemas.schema_role import RoleCreate, RoleUpdate
 
 
-class RoleManager(ManagerBase[Role, CRUDRole, RoleCreate, RoleUpdate]):
+class RoleManager(ReferenceManagerBase[Role, CRUDRole, RoleCreate, RoleUpdate]):
     pass
 
 
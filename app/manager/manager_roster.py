@@ -0,0 +1,187 @@
+import codecs
+import csv
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from starlette.exceptions import HTTPException
+
+from app import crud
+from app.constansts.constants_role import ConstantRole
+from app.constansts.constants_status_type import ConstantStatusType
+from app.crud.crud_employee_account import employee_account as crud_employee_account
+from app.db.models import AccountType, Role, StatusType
+from app.db.reference_data import reference_data
+from app.schemas.schema_employee_account import EmployeeAccountBase
+from app.schemas.schema_roster import (ROSTER_ACCOUNT_COLUMNS, ROSTER_REQUIRED_COLUMNS, RosterEmployee, RosterResponse,
+                                      RosterRowResult)
+from app.security.passwords import password_hasher
+from app.security.principal import Principal
+from app.utils.batching import MAX_IN_PARAMETERS
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
+
+# valid roster row: its result, the employee and the optional account
+RosterRow = Tuple[RosterRowResult, RosterEmployee, Optional[EmployeeAccountBase]]
+
+
+class RosterManager:
+    """
+    Create the employees of the employer, and their accounts, from an uploaded CSV roster.
+    The file is read and validated in batches, passwords of a batch are hashed in the process pool
+    and the batch is inserted with one executemany per table. Invalid rows are reported and skipped
+    """
+
+    def __init__(self, batch_size: int = MAX_IN_PARAMETERS):
+        self.batch_size = batch_size
+
+    async def upload(self, employer_id: int, file: UploadFile, session: Principal) -> RosterResponse:
+        started = perf_counter()
+        await run_in_threadpool(self.check_employer, employer_id)
+        reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"), strict=True)
+        await run_in_threadpool(self.check_header, reader)
+        results: List[RosterRowResult] = []
+        seen_emails: Set[str] = set()
+        while True:
+            lines = await run_in_threadpool(self.read_batch, reader)
+            if not lines:
+                break
+            rows = await run_in_threadpool(self.validate_batch, lines, employer_id, seen_emails, results)
+            password_hashes = await password_hasher.hash_many([employee.user.password for _, employee, _ in rows])
+            await run_in_threadpool(self.insert_batch, rows, password_hashes)
+            results.extend(result for result, _, _ in rows)
+        if not results:
+            raise HTTPBadRequestException(detail="Roster file has no rows")
+        results.sort(key=lambda result: result.row)
+        created = sum(result.is_created for result in results)
+        return RosterResponse(
+            created=created,
+            rejected=len(results) - created,
+            duration=perf_counter() - started,
+            rows=results,
+        )
+
+    @staticmethod
+    def check_employer(employer_id: int) -> None:
+        if crud.employer.get_missing_ids([employer_id]):
+            raise HTTPNotFoundException("Employer", employer_id)
+
+    @staticmethod
+    @contextmanager
+    def reading(reader: csv.DictReader) -> Iterator[None]:
+        """
+        Reject the whole file on the first line which is not UTF-8 or not valid CSV
+        """
+        try:
+            yield
+        # the lines of the row which failed are not counted by the reader
+        except UnicodeDecodeError:
+            raise HTTPBadRequestException(detail=f"Roster file is not UTF-8 encoded in line {reader.line_num + 1}")
+        except csv.Error as err:
+            raise HTTPBadRequestException(detail=f"Invalid CSV in line {reader.line_num + 1} of roster file: {err}")
+
+    def check_header(self, reader: csv.DictReader) -> None:
+        with self.reading(reader):
+            header = reader.fieldnames or []
+        missing = [column for column in ROSTER_REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise HTTPBadRequestException(detail=f"Roster file header misses columns: {', '.join(missing)}")
+
+    def read_batch(self, reader: csv.DictReader) -> List[Tuple[int, Dict[str, str]]]:
+        """
+        Read the next rows with their line numbers, the header is line 1
+        """
+        with self.reading(reader):
+            return [(reader.line_num, row) for row in islice(reader, self.batch_size)]
+
+    @staticmethod
+    def parse_row(row: Dict[str, str], employer_id: int) -> Tuple[RosterEmployee, Optional[EmployeeAccountBase]]:
+        # empty cells are missing values, values without a header are ignored
+        values = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+        account = {name: values.pop(key) for key, name in ROSTER_ACCOUNT_COLUMNS.items() if key in values}
+        user = {key: values.pop(key) for key in ("email", "phone", "password") if key in values}
+        employee = RosterEmployee(**values, user=user, employer_id=employer_id)
+        return employee, EmployeeAccountBase(**account) if account else None
+
+    def validate_batch(
+        self,
+        lines: List[Tuple[int, Dict[str, str]]],
+        employer_id: int,
+        seen_emails: Set[str],
+        results: List[RosterRowResult],
+    ) -> List[RosterRow]:
+        """
+        Validate the rows with the schemas, emails must be new and unique in the file.
+        Rejected rows are added to the results, valid rows are returned
+        """
+        rows: List[RosterRow] = []
+        for line, row in lines:
+            result = RosterRowResult(row=line, email=row.get("email"), is_created=False, errors=[])
+            try:
+                employee, account = self.parse_row(row, employer_id)
+            except ValidationError as err:
+                result.errors = [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in err.errors()]
+            except HTTPException as err:
+                result.errors = [err.detail]
+            else:
+                if employee.user.email in seen_emails:
+                    result.errors = [f"Email {employee.user.email} is used more than once"]
+                elif account is not None and reference_data.get(AccountType, account.account_type_id) is None:
+                    result.errors = [f"AccountType with id {account.account_type_id} not found"]
+                else:
+                    seen_emails.add(employee.user.email)
+                    rows.append((result, employee, account))
+            if result.errors:
+                results.append(result)
+        existing_emails = crud.user.get_ids_by_attribute("email", [employee.user.email for _, employee, _ in rows])
+        valid_rows = []
+        for result, employee, account in rows:
+            if employee.user.email in existing_emails:
+                result.errors = [f"Account with email {employee.user.email} already exists"]
+                results.append(result)
+            else:
+                valid_rows.append((result, employee, account))
+        return valid_rows
+
+    @staticmethod
+    def insert_batch(rows: List[RosterRow], password_hashes: List[str]) -> None:
+        if not rows:
+            return
+        role_employee = reference_data.get_by_name(Role, ConstantRole.employee)
+        status_inactive = reference_data.get_by_name(StatusType, ConstantStatusType.inactive)
+        creation_date = datetime.utcnow()
+        crud.user.create_many(
+            [
+                {
+                    **employee.user.dict(exclude={"password"}),
+                    "creation_date": creation_date,
+                    "password": password_hash,
+                    "role_id": role_employee.id,
+                    "status_type_id": status_inactive.id,
+                }
+                for (_, employee, _), password_hash in zip(rows, password_hashes)
+            ],
+            is_flush=True,
+        )
+        user_ids = crud.user.get_ids_by_attribute("email", [employee.user.email for _, employee, _ in rows])
+        crud.employee.create_many(
+            [{**employee.dict(exclude={"user"}), "user_id": user_ids[employee.user.email]} for _, employee, _ in rows],
+            is_flush=True,
+        )
+        employee_ids = crud.employee.get_ids_by_attribute("user_id", user_ids.values())
+        accounts = [
+            {**account.dict(), "creation_date": creation_date, "employee_id": employee_ids[user_ids[employee.user.email]]}
+            for _, employee, account in rows
+            if account is not None
+        ]
+        if accounts:
+            crud_employee_account.create_many(accounts, is_flush=True)
+        for result, _, _ in rows:
+            result.is_created = True
+
+
+roster: RosterManager = RosterManager()
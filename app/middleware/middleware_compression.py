@@ -0,0 +1,189 @@
+import zlib
+from time import thread_time
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.compression_config import compression_cfg
+from app.utils.http_metrics import CompressionMetrics, compression_metrics
+
+try:
+    import brotli
+except ImportError:  # responses are compressed with gzip only
+    brotli = None
+
+# set to False in the scope by the routes opted out of compression, see skip_compression
+SCOPE_KEY = "compression"
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/xml", "application/javascript")
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def chunk(self, data: bytes) -> bytes:
+        # flushed so the chunk reaches the client now, not when the buffer of the compressor fills up
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Get the quality of each coding of the `Accept-Encoding` header
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+def negotiate(accept_encoding: str, encodings: Tuple[str, ...]) -> Optional[str]:
+    """
+    Get the available encoding of the highest quality, the first one of `encodings` on a tie
+    """
+    accepted = accepted_encodings(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the encoding negotiated by `Accept-Encoding`: brotli if installed, then gzip.
+    Responses under `minimum_size` are sent as is, streamed responses are compressed chunk by chunk.
+    Routes opt out with the skip_compression dependency. Bytes saved and CPU time spent are recorded by encoding
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = compression_cfg.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = compression_cfg.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = compression_cfg.COMPRESSION_BROTLI_QUALITY,
+        metrics: CompressionMetrics = compression_metrics,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.metrics = metrics
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def encoder(self, encoding: str):
+        if encoding == "br":
+            return BrotliEncoder(self.brotli_quality)
+        return GzipEncoder(self.gzip_level)
+
+    def skip_reason(self, scope: Scope, message: Message) -> Optional[str]:
+        headers = Headers(raw=message["headers"])
+        if scope.get(SCOPE_KEY) is False:
+            return "route"
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return "status"
+        if "content-encoding" in headers:
+            return "encoded"
+        if not is_compressible(headers.get("content-type", "")):
+            return "content_type"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        encoder = None
+        identity_size = encoded_size = 0
+        cpu_time = 0.0
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, identity_size, encoded_size, cpu_time, passthrough
+            if message["type"] == "http.response.start":
+                reason = self.skip_reason(scope, message)
+                if reason is not None:
+                    self.metrics.skipped.labels(reason).inc()
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    self.metrics.skipped.labels("size").inc()
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = self.encoder(encoding)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                started = thread_time()
+                data = encoder.chunk(body) if more_body else encoder.finish(body)
+                cpu_time += thread_time() - started
+                if not more_body:
+                    headers["Content-Length"] = str(len(data))
+                await send(start_message)
+            else:
+                started = thread_time()
+                data = encoder.chunk(body) if more_body else encoder.finish(body)
+                cpu_time += thread_time() - started
+
+            identity_size += len(body)
+            encoded_size += len(data)
+            if not more_body:
+                self.metrics.observe(encoding, identity_size, encoded_size, cpu_time)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,53 @@
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import (AsyncSessionLocal, SessionLocal,
+                            async_session_context, is_async_configured,
+                            session_context)
+
+
+class DBSessionMiddleware:
+    """
+    Open a database session per request (unit of work) and share it with CRUD objects through context.
+    The session is committed once, right before the response is sent, and rolled back on error responses.
+    If the async engine is configured, an async session is opened alongside for async CRUD objects
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session = SessionLocal()
+        token = session_context.set(session)
+        async_session = AsyncSessionLocal() if is_async_configured() else None
+        async_token = async_session_context.set(async_session)
+
+        async def send_after_commit(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if message["status"] < 400:
+                    await run_in_threadpool(session.commit)
+                    if async_session is not None:
+                        await async_session.commit()
+                else:
+                    await run_in_threadpool(session.rollback)
+                    if async_session is not None:
+                        await async_session.rollback()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_after_commit)
+        except Exception:
+            await run_in_threadpool(session.rollback)
+            if async_session is not None:
+                await async_session.rollback()
+            raise
+        finally:
+            async_session_context.reset(async_token)
+            session_context.reset(token)
+            await run_in_threadpool(session.close)
+            if async_session is not None:
+                await async_session.close()
@@ -0,0 +1,60 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.etag import content_etag, etag_matches
+
+# headers of the 200 response kept on 304, RFC 9110 section 15.4.5
+NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "date", "etag", "expires", "vary")
+
+
+class ETagMiddleware:
+    """
+    Give successful GET responses of the routers with a cache policy (a `Cache-Control` header, see HTTPCache)
+    a weak ETag of their content, unless the route set one, and answer a matching `If-None-Match` with 304.
+    Streamed responses are passed through, their content is not known before it is sent
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message = {}
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                cache_control = headers.get("cache-control")
+                if message["status"] != 200 or not cache_control or "no-store" in cache_control:
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if not start_message:
+                await send(message)
+                return
+
+            start, start_message = start_message, {}
+            if message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            etag = headers.get("etag")
+            if etag is None:
+                etag = content_etag(message.get("body", b""))
+                headers["ETag"] = etag
+            if etag_matches(if_none_match, etag):
+                raw = [(key, value) for key, value in headers.raw if key.decode("latin-1") in NOT_MODIFIED_HEADERS]
+                await send({"type": "http.response.start", "status": 304, "headers": raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
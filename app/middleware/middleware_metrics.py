@@ -0,0 +1,42 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.http_metrics import HTTPMetrics, http_metrics
+from app.utils.metrics import route_path
+
+
+class MetricsMiddleware:
+    """
+    Record requests in flight, and count, latency and response size of each request by route.
+    Latency lasts until the last body chunk is sent, streamed responses included.
+    Requests which fail without a response are recorded with status 500
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self.metrics.in_flight.dec()
+            self.metrics.observe(scope["method"], route_path(scope), status, perf_counter() - started, size)
@@ -0,0 +1,49 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.query_stats_config import query_stats_cfg
+from app.db.query_stats import QueryMetrics, QueryStats, query_metrics, query_stats_context
+from app.utils.metrics import route_label
+
+
+class QueryStatsMiddleware:
+    """
+    Count the statements of each request and the time spent in the database, and record them in query metrics.
+    In debug mode the counts are reported in response headers, as of the response start: statements of
+    a streamed body and the commit are not included in the headers but are in the metrics
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        headers: bool = query_stats_cfg.QUERY_STATS_HEADERS,
+        metrics: QueryMetrics = query_metrics,
+    ):
+        self.app = app
+        self.headers = headers
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats_context.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.2f}"
+                most_repeated = self.metrics.most_repeated(stats)
+                if most_repeated is not None:
+                    statement, count = most_repeated
+                    headers["X-DB-Repeated-Query"] = f"{count} x {' '.join(statement.split())[:200]}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats_context.reset(token)
+            self.metrics.observe(route_label(scope), stats)
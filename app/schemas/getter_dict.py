@@ -0,0 +1,21 @@
+from typing import Any
+
+from pydantic.utils import GetterDict
+from sqlalchemy import inspect
+
+
+class LoadedGetterDict(GetterDict):
+    """
+    Read only the loaded attributes of an ORM object, unloaded relationships are left unset instead of lazy loaded.
+    Used by the response schemas of the relationships loaded on request
+    """
+
+    def __init__(self, obj: Any):
+        super().__init__(obj)
+        state = inspect(obj, raiseerr=False)
+        self._unloaded = state.unloaded.intersection(state.mapper.relationships.keys()) if state is not None else frozenset()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self._unloaded:
+            return default
+        return super().get(key, default)
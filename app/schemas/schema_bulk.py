@@ -0,0 +1,22 @@
+from typing import List
+
+from pydantic import BaseModel, Field, PositiveInt
+
+BULK_MAX_ITEMS = 1000
+
+
+class BulkDelete(BaseModel):
+    ids: List[PositiveInt] = Field(
+        title="The IDs of the objects to delete",
+        description=f"Note: must be a list of positive integers with a length of less than {BULK_MAX_ITEMS} items",
+        example=[1, 2, 3],
+        min_items=1,
+        max_items=BULK_MAX_ITEMS,
+    )
+
+
+class BulkResponse(BaseModel):
+    count: int = Field(
+        title="The amount of the processed objects",
+        example=3,
+    )
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatsResponse(BaseModel):
+    name: str = Field(title="The NAME of the cache", example="principal")
+    size: int = Field(title="The amount of cached entries", example=42)
+    maxsize: Optional[int] = Field(title="The maximum amount of cached entries, unbounded if not set", example=10000)
+    ttl: float = Field(title="The time to live of an entry, in seconds", example=60)
+    hits: int = Field(title="The amount of lookups served from the cache", example=420)
+    misses: int = Field(title="The amount of lookups missed or expired", example=42)
@@ -0,0 +1,20 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class EncodingStatsResponse(BaseModel):
+    responses: int = Field(title="The amount of compressed responses", example=42)
+    identity_bytes: int = Field(title="The bytes of the responses before compression", example=1048576)
+    encoded_bytes: int = Field(title="The bytes of the responses after compression", example=131072)
+    saved_bytes: int = Field(title="The bytes saved by compression", example=917504)
+    ratio: Optional[float] = Field(title="The compressed size relative to the original size", example=0.125)
+    cpu_time: float = Field(title="The CPU time spent compressing, in seconds", example=0.35)
+
+
+class CompressionStatsResponse(BaseModel):
+    encodings: Dict[str, EncodingStatsResponse] = Field(title="Compressed responses by encoding")
+    skipped: Dict[str, int] = Field(
+        title="The amount of responses sent uncompressed to a client accepting compression by reason",
+        example={"size": 40, "route": 12, "status": 3},
+    )
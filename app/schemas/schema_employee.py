@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, PastDate, PositiveInt
 
 
+from app.schemas.getter_dict import LoadedGetterDict
+from app.schemas.schema_employee_account import EmployeeAccountResponse
 from app.schemas.schema_user import UserBase, UserCreate, UserUpdate, UserResponse
 
 
@@ -61,3 +63,14 @@ class EmployeeResponse(EmployeeBase):
 
     class Config:
         orm_mode = True
+
+
+class EmployeeDetailResponse(EmployeeResponse):
+    employee_accounts: Optional[List[EmployeeAccountResponse]] = Field(
+        title="The ACCOUNTS of the employee",
+        description="Note: returned with `include=employee_accounts`",
+    )
+
+    class Config:
+        orm_mode = True
+        getter_dict = LoadedGetterDict
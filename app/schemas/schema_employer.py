@@ -1,8 +1,11 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, FutureDate, PositiveInt
 
+from app.schemas.getter_dict import LoadedGetterDict
+from app.schemas.schema_employee import EmployeeDetailResponse
+from app.schemas.schema_employer_payment_method import EmployerPaymentMethodResponse
 from app.schemas.schema_user import UserBase, UserCreate, UserResponse, UserUpdate
 
 
@@ -71,3 +74,19 @@ class EmployerResponse(EmployerBase):
 
     class Config:
         orm_mode = True
+
+
+class EmployerDetailResponse(EmployerResponse):
+    employees: Optional[List[EmployeeDetailResponse]] = Field(
+        title="The EMPLOYEES of the employer",
+        description="Note: returned with `include=employees`, with their accounts with "
+        "`include=employees.employee_accounts`",
+    )
+    employer_payment_methods: Optional[List[EmployerPaymentMethodResponse]] = Field(
+        title="The PAYMENT METHODS of the employer",
+        description="Note: returned with `include=employer_payment_methods`",
+    )
+
+    class Config:
+        orm_mode = True
+        getter_dict = LoadedGetterDict
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.schema_pool import HistogramResponse
+
+
+class PasswordHasherStatsResponse(BaseModel):
+    workers: int = Field(title="The amount of hashing processes", example=2)
+    max_pending: int = Field(title="The maximum amount of passwords being hashed or waiting", example=64)
+    pending: int = Field(title="The amount of passwords being hashed or waiting", example=3)
+    queued: int = Field(title="The amount of passwords over one per process, waiting for a free process", example=1)
+    completed: int = Field(title="The amount of hashed or verified passwords", example=420)
+    rejected: int = Field(title="The amount of passwords rejected with 503", example=0)
+    duration: HistogramResponse = Field(title="Job duration, queueing included")
@@ -1,7 +1,10 @@
 from datetime import date
+from typing import Optional
 
 from pydantic import BaseModel, Field, PositiveInt
 
+from app.constansts.constants_payment_type import ConstantPaymentType
+
 
 class PaymentHistoryBase(BaseModel):
     amount: PositiveInt = Field(
@@ -54,6 +57,70 @@ class PaymentHistoryResponse(PaymentHistoryBase):
         description="Note: must be a positive integer",
         example=1,
     )
+    run_date: Optional[date] = Field(
+        title="The DATE of the payroll run of the payment",
+        description="Note: not set for payments created out of a payroll run",
+        example="2022-01-01",
+    )
+    payment_type: Optional[ConstantPaymentType] = Field(
+        title="The TYPE of the payroll payment",
+        description="Note: not set for payments created out of a payroll run",
+        example=ConstantPaymentType.salary,
+    )
 
     class Config:
         orm_mode = True
+
+
+class PayrollRunCreate(BaseModel):
+    employer_id: Optional[PositiveInt] = Field(
+        title="The ID of the employer to pay",
+        description="Note: must be a positive integer, all employers with the day of month of salary or prepayment "
+        "date on the run date are paid if not set",
+        example=1,
+    )
+    run_date: date = Field(
+        default_factory=date.today,
+        title="The DATE of the payroll run",
+        description="Note: must be a date with format: yyyy-mm-dd, today if not set",
+        example="2022-01-01",
+    )
+    payment_type: Optional[ConstantPaymentType] = Field(
+        title="The TYPE of the payments",
+        description="Note: must be 'salary' or 'prepayment', all types due on the run date are paid if not set, "
+        "salary if the employer is set",
+        example=ConstantPaymentType.salary,
+    )
+    amount: PositiveInt = Field(
+        title="The AMOUNT paid to each employee",
+        description="Note: must be a positive integer",
+        example=123456789,
+    )
+    dry_run: bool = Field(
+        False,
+        title="Whether to only count the payments without creating them",
+        description="Note: must be 'True' or 'False'",
+        example=False,
+    )
+
+
+class PayrollRunResponse(BaseModel):
+    run_date: date = Field(title="The DATE of the payroll run", example="2022-01-01")
+    dry_run: bool = Field(title="Whether the payments were only counted", example=False)
+    payment_type: Optional[ConstantPaymentType] = Field(
+        title="The TYPE of the payments, all types if not set", example=ConstantPaymentType.salary
+    )
+    employers: int = Field(title="The amount of paid employers", example=1)
+    employees: int = Field(title="The amount of employees of the paid employers", example=100000)
+    payments: int = Field(title="The amount of created payments", example=99998)
+    amount_total: int = Field(title="The total AMOUNT of created payments", example=12345678900000)
+    skipped_no_account: int = Field(
+        title="The amount of payments skipped for employees without default active account", example=1
+    )
+    skipped_no_payment_method: int = Field(
+        title="The amount of payments skipped for employers without active payment method", example=0
+    )
+    skipped_already_paid: int = Field(
+        title="The amount of payments made by a run of the same date and payment type before", example=1
+    )
+    duration: float = Field(title="The time the run took, in seconds", example=1.5)
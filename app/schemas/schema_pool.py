@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class HistogramResponse(BaseModel):
+    buckets: Dict[str, int] = Field(
+        title="The amount of observations less than or equal to each bucket bound, in seconds",
+        example={"0.001": 40, "0.005": 42, "+Inf": 42},
+    )
+    count: int = Field(title="The amount of observations", example=42)
+    sum: float = Field(title="The sum of observed values, in seconds", example=0.034)
+
+
+class PoolStatsResponse(BaseModel):
+    name: str = Field(title="The NAME of the engine", example="default")
+    pool: str = Field(title="The class of the connection pool", example="MeteredQueuePool")
+    size: Optional[int] = Field(title="The size of the pool", example=10)
+    checked_in: Optional[int] = Field(title="The amount of idle connections in the pool", example=8)
+    checked_out: Optional[int] = Field(title="The amount of connections in use", example=2)
+    overflow: Optional[int] = Field(
+        title="The amount of connections over the pool size, negative while the pool is not filled",
+        example=-8,
+    )
+    checkouts: int = Field(title="The amount of connection checkouts", example=42)
+    timeouts: int = Field(title="The amount of checkouts failed on pool timeout", example=0)
+    connects: int = Field(title="The amount of new database connections", example=2)
+    invalidations: int = Field(title="The amount of invalidated connections", example=0)
+    wait_time: HistogramResponse = Field(title="Checkout wait time, new connections included")
+    connect_time: HistogramResponse = Field(title="New database connection latency")
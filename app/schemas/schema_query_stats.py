@@ -0,0 +1,29 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+from app.schemas.schema_pool import HistogramResponse
+
+
+class QueryCountHistogramResponse(BaseModel):
+    buckets: Dict[str, int] = Field(
+        title="The amount of requests with less than or equal statements than each bucket bound",
+        example={"1": 12, "2": 30, "5": 41, "+Inf": 42},
+    )
+    count: int = Field(title="The amount of requests", example=42)
+    sum: float = Field(title="The sum of statements of the requests", example=120)
+
+
+class QueryStatsResponse(BaseModel):
+    requests: int = Field(title="The amount of recorded requests", example=42)
+    statements: int = Field(title="The amount of statements of the requests", example=120)
+    repeat_threshold: int = Field(
+        title="The executions of the same statement in a request from which it is reported as N+1",
+        example=10,
+    )
+    queries: QueryCountHistogramResponse = Field(title="Statements per request")
+    db_time: HistogramResponse = Field(title="Time spent in the database per request")
+    repeated: Dict[str, int] = Field(
+        title="The amount of requests with a repeated statement (N+1) by route",
+        example={"GET /employee": 3},
+    )
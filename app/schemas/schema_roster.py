@@ -0,0 +1,47 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, PositiveInt
+
+from app.schemas.schema_employee import EmployeeBase
+from app.schemas.schema_employee_account import EmployeeAccountBase
+from app.schemas.schema_user import UserCreate
+
+# roster columns of the employee account fields, e.g. `account_number`
+ROSTER_ACCOUNT_COLUMNS = {
+    name if name.startswith("account_") else f"account_{name}": name for name in EmployeeAccountBase.__fields__
+}
+ROSTER_COLUMNS = ["email", "phone", "password", "fullname", "passport", "tax_id", "birth_date", *ROSTER_ACCOUNT_COLUMNS]
+# the header must have these columns, a file without them is rejected as a whole
+ROSTER_REQUIRED_COLUMNS = ["email", "password", "fullname"]
+
+
+class RosterEmployee(EmployeeBase):
+    user: UserCreate
+
+
+class RosterRowResult(BaseModel):
+    row: PositiveInt = Field(
+        title="The LINE of the row in the roster file",
+        description="Note: the header is line 1",
+        example=2,
+    )
+    email: Optional[str] = Field(
+        title="The EMAIL of the employee in the row",
+        example="example@mail.com",
+    )
+    is_created: bool = Field(
+        title="The CREATED/REJECTED STATUS of the row",
+        example=True,
+    )
+    errors: List[str] = Field(
+        title="The ERRORS of the rejected row",
+        example=["user.email: value is not a valid email address"],
+    )
+
+
+class RosterResponse(BaseModel):
+    created: int = Field(title="The amount of the created employees", example=49998)
+    rejected: int = Field(title="The amount of the rejected rows", example=2)
+    duration: float = Field(title="The DURATION of the upload in seconds", example=4.2)
+    rows: List[RosterRowResult] = Field(title="The RESULTS of the rows in the file order")
+
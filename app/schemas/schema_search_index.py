@@ -0,0 +1,20 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class SearchIndexColumnResponse(BaseModel):
+    model: str = Field(title="The NAME of the model", example="Employee")
+    column: str = Field(title="The indexed column", example="fullname")
+    size: int = Field(title="The amount of indexed rows", example=100000)
+    trigrams: int = Field(title="The amount of distinct trigrams", example=4200)
+    age: float = Field(title="The time since the index was built, in seconds", example=42.5)
+    refreshing: bool = Field(title="Whether the expired index is being rebuilt in the background", example=False)
+
+
+class SearchIndexStatsResponse(BaseModel):
+    enabled: bool = Field(title="Whether indexed columns are searched in memory", example=True)
+    ttl: float = Field(title="The time before an index is rebuilt, in seconds", example=300)
+    searches: int = Field(title="The amount of searches served from the index", example=420)
+    builds: int = Field(title="The amount of index builds", example=4)
+    indexes: List[SearchIndexColumnResponse] = Field(title="The indexes built so far")
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.schema_pool import HistogramResponse
+
+
+class SessionPurgeStatsResponse(BaseModel):
+    interval: float = Field(title="The seconds between purges, 0 when the purge is disabled", example=3600)
+    batch_size: int = Field(title="The maximum amount of sessions deleted per statement", example=500)
+    runs: int = Field(title="The amount of purges", example=24)
+    failures: int = Field(title="The amount of purges failed on a database error", example=0)
+    batches: int = Field(title="The amount of DELETE statements", example=130)
+    purged: Dict[str, int] = Field(
+        title="The amount of deleted sessions by reason", example={"expired": 64000, "logged_out": 1200}
+    )
+    last_run: Optional[datetime] = Field(title="The time of the last successful purge, UTC")
+    duration: HistogramResponse = Field(title="Purge duration")
+    batch_duration: HistogramResponse = Field(title="Duration of one batch, its transaction included")
@@ -0,0 +1,8 @@
+from hashlib import sha256
+
+
+def token_digest(token: str) -> bytes:
+    """
+    Fixed width SHA-256 digest of the token, sessions are looked up by it instead of the token itself
+    """
+    return sha256(token.encode("utf-8")).digest()
@@ -1,11 +1,132 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from passlib.context import CryptContext
 
-PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config.password_config import password_cfg
+from app.utils.batching import chunked
+from app.utils.exceptions.common_exceptions import HTTPServiceUnavailableException
+from app.utils.metrics import Counter, Histogram
+
+# hashes with another cost factor are reported by `verify_and_update` to be rehashed
+PWD_CONTEXT = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=password_cfg.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=password_cfg.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=password_cfg.PASSWORD_BCRYPT_ROUNDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return PWD_CONTEXT.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify the password, get a new hash if the stored one was made with another cost factor
+    """
+    return PWD_CONTEXT.verify_and_update(plain_password, hashed_password)
+
+
 def hash_password(password: str) -> str:
     return PWD_CONTEXT.hash(password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return [PWD_CONTEXT.hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """
+    Run bcrypt in a bounded process pool, so hashing does not hold the GIL of the web worker.
+    Passwords over `max_pending` (being hashed or queued) are rejected with 503 instead of queueing without limit
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = Counter()
+        self.rejected = Counter()
+        self.duration = Histogram()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash the passwords in parallel, one job per worker. Passwords are admitted in rounds of at most half
+        of `max_pending`, so a large roster is hashed round by round and leaves room for logins
+        """
+        hashed: List[str] = []
+        for passwords_round in chunked(passwords, max(self.max_pending // 2, 1)):
+            self._admit(len(passwords_round))
+            batches = list(chunked(passwords_round, -(-len(passwords_round) // self.workers)))
+            hashed_batches = await asyncio.gather(
+                *(self._execute(hash_passwords, batch, size=len(batch)) for batch in batches)
+            )
+            hashed.extend(password_hash for batch in hashed_batches for password_hash in batch)
+        return hashed
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        self._admit(1)
+        return await self._execute(func, *args)
+
+    async def _execute(self, func: Callable, *args: Any, size: int = 1) -> Any:
+        """
+        Run a job hashing or verifying `size` passwords, admitted beforehand
+        """
+        started = perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            with self._lock:
+                self.pending -= size
+            self.completed.inc(size)
+            self.duration.observe(perf_counter() - started)
+
+    def _admit(self, passwords: int) -> None:
+        with self._lock:
+            if self.pending + passwords > self.max_pending:
+                self.rejected.inc(passwords)
+                raise HTTPServiceUnavailableException(detail="Too many password hashing requests")
+            self.pending += passwords
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed.value,
+            "rejected": self.rejected.value,
+            "duration": self.duration.to_dict(),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=password_cfg.PASSWORD_HASH_WORKERS,
+    max_pending=password_cfg.PASSWORD_HASH_MAX_PENDING,
+)
@@ -1,18 +1,33 @@
 from functools import wraps
+from inspect import iscoroutinefunction
 from typing import Set
 
 from app.constansts.constants_role import ConstantRole
+from app.security.principal import Principal
 from app.utils.exceptions.common_exceptions import HTTPForbiddenException
 
 
+def check_role(session: Principal, allowed_roles: Set[str]) -> None:
+    user_role = session.role
+    if user_role != ConstantRole.su:
+        if user_role not in allowed_roles:
+            raise HTTPForbiddenException()
+
+
 def permission(allowed_roles: Set[str]):
     def inner(func):
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(session, *args, **kwargs):
+                check_role(session, allowed_roles)
+                return await func(*args, session=session, **kwargs)
+            async_wrapper.allowed_roles = allowed_roles
+            return async_wrapper
+
         @wraps(func)
         def wrapper(session, *args, **kwargs):
-            user_role = session.user.role.name
-            if user_role != ConstantRole.su:
-                if user_role not in allowed_roles:
-                    raise HTTPForbiddenException()
+            check_role(session, allowed_roles)
             return func(*args, session=session, **kwargs)
+        wrapper.allowed_roles = allowed_roles
         return wrapper
     return inner
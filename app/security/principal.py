@@ -0,0 +1,74 @@
+from typing import Iterable
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.jwt_config import jwt_cfg
+from app.db.session import session_context
+from app.utils.cache import TTLCache
+
+# users and tokens changed in the transaction, their principals are dropped once more when it is committed
+USERS_KEY = "principal_users"
+TOKENS_KEY = "principal_tokens"
+
+
+class Principal(BaseModel):
+    """
+    Authenticated session of the request: the session, its user and role name
+    """
+
+    id: int
+    token: str
+    status: str
+    user_id: int
+    role: str
+
+
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    "principal", maxsize=jwt_cfg.PRINCIPAL_CACHE_SIZE, ttl=jwt_cfg.PRINCIPAL_CACHE_TTL
+)
+
+
+def _drop_users(user_ids: Iterable[int]) -> None:
+    user_ids = set(user_ids)
+    if user_ids:
+        principal_cache.pop_where(lambda principal: principal.user_id in user_ids)
+
+
+def _track(key: str, values: Iterable) -> None:
+    session = session_context.get()
+    if session is not None:
+        session.info.setdefault(key, set()).update(values)
+
+
+def invalidate_user_principals(*user_ids: int) -> None:
+    """
+    Drop the principals of the users now, and once more when the session of the current request commits,
+    so a principal cached by a concurrent request from the rows read before the commit is not kept
+    """
+    _drop_users(user_ids)
+    _track(USERS_KEY, user_ids)
+
+
+def invalidate_principal(token: str) -> None:
+    """
+    Drop the principal of the token now, and once more when the session of the current request commits
+    """
+    principal_cache.pop(token)
+    _track(TOKENS_KEY, (token,))
+
+
+def _after_commit(session: Session) -> None:
+    _drop_users(session.info.pop(USERS_KEY, ()))
+    for token in session.info.pop(TOKENS_KEY, ()):
+        principal_cache.pop(token)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(USERS_KEY, None)
+    session.info.pop(TOKENS_KEY, None)
+
+
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
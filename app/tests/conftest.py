@@ -1,38 +1,44 @@
-from datetime import datetime
-from typing import Dict, Generator, List, Any
+from datetime import date, datetime
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, Callable, ContextManager, Dict, Generator, List
 
 import pytest
 from fastapi import FastAPI, Response, status
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import Session as SQLAlchemySession
-from sqlalchemy.orm import sessionmaker
 
 from app.api.api_enrollment import router
-from app.api.dependencies import get_session
+from app.api.dependencies import CursorPagination, get_session
 from app.config.db_config import db_cfg
 from app.constansts.constants_session import ConstantSessionStatus
 from app.crud.crud_employer import CRUDEmployer
 from app.crud.crud_employer_type import CRUDEmployerType
+from app.crud.crud_payment_history import CRUDPaymentHistory
 from app.crud.crud_role import CRUDRole
 from app.crud.crud_session import CRUDSession
 from app.crud.crud_status_type import CRUDStatusType
 from app.crud.crud_user import CRUDUser
 from app.db.base import Base
-from app.db.models import (Employer, EmployerType, Role, Session, StatusType,
-                           User)
+from app.db.dialect import create_db_engine
+from app.db.models import (Employee, EmployeeAccount, Employer,
+                           EmployerPaymentMethod, EmployerType,
+                           PaymentHistory, PaymentStatusType, Role, Session,
+                           StatusType, User)
+from app.db.query_stats import QueryStats
+from app.db.session import session_context
 from app.schemas.schema_employer_type import EmployerTypeCreate
 from app.schemas.schema_role import RoleCreate
 from app.schemas.schema_session import SessionCreate
 from app.schemas.schema_status_type import StatusTypeCreate
+from app.tests.utils import queries
 from app.tests.utils.base import (get_su_token_headers, random_date,
                                   random_email, random_integer,
                                   random_password, random_phone, random_string)
 
-SQLALCHEMY_DATABASE_URL_TEST = \
-    f"mssql+pyodbc://{db_cfg.DB_USER}:{db_cfg.DB_PASSWORD}@{db_cfg.DB_HOST}:{db_cfg.DB_PORT}/{db_cfg.DB_NAME_TEST}?driver={db_cfg.DB_DRIVER}"
-engine = create_engine(SQLALCHEMY_DATABASE_URL_TEST)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# an in-memory SQLite database by default, set DB_URL_TEST to run the tests on another database
+engine = create_db_engine(db_cfg.DB_URL_TEST)
 
 
 @pytest.fixture(scope="session")
@@ -42,14 +48,47 @@ def app() -> FastAPI:
     return app
 
 
-@pytest.fixture(scope="module")
-def db() -> Generator:
+@pytest.fixture(scope="session")
+def schema() -> Generator:
     Base.metadata.create_all(engine)
-    yield TestingSessionLocal()
+    yield
     Base.metadata.drop_all(engine)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
+def db(schema) -> Generator:
+    """
+    Session of the test in a transaction which is rolled back after the test, commits of the code under test
+    only release a SAVEPOINT which is started again. The session is the current one of the CRUD singletons
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = SQLAlchemySession(bind=connection, autoflush=False)
+    nested = connection.begin_nested()
+
+    @event.listens_for(db, "after_transaction_end")
+    def restart_savepoint(session, trans) -> None:
+        nonlocal nested
+        if not nested.is_active:
+            nested = connection.begin_nested()
+
+    token = session_context.set(db)
+    yield db
+    session_context.reset(token)
+    db.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[QueryStats]]:
+    """
+    `with query_budget(2):` fails the test if the block executes more than 2 statements on the test database
+    """
+    return partial(queries.query_budget, engine)
+
+
+@pytest.fixture
 def session(crud_session) -> Session:
     session = crud_session.create(
         SessionCreate(
@@ -61,8 +100,13 @@ def session(crud_session) -> Session:
     yield session
 
 
+@pytest.fixture
+def pagination() -> CursorPagination:
+    return CursorPagination(Response(), after=None, limit=100, order_by="id")
+
+
 @pytest.fixture(scope="module")
-def client(app: FastAPI, db: SQLAlchemySession) -> Generator:
+def client(app: FastAPI, schema) -> Generator:
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = session
         yield client
@@ -73,36 +117,41 @@ def su_token_headers(client: TestClient) -> Dict[str, str]:
     return get_su_token_headers(client)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_role(db: SQLAlchemySession) -> CRUDRole:
     return CRUDRole(Role, db)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_session(db: SQLAlchemySession) -> CRUDSession:
     return CRUDSession(Session, db)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_user(db: SQLAlchemySession) -> CRUDUser:
     return CRUDUser(User, db)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_status_type(db: SQLAlchemySession) -> CRUDStatusType:
     return CRUDStatusType(StatusType, db)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_employer(db: SQLAlchemySession) -> CRUDEmployer:
     return CRUDEmployer(Employer, db)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def crud_employer_type(db: SQLAlchemySession) -> CRUDEmployerType:
     return CRUDEmployerType(EmployerType, db)
 
 
+@pytest.fixture
+def crud_payment_history(db: SQLAlchemySession) -> CRUDPaymentHistory:
+    return CRUDPaymentHistory(PaymentHistory, db)
+
+
 @pytest.fixture
 def random_role(crud_role) -> Role:
     return crud_role.create(RoleCreate(name=random_string()))
@@ -122,7 +171,8 @@ def expected_role() -> Role:
 
 @pytest.fixture
 def expected_roles() -> List[Role]:
-    return [Role(id=random_integer(), name=random_string()) for _ in range(3)]
+    # ordered by id like the pages of reference data
+    return [Role(id=id, name=random_string()) for id in range(1, 4)]
 
 
 @pytest.fixture
@@ -148,8 +198,8 @@ def expected_status_type() -> StatusType:
 def expected_status_types() -> List[StatusType]:
     return [
         StatusType(
-            id=random_integer(), name=random_string()
-        ) for _ in range(3)
+            id=id, name=random_string()
+        ) for id in range(1, 4)
     ]
 
 
@@ -180,8 +230,8 @@ def expected_employer_type() -> EmployerType:
 def expected_employer_types() -> List[EmployerType]:
     return [
         EmployerType(
-            id=random_integer(), name=random_string()
-        ) for _ in range(3)
+            id=id, name=random_string()
+        ) for id in range(1, 4)
     ]
 
 
@@ -326,3 +376,75 @@ def expected_employers() -> List[Employer]:
 @pytest.fixture
 def expected_response_no_content() -> Response:
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@pytest.fixture
+def payroll(db: SQLAlchemySession) -> SimpleNamespace:
+    """
+    Employers and employees of a payroll run on 2022-01-10, the payment dates are of an earlier month:
+    `salary` is due by salary date and `prepayment` by prepayment date on the 10th, `other` on the 25th.
+    `paid` has older and newer default active accounts, `no_account` has only a non-default one
+    and `no_method` works for the employer without an active payment method
+    """
+    run_date = date(2022, 1, 10)
+    salary = Employer(name=random_string(), salary_date=date(2021, 12, 10), prepayment_date=date(2021, 12, 25))
+    prepayment = Employer(name=random_string(), salary_date=date(2021, 12, 25), prepayment_date=date(2021, 12, 10))
+    other = Employer(name=random_string(), salary_date=date(2021, 12, 25))
+    db.add_all([salary, prepayment, other])
+    db.flush()
+
+    def payment_method(employer: Employer, is_active: bool) -> EmployerPaymentMethod:
+        method = EmployerPaymentMethod(employer_id=employer.id, is_active=is_active, creation_date=datetime.utcnow())
+        db.add(method)
+        db.flush()
+        return method
+
+    def employee(employer: Employer) -> Employee:
+        employee = Employee(fullname=random_string(), employer_id=employer.id)
+        db.add(employee)
+        db.flush()
+        return employee
+
+    def account(employee: Employee, is_active: bool = True, is_default: bool = True) -> EmployeeAccount:
+        account = EmployeeAccount(
+            employee_id=employee.id, is_active=is_active, is_default=is_default, creation_date=datetime.utcnow()
+        )
+        db.add(account)
+        db.flush()
+        return account
+
+    payment_method(salary, is_active=True)
+    salary_method = payment_method(salary, is_active=True)
+    payment_method(salary, is_active=False)
+    payment_method(prepayment, is_active=False)
+    other_method = payment_method(other, is_active=True)
+
+    paid, no_account = employee(salary), employee(salary)
+    account(paid)
+    paid_account = account(paid)
+    account(paid, is_default=False)
+    account(paid, is_active=False)
+    account(no_account, is_default=False)
+    no_method = employee(prepayment)
+    account(no_method)
+    other_employee = employee(other)
+    other_account = account(other_employee)
+
+    status_in_process = PaymentStatusType(name="in_process")
+    db.add(status_in_process)
+    db.flush()
+    return SimpleNamespace(
+        run_date=run_date,
+        salary=salary,
+        prepayment=prepayment,
+        other=other,
+        paid=paid,
+        paid_account=paid_account,
+        salary_method=salary_method,
+        no_account=no_account,
+        no_method=no_method,
+        other_employee=other_employee,
+        other_account=other_account,
+        other_method=other_method,
+        status_in_process=status_in_process,
+    )
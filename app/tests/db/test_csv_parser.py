@@ -0,0 +1,61 @@
+import csv
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+
+from app.db.base import Base
+from app.db.models import Employer, PaymentHistory, Role, User
+from app.utils.csv_parser import DATA_DIR, load_table, parsing, table_levels
+
+
+class TestCSVParser:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+        Role.__table__.create(engine)
+        yield engine
+        engine.dispose()
+
+    def test_successful_load_in_chunks(self, engine, tmp_path) -> None:
+        path = tmp_path / "Role.csv"
+        path.write_text("id,name\n" + "".join(f"{i},role_{i}\n" for i in range(1, 26)))
+
+        report = load_table(Role.__table__, str(path), engine, chunk_size=10)
+
+        assert (report.rows, report.rejected) == (25, 0)
+        with engine.connect() as connection:
+            assert connection.execute(select(Role.id)).scalars().all() == list(range(1, 26))
+
+    def test_successful_reject_bad_rows(self, engine, tmp_path) -> None:
+        path = tmp_path / "Role.csv"
+        rows = [f"{i},role_{i}" for i in range(1, 11)]
+        rows[3] = "x,not_a_number"
+        # duplicated primary key is found by the database and isolated by splitting the chunk
+        rows[7] = "2,duplicate"
+        path.write_text("id,name\n" + "\n".join(rows) + "\n")
+
+        report = load_table(Role.__table__, str(path), engine, chunk_size=10, rejects_dir=str(tmp_path))
+
+        assert (report.rows, report.rejected) == (8, 2)
+        with open(tmp_path / "Role.rejected.csv", newline="") as rejected_file:
+            rejected = list(csv.DictReader(rejected_file))
+        assert [row["id"] for row in rejected] == ["x", "2"]
+        assert rejected[0]["error"].startswith("ValueError")
+
+    def test_successful_table_levels(self) -> None:
+        levels = table_levels([PaymentHistory.__table__, User.__table__, Role.__table__, Employer.__table__])
+
+        assert [[table.name for table in level] for level in levels] == [
+            ["role"], ["user"], ["employer"], ["payment_history"]
+        ]
+
+    def test_successful_parsing_with_disabled_indexes(self, tmp_path) -> None:
+        engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+        Base.metadata.create_all(engine)
+
+        reports = parsing(DATA_DIR, engine, workers=4, disable_indexes=True)
+
+        assert {report.table for report in reports} >= {"role", "user", "employee", "payment_history"}
+        assert sum(report.rejected for report in reports) == 0
+        assert "ix_employee_employer_id" in {index["name"] for index in inspect(engine).get_indexes("employee")}
+        engine.dispose()
@@ -0,0 +1,50 @@
+import csv
+from datetime import date
+
+from sqlalchemy import create_engine, event, func, select
+
+from app.db.base import Base
+from app.db.models import Employee, EmployeeAccount, EmployerPaymentMethod, PaymentHistory
+from app.utils.dataset_generator import CSVSink, DBSink, DatasetGenerator, Scale, generate
+
+SCALE = Scale(employers=5, employees=200, payments=1000, banks=3)
+
+
+class TestDatasetGenerator:
+    def test_successful_generate_to_db(self, tmp_path, mocker) -> None:
+        mocker.patch("app.utils.dataset_generator.hash_password", return_value="hashed_password")
+        engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+        event.listen(engine, "connect", lambda dbapi_connection, _: dbapi_connection.execute("pragma foreign_keys=on"))
+        Base.metadata.create_all(engine)
+
+        reports = generate(DatasetGenerator(SCALE, today=date(2022, 11, 12)), DBSink(engine, chunk_size=100))
+
+        assert {report.table: report.rows for report in reports}["payment_history"] == 1000
+        with engine.connect() as connection:
+            assert connection.execute(select(func.count()).select_from(Employee)).scalar() == 200
+            # every payment is made by the employer of the employee owning the account
+            mismatched = connection.execute(
+                select(func.count())
+                .select_from(PaymentHistory)
+                .join(EmployeeAccount)
+                .join(Employee)
+                .join(EmployerPaymentMethod)
+                .where(EmployerPaymentMethod.employer_id != Employee.employer_id)
+            ).scalar()
+            assert mismatched == 0
+            sizes = connection.execute(
+                select(func.count()).select_from(Employee).group_by(Employee.employer_id).order_by(func.count().desc())
+            ).scalars().all()
+            assert sizes[0] > sizes[-1]
+        engine.dispose()
+
+    def test_successful_generate_to_csv(self, tmp_path, mocker) -> None:
+        mocker.patch("app.utils.dataset_generator.hash_password", return_value="hashed_password")
+
+        generate(DatasetGenerator(SCALE, seed=1, today=date(2022, 11, 12)), CSVSink(str(tmp_path)))
+
+        with open(tmp_path / "EmployeeAccount.csv", newline="") as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        assert len({row["employee_id"] for row in rows}) == 200
+        assert {row["is_default"] for row in rows} == {"true", "false"}
+        assert rows[0]["creation_date"].endswith(".000000")
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from app.db.pool import PoolMetrics
+
+
+class TestPoolMetrics:
+    @pytest.fixture
+    def metrics(self) -> PoolMetrics:
+        metrics = PoolMetrics("test")
+        engine = create_engine(
+            "sqlite://",
+            poolclass=metrics.pool_class(),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+            connect_args={"check_same_thread": False},
+        )
+        metrics.instrument(engine)
+        yield metrics
+        engine.dispose()
+
+    def test_successful_pool_stats(self, metrics) -> None:
+        with metrics.engine.connect():
+            stats = metrics.stats()
+            assert stats["pool"] == "MeteredQueuePool"
+            assert stats["checked_out"] == 1
+        with metrics.engine.connect():
+            pass
+
+        stats = metrics.stats()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["connects"] == 1
+        assert stats["wait_time"]["count"] == 2
+        assert stats["wait_time"]["buckets"]["+Inf"] == 2
+        assert stats["connect_time"]["count"] == 1
+
+    def test_failed_pool_checkout_timeout(self, metrics) -> None:
+        with metrics.engine.connect():
+            with pytest.raises(TimeoutError):
+                metrics.engine.connect()
+
+        assert metrics.stats()["timeouts"] == 1
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_base_async import AsyncCRUDBase
+from app.db.models import Role
+from app.db.session import (async_session_context, async_session_scope,
+                            get_current_async_session, get_current_session,
+                            session_context, session_scope)
+from app.utils.exceptions.common_exceptions import (HTTPBadRequestException,
+                                                    HTTPInternalServerException)
+
+
+class TestSessionScope:
+    def test_successful_get_current_session(self) -> None:
+        with session_scope() as session:
+            assert get_current_session() is session
+
+        assert session_context.get() is None
+
+    def test_failed_get_current_session(self) -> None:
+        with pytest.raises(RuntimeError):
+            get_current_session()
+
+    def test_failed_session_scope(self, mocker) -> None:
+        with pytest.raises(ValueError):
+            with session_scope() as session:
+                spy_rollback = mocker.spy(session, "rollback")
+                raise ValueError()
+
+        spy_rollback.assert_called_once()
+        assert session_context.get() is None
+
+
+class TestAsyncSessionScope:
+    def test_successful_get_current_async_session(self) -> None:
+        async def scope():
+            async with async_session_scope() as session:
+                assert get_current_async_session() is session
+
+        asyncio.run(scope())
+        assert async_session_context.get() is None
+
+    def test_failed_get_current_async_session(self) -> None:
+        with pytest.raises(RuntimeError):
+            get_current_async_session()
+
+    def test_failed_async_session_scope(self, mocker) -> None:
+        spies = []
+
+        async def scope():
+            async with async_session_scope() as session:
+                spies.append(mocker.spy(session, "rollback"))
+                raise ValueError()
+
+        with pytest.raises(ValueError):
+            asyncio.run(scope())
+        spies[0].assert_called_once()
+        assert async_session_context.get() is None
+
+
+class TestAsyncCRUDSave:
+    @pytest.mark.parametrize(
+        "error, exception",
+        [
+            (IntegrityError("INSERT", {}, Exception()), HTTPBadRequestException),
+            (OperationalError("INSERT", {}, Exception()), HTTPInternalServerException),
+        ],
+    )
+    def test_failed_save_rolled_back(self, mocker, error, exception) -> None:
+        session = mocker.AsyncMock(spec=AsyncSession)
+        session.flush.side_effect = error
+        crud = AsyncCRUDBase(Role, session)
+
+        with pytest.raises(exception):
+            asyncio.run(crud.save(is_flush=True))
+
+        session.rollback.assert_awaited_once()
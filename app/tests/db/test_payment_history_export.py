@@ -0,0 +1,60 @@
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.crud_payment_history import CRUDPaymentHistory
+from app.db.models import EmployerPaymentMethod, PaymentHistory
+from app.utils.export import encode_csv, encode_ndjson
+
+
+class TestPaymentHistoryExport:
+    @pytest.fixture
+    def crud(self):
+        engine = create_engine("sqlite://")
+        EmployerPaymentMethod.__table__.create(engine)
+        PaymentHistory.__table__.create(engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add_all([EmployerPaymentMethod(id=1, employer_id=1), EmployerPaymentMethod(id=2, employer_id=2)])
+            session.add_all(
+                PaymentHistory(
+                    id=i,
+                    amount=i * 100,
+                    creation_date=datetime(2022, 1, i, 10),
+                    employer_payment_method_id=i % 2 + 1,
+                    payment_status_type_id=1,
+                )
+                for i in range(1, 11)
+            )
+            session.commit()
+            yield CRUDPaymentHistory(PaymentHistory, session)
+        engine.dispose()
+
+    def test_successful_export_partitions(self, crud) -> None:
+        partitions = list(
+            crud.get_export_partitions(date(2022, 1, 3), date(2022, 1, 8), employer_id=1, partition_size=2)
+        )
+
+        assert [[row.id for row in rows] for rows in partitions] == [[4, 6], [8]]
+
+    def test_successful_encode(self, crud) -> None:
+        partitions = list(crud.get_export_partitions(date(2022, 1, 1), date(2022, 1, 2), partition_size=1))
+
+        csv_lines = b"".join(encode_csv(crud.export_columns, partitions)).decode().splitlines()
+        ndjson_lines = b"".join(encode_ndjson(crud.export_columns, partitions)).decode().splitlines()
+
+        assert csv_lines == [
+            ",".join(crud.export_columns),
+            "1,100,2022-01-01T10:00:00,,2,1",
+            "2,200,2022-01-02T10:00:00,,1,1",
+        ]
+        assert json.loads(ndjson_lines[1]) == {
+            "id": 2,
+            "amount": 200,
+            "creation_date": "2022-01-02T10:00:00",
+            "employee_account_id": None,
+            "employer_payment_method_id": 1,
+            "payment_status_type_id": 1,
+        }
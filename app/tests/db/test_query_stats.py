@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.db.dialect import create_db_engine
+from app.db.models import Employer
+from app.db.query_stats import QueryMetrics
+from app.middleware.middleware_query_stats import QueryStatsMiddleware
+
+
+class TestQueryStats:
+    @pytest.fixture
+    def metrics(self) -> QueryMetrics:
+        return QueryMetrics(repeat_threshold=3)
+
+    @pytest.fixture
+    def client(self, metrics: QueryMetrics) -> TestClient:
+        engine = create_db_engine("sqlite://")
+        metrics.instrument(engine)
+
+        def fetch_items(request) -> PlainTextResponse:
+            with engine.connect() as connection:
+                for item_id in range(int(request.query_params["items"])):
+                    connection.execute(text("SELECT :id"), {"id": item_id})
+            return PlainTextResponse("OK")
+
+        app = Starlette(routes=[Route("/items/{group}", fetch_items)])
+        app.add_middleware(QueryStatsMiddleware, headers=True, metrics=metrics)
+        yield TestClient(app)
+        engine.dispose()
+
+    def test_successful_query_stats_headers(self, client: TestClient, metrics: QueryMetrics) -> None:
+        response = client.get("/items/1", params={"items": 2})
+
+        assert response.headers["X-DB-Query-Count"] == "2"
+        assert float(response.headers["X-DB-Query-Time"]) >= 0
+        assert "X-DB-Repeated-Query" not in response.headers
+        assert (metrics.stats()["requests"], metrics.stats()["statements"]) == (1, 2)
+
+    def test_successful_detect_repeated_query(self, client: TestClient, metrics: QueryMetrics) -> None:
+        client.get("/items/1", params={"items": 1})
+        response = client.get("/items/2", params={"items": 5})
+
+        assert response.headers["X-DB-Repeated-Query"] == "5 x SELECT ?"
+        assert metrics.stats()["repeated"] == {"GET /items/{group}": 1}
+        assert metrics.stats()["queries"]["buckets"]["1"] == 1
+
+
+class TestQueryBudget:
+    def test_successful_query_budget(self, db, random_employers, query_budget) -> None:
+        with query_budget(1) as stats:
+            db.execute(select(Employer)).all()
+
+        assert stats.count == 1
+
+    def test_failed_query_budget_lazy_loads(self, db, random_employers, query_budget) -> None:
+        with pytest.raises(AssertionError, match="4 statements over the budget of 2"):
+            with query_budget(2):
+                for employer in db.execute(select(Employer)).scalars().all():
+                    employer.employees
@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Role
+from app.db.reference_data import CHANGES_KEY, ReferenceData
+from app.db.session import session_context
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+from app.utils.pagination import encode_cursor, keyset_page
+
+
+class TestReferenceData:
+    @pytest.fixture
+    def session_factory(self, monkeypatch):
+        engine = create_engine("sqlite://")
+        Role.__table__.create(engine)
+        session_factory = sessionmaker(bind=engine)
+        monkeypatch.setattr("app.db.reference_data.SessionLocal", session_factory)
+        with session_factory() as session:
+            session.add_all([Role(id=1, name="su"), Role(id=2, name="admin")])
+            session.commit()
+        yield session_factory
+        engine.dispose()
+
+    def test_successful_get_from_memory(self, session_factory) -> None:
+        cache = ReferenceData(models=(Role,), ttl=60)
+        cache.load_all()
+
+        assert cache.get_by_name(Role, "admin").id == 2
+        assert cache.get(Role, 1).name == "su"
+        assert cache.get(Role, 3) is None
+        assert (cache.hits[Role].value, cache.misses[Role].value) == (3, 0)
+
+    def test_successful_reload_after_invalidate(self, session_factory) -> None:
+        cache = ReferenceData(models=(Role,), ttl=60)
+        cache.load_all()
+        with session_factory() as session:
+            session.add(Role(id=3, name="employer"))
+            session.commit()
+
+        assert cache.get_by_name(Role, "employer") is None
+        cache.invalidate(Role)
+        assert cache.get_by_name(Role, "employer").id == 3
+
+    def test_successful_etag_of_table_version(self, session_factory) -> None:
+        cache = ReferenceData(models=(Role,), ttl=60)
+        cache.load_all()
+        etag = cache.etag(Role)
+        cache.load(Role)
+        assert cache.etag(Role) == etag
+
+        with session_factory() as session:
+            session.add(Role(id=3, name="employer"))
+            session.commit()
+        cache.invalidate(Role)
+
+        assert cache.etag(Role) != etag
+        assert cache.etag(Role).startswith('W/"role-')
+
+    def test_successful_invalidate_on_commit(self, session_factory) -> None:
+        cache = ReferenceData(models=(Role,), ttl=60)
+        session = session_factory()
+        token = session_context.set(session)
+        try:
+            cache.invalidate(Role)
+            cache.load_all()
+            assert session.info[CHANGES_KEY] == {Role}
+
+            cache._after_commit(session)
+            assert cache.stats() == []
+        finally:
+            session_context.reset(token)
+            session.close()
+
+
+class TestKeysetPage:
+    roles = [Role(id=3, name="employer"), Role(id=1, name="su"), Role(id=2, name="admin")]
+
+    def test_successful_page_by_id(self) -> None:
+        assert [role.id for role in keyset_page(Role, self.roles, None, limit=2)] == [1, 2]
+        after = encode_cursor("id", 2, 2)
+        assert [role.id for role in keyset_page(Role, self.roles, after, limit=2)] == [3]
+
+    def test_successful_page_by_unique_column(self) -> None:
+        after = encode_cursor("name", "admin", 2)
+        assert [role.name for role in keyset_page(Role, self.roles, after, "name")] == ["employer", "su"]
+
+    def test_failed_page_by_not_indexed_column(self) -> None:
+        with pytest.raises(HTTPBadRequestException):
+            keyset_page(Role, self.roles, None, "users")
@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import sleep
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud.crud_bank import CRUDBank
+from app.db.models import Bank
+from app.db.search_index import CHANGES_KEY, SearchIndex, TrigramIndex, page_ids, search_index
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+from app.utils.pagination import SEARCH_RANK, encode_cursor
+
+
+class TestTrigramIndex:
+    def test_successful_match_keyword(self) -> None:
+        index = TrigramIndex()
+        index.add(1, "Privat Bank")
+        index.add(2, "Monobank")
+        index.add(3, "Bakery")
+
+        assert sorted(obj_id for obj_id, _ in index.match("BANK")) == [1, 2]
+        assert sorted(obj_id for obj_id, _ in index.match("ba")) == [1, 2, 3]
+        assert index.match("bankrupt") == []
+
+    def test_successful_match_trigrams_in_order_only(self) -> None:
+        index = TrigramIndex()
+        index.add(1, "abcd xbcy")
+
+        assert index.match("abcy") == []
+
+    def test_successful_update_and_remove_value(self) -> None:
+        index = TrigramIndex()
+        index.add(1, "Privat Bank")
+        index.add(1, "Sense")
+        index.add(2, None)
+
+        assert index.match("bank") == []
+        assert index.match("sense") == [(1, "sense")]
+        index.remove(1)
+        assert len(index) == 0
+        assert not index.postings
+
+
+class TestSearchPage:
+    hits = [(1, "privat bank"), (2, "monobank"), (3, "bank"), (4, "bank of kyiv")]
+
+    def test_successful_page_by_rank(self) -> None:
+        assert page_ids(self.hits, "Bank", limit=2) == [3, 4]
+        cursor = encode_cursor(SEARCH_RANK, [1, len("bank of kyiv")], 4)
+        assert page_ids(self.hits, "Bank", limit=2, after=cursor) == [1, 2]
+        assert page_ids(self.hits, "Bank", limit=2, skip=1) == [4, 1]
+
+    def test_failed_page_with_offset_rank_cursor(self) -> None:
+        with pytest.raises(HTTPBadRequestException):
+            page_ids(self.hits, "bank", limit=2, after=encode_cursor(SEARCH_RANK, 2, 4))
+
+    def test_successful_page_by_id(self) -> None:
+        assert page_ids(self.hits, "bank", limit=2, order_by="id") == [1, 2]
+        cursor = encode_cursor("id", 2, 2)
+        assert page_ids(self.hits, "bank", limit=2, after=cursor, order_by="id") == [3, 4]
+
+    def test_failed_page_with_cursor_of_other_sort(self) -> None:
+        with pytest.raises(HTTPBadRequestException):
+            page_ids(self.hits, "bank", limit=2, after=encode_cursor("id", 2, 2))
+
+
+class TestSearchIndexTracking:
+    @pytest.fixture
+    def crud_bank(self) -> CRUDBank:
+        engine = create_engine("sqlite://")
+        Bank.__table__.create(engine)
+        session = sessionmaker(bind=engine)()
+        search_index.invalidate(Bank)
+        yield CRUDBank(Bank, session)
+        search_index.invalidate(Bank)
+        session.close()
+        engine.dispose()
+
+    @staticmethod
+    def bank_data(name: str) -> dict:
+        return {"name": name, "mfo": "300001", "creation_date": datetime.utcnow()}
+
+    def test_successful_search_after_writes(self, crud_bank) -> None:
+        privat = crud_bank.create(self.bank_data("Privat Bank"))
+        assert [obj.id for obj in crud_bank.search_by_parameter("name", "bank", order_by=SEARCH_RANK)] == [privat.id]
+
+        mono = crud_bank.create(self.bank_data("Monobank"))
+        crud_bank.create_many([self.bank_data("Bank")])
+        crud_bank.update(crud_bank.get(privat.id), {"name": "PrivatBank"})
+        results = crud_bank.search_by_parameter("name", "bank", order_by=SEARCH_RANK)
+
+        assert [obj.name for obj in results] == ["Bank", "Monobank", "PrivatBank"]
+        crud_bank.delete(mono.id)
+        assert [obj.name for obj in crud_bank.search_by_parameter("name", "bank")] == ["PrivatBank", "Bank"]
+
+    def test_successful_discard_rolled_back_writes(self, crud_bank) -> None:
+        crud_bank.create(self.bank_data("Privat Bank"))
+        crud_bank.search_by_parameter("name", "bank")
+        crud_bank.create(self.bank_data("Monobank"), is_flush=True)
+        crud_bank.session.rollback()
+
+        index = search_index.get(crud_bank.session, Bank, "name")
+        assert [text for _, text in index.match("bank")] == ["privat bank"]
+
+
+class TestSearchIndexRefresh:
+    @pytest.fixture
+    def session_factory(self) -> sessionmaker:
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Bank.__table__.create(engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add(Bank(name="Privat Bank", mfo="300001", creation_date=datetime.utcnow()))
+            session.commit()
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    @staticmethod
+    def wait_for_refreshes(index_registry: SearchIndex) -> None:
+        for thread in list(index_registry._refreshes.values()):
+            thread.join()
+
+    def test_successful_build_once_for_concurrent_searches(self, session_factory, mocker) -> None:
+        index_registry = SearchIndex(enabled=True, ttl=60, build_batch=100, session_factory=session_factory)
+        load = index_registry._load
+
+        def slow_load(*args, **kwargs) -> None:
+            sleep(0.05)
+            load(*args, **kwargs)
+
+        mocker.patch.object(index_registry, "_load", side_effect=slow_load)
+
+        def search(_) -> TrigramIndex:
+            with session_factory() as session:
+                return index_registry.get(session, Bank, "name")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            indexes = list(executor.map(search, range(8)))
+
+        assert index_registry.builds.value == 1
+        assert all(index is indexes[0] for index in indexes)
+
+    def test_successful_serve_expired_index_while_rebuilt(self, session_factory) -> None:
+        index_registry = SearchIndex(enabled=True, ttl=60, build_batch=100, session_factory=session_factory)
+        with session_factory() as session:
+            expired = index_registry.get(session, Bank, "name")
+            session.add(Bank(name="Monobank", mfo="300002", creation_date=datetime.utcnow()))
+            session.commit()
+            index_registry.ttl = 0
+
+            assert index_registry.get(session, Bank, "name") is expired
+            self.wait_for_refreshes(index_registry)
+            index_registry.ttl = 60
+
+            rebuilt = index_registry.get(session, Bank, "name")
+        assert rebuilt is not expired
+        assert sorted(text for _, text in rebuilt.match("bank")) == ["monobank", "privat bank"]
+        assert index_registry.builds.value == 2
+
+    def test_successful_apply_changes_committed_while_built(self, session_factory, mocker) -> None:
+        index_registry = SearchIndex(enabled=True, ttl=60, build_batch=100, session_factory=session_factory)
+        load = index_registry._load
+
+        def load_with_concurrent_commit(*args, **kwargs) -> None:
+            load(*args, **kwargs)
+            index_registry._after_commit(
+                SimpleNamespace(info={CHANGES_KEY: [("set", Bank, 42, {"name": "Sense Bank"})]})
+            )
+
+        mocker.patch.object(index_registry, "_load", side_effect=load_with_concurrent_commit)
+
+        with session_factory() as session:
+            index = index_registry.get(session, Bank, "name")
+
+        assert sorted(obj_id for obj_id, _ in index.match("bank")) == [1, 42]
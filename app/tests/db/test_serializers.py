@@ -0,0 +1,53 @@
+import json
+from datetime import date, datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.db.models import EmployeeAccount, Employer, User
+from app.schemas.schema_employee_account import EmployeeAccountResponse
+from app.schemas.schema_employer import EmployerResponse
+from app.utils import responses
+from app.utils.responses import SerializedResponse
+from app.utils.serializers import serializer
+
+
+class TestSerializers:
+    def test_successful_serialize_like_response_model(self) -> None:
+        employer = Employer(
+            id=1,
+            name="Example Company",
+            address="1 STREET st LOCALITY",
+            edrpou="12345678",
+            expire_contract_date=date(2030, 1, 1),
+            employer_type_id=1,
+            user=User(id=1, email="employer@example.com", phone=None, role_id=3, status_type_id=1),
+        )
+
+        serialized = serializer(EmployerResponse)(employer)
+
+        assert json.loads(responses.FastJSONResponse(serialized).body) == jsonable_encoder(
+            EmployerResponse.from_orm(employer)
+        )
+        assert serialized["user"]["email"] == "employer@example.com"
+
+    def test_successful_serialized_response(self, monkeypatch) -> None:
+        account = EmployeeAccount(
+            id=1,
+            name="PB",
+            number="1234567890123456",
+            is_active=True,
+            is_default=True,
+            issuer="Example Bank",
+            creation_date=datetime(2022, 1, 1, 10, 30),
+            deactivation_date=date(2030, 1, 1),
+            employee_id=1,
+            account_type_id=1,
+        )
+        expected = jsonable_encoder([EmployeeAccountResponse.from_orm(account)])
+
+        monkeypatch.setattr(responses, "orjson", None)
+        response = SerializedResponse([account], EmployeeAccountResponse, headers={"X-Next-Cursor": "cursor"})
+
+        assert json.loads(response.body) == expected
+        assert expected[0]["creation_date"] == "2022-01-01"
+        assert response.headers["X-Next-Cursor"] == "cursor"
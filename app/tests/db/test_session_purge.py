@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+from app.constansts.constants_session import ConstantSessionStatus
+from app.db.models import Session
+from app.db.session_purge import SessionPurge
+from app.schemas.schema_session import SessionCreate
+from app.utils.prometheus import PrometheusWriter, write_session_purge_metrics
+
+NOW = datetime(2022, 6, 1, 12, 0)
+
+
+def create_sessions(crud_session, user_id: int, status: str, age: timedelta, amount: int) -> None:
+    for i in range(amount):
+        crud_session.create(
+            SessionCreate(token=f"{status}-{age}-{i}", creation_date=NOW - age, status=status, user_id=user_id)
+        )
+
+
+class TestSessionPurge:
+    def test_successful_purge_in_batches(self, mocker, db, crud_session, random_user) -> None:
+        mocker.patch("app.db.session_purge.session_scope", nullcontext)
+        purge = SessionPurge(interval=60, batch_size=2, logged_out_retention=3600, token_lifetime=86400)
+        create_sessions(crud_session, random_user.id, ConstantSessionStatus.logged_in, timedelta(days=2), 3)
+        create_sessions(crud_session, random_user.id, ConstantSessionStatus.logged_out, timedelta(hours=2), 2)
+        # kept: logged in and not expired, logged out within the retention window
+        create_sessions(crud_session, random_user.id, ConstantSessionStatus.logged_in, timedelta(hours=2), 1)
+        create_sessions(crud_session, random_user.id, ConstantSessionStatus.logged_out, timedelta(minutes=5), 1)
+
+        assert purge.purge(NOW) == {"expired": 3, "logged_out": 2}
+        assert db.query(Session).count() == 2
+        assert purge.purge(NOW) == {"expired": 0, "logged_out": 0}
+        stats = purge.stats()
+        assert (stats["runs"], stats["batches"], stats["failures"]) == (2, 3, 0)
+        assert stats["purged"] == {"expired": 3, "logged_out": 2}
+        assert stats["last_run"] == NOW
+
+    def test_successful_write_prometheus_text(self) -> None:
+        purge = SessionPurge(interval=60, batch_size=2, logged_out_retention=3600, token_lifetime=86400)
+        purge.purged.labels("expired").inc(5)
+        writer = PrometheusWriter()
+
+        write_session_purge_metrics(writer, purge)
+        lines = writer.text().splitlines()
+
+        assert 'db_sessions_purged_total{reason="expired"} 5' in lines
+        assert 'db_sessions_purged_total{reason="logged_out"} 0' in lines
+        assert "db_session_purges_total 0" in lines
+
+    def test_successful_start_and_stop(self, mocker) -> None:
+        purge = SessionPurge(interval=0.01, batch_size=2, logged_out_retention=3600, token_lifetime=86400)
+        mocked_purge = mocker.patch.object(purge, "purge")
+
+        async def run() -> None:
+            await purge.start()
+            await asyncio.sleep(0.1)
+            await purge.stop()
+
+        asyncio.run(run())
+
+        assert mocked_purge.called
+        assert purge._task is None
+
+    def test_successful_skip_start_disabled(self) -> None:
+        purge = SessionPurge(interval=0, batch_size=2, logged_out_retention=3600, token_lifetime=86400)
+
+        asyncio.run(purge.start())
+
+        assert purge._task is None
@@ -1,11 +1,14 @@
 import pytest
+from fastapi import Response
 from pytest_mock import MockFixture
 from sqlalchemy.exc import DataError, ProgrammingError
 from sqlalchemy.orm import Session
 
+from app.api.dependencies import CursorPagination, SearchPagination
 from app.crud.crud_employer import employer
-from app.tests.utils.base import random_string
-from app.utils.exceptions.common_exceptions import HTTPNotFoundException
+from app.db.models import Employee, EmployeeAccount, EmployerPaymentMethod
+from app.tests.utils.base import mssql_only, random_string
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
 
 
 class TestCRUDCreateEmployer:
@@ -29,6 +32,7 @@ class TestCRUDCreateEmployer:
     def test_success_create_employer_is_flush(
         self,
         crud_employer,
+        random_employers,
         employer_data,
         db: Session,
         monkeypatch,
@@ -85,6 +89,7 @@ class TestCRUDGetEmployer:
         spy_employer_get.assert_called_once_with(random_employer.id)
         assert random_employer == employer_in_db
 
+    @mssql_only
     def test_failed_get_employer(
         self,
         crud_employer,
@@ -98,6 +103,49 @@ class TestCRUDGetEmployer:
         with pytest.raises(DataError):
             employer.get(random_employer.name)
 
+    def test_successful_get_employer_include(
+        self,
+        crud_employer,
+        random_employers,
+        random_user,
+        db: Session,
+        query_budget,
+    ) -> None:
+        for employer_in_db in random_employers:
+            employer_in_db.employer_payment_methods = [EmployerPaymentMethod(iban=random_string())]
+            employer_in_db.employees = [
+                Employee(
+                    fullname=random_string(),
+                    user_id=random_user.id,
+                    employee_accounts=[EmployeeAccount(name=random_string()) for _ in range(2)],
+                )
+                for _ in range(3)
+            ]
+        db.flush()
+        db.expire_all()
+
+        with query_budget(4):
+            employers_in_db = crud_employer.get_multi(
+                include=["employees.employee_accounts", "employer_payment_methods"]
+            )
+            accounts = [
+                account
+                for employer_in_db in employers_in_db
+                for employee in employer_in_db.employees
+                for account in employee.employee_accounts
+                if employee.user and employer_in_db.user and employer_in_db.employer_payment_methods
+            ]
+
+        assert len(accounts) == 18
+
+    def test_failed_get_employer_include(
+        self,
+        crud_employer,
+        random_employer,
+    ) -> None:
+        with pytest.raises(HTTPBadRequestException):
+            crud_employer.get(random_employer.id, ["employee_accounts"])
+
 
 class TestCRUDGetMultipleEmployers:
     def test_successful_get_multiple_employers(
@@ -122,6 +170,7 @@ class TestCRUDGetMultipleEmployers:
         for created_employer in random_employers:
             assert created_employer in employers_in_db
 
+    @mssql_only
     def test_failed_get_multiple_employers(
         self,
         crud_employer,
@@ -199,6 +248,7 @@ class TestCRUDGetEmployerByAttribute:
         )
         assert random_employer == employer_in_db
 
+    @mssql_only
     def test_failed_get_employer_by_employer_attribute(
         self,
         crud_employer,
@@ -274,6 +324,29 @@ class TestCRUDSearchEmployerByParameter:
                 parameter="name", keyword=random_employer.address
             )
 
+    def test_successful_search_employers_by_user_parameter_past_first_page(
+        self,
+        crud_employer,
+        random_employers,
+    ) -> None:
+        def search_page(after=None):
+            pagination = SearchPagination(
+                Response(), after=after, limit=2, order_by="rank", parameter="email", keyword=".com"
+            )
+            employers = pagination.paginate(
+                crud_employer.search_by_parameter(
+                    parameter="email", keyword=".com", limit=pagination.fetch_limit, after=after, order_by="rank"
+                )
+            )
+            return employers, pagination.response.headers.get(CursorPagination.header)
+
+        first_page, cursor = search_page()
+        second_page, last_cursor = search_page(cursor)
+
+        assert first_page == random_employers[:2]
+        assert second_page == random_employers[2:]
+        assert last_cursor is None
+
 
 class TestCRUDUpdateEmployer:
     def test_successful_update_employer(
@@ -340,6 +413,7 @@ class TestCRUDDeleteEmployer:
         spy_employer_delete.assert_called_once_with(id=random_employer.id)
         assert not employer_in_db
 
+    @mssql_only
     def test_failed_delete_employer(
         self,
         crud_employer,
@@ -1,3 +1,4 @@
+import asyncio
 from importlib import reload
 
 from pytest_mock import MockerFixture
@@ -38,7 +39,7 @@ class TestEndpointCreateEmployer:
                 "employer_type_id": expected_employer.employer_type_id,
             }
         )
-        actual_result = endpoints.create_employer(employer_in, session)
+        actual_result = asyncio.run(endpoints.create_employer(employer_in, session))
 
         mocked_employer_create.assert_called_once_with(employer_in, session)
         assert actual_result == expected_employer
@@ -61,11 +62,11 @@ class TestEndpointGetEmployer:
         )
 
         actual_result = endpoints.fetch_employer(
-            expected_employer.id, session
+            expected_employer.id, "employees,employer_payment_methods", session
         )
 
         mocked_employer_fetch_one.assert_called_once_with(
-            expected_employer.id, session
+            expected_employer.id, session, ["employees", "employer_payment_methods"]
         )
         assert actual_result == expected_employer
 
@@ -74,6 +75,7 @@ class TestEndpointGetMultipleEmployers:
     def test_successful_get_multiple_employers(
         self,
         session,
+        pagination,
         expected_employers,
         monkeypatch,
         mocker: MockerFixture,
@@ -86,9 +88,11 @@ class TestEndpointGetMultipleEmployers:
             return_value=expected_employers,
         )
 
-        actual_result = endpoints.fetch_employers(session)
+        actual_result = endpoints.fetch_employers(None, session, pagination)
 
-        mocked_employer_fetch_all.assert_called_once_with(session)
+        mocked_employer_fetch_all.assert_called_once_with(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by, []
+        )
         assert actual_result == expected_employers
 
 
@@ -96,6 +100,7 @@ class TestEndpointSearchEmployerByParameter:
     def test_successful_search_employers_by_parameter(
         self,
         session,
+        pagination,
         expected_employer,
         monkeypatch,
         mocker: MockerFixture,
@@ -110,11 +115,11 @@ class TestEndpointSearchEmployerByParameter:
 
         parameter = "edrpou"
         actual_result = endpoints.search_employers(
-            parameter, expected_employer.edrpou, 1, session
+            parameter, expected_employer.edrpou, 1, session, pagination
         )
 
         mocked_employer_search.assert_called_once_with(
-            parameter, expected_employer.edrpou, 1, session
+            parameter, expected_employer.edrpou, 2, session, pagination.after, pagination.order_by
         )
         assert expected_employer in actual_result
 
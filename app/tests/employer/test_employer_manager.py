@@ -1,9 +1,10 @@
+import asyncio
 from copy import copy
 
 import pytest
 from pytest_mock import MockerFixture
 
-from app.db.models import Employer, User
+from app.db.models import Employer, Role, User
 from app.manager.manager_employer import employer
 from app.schemas.schema_employer import EmployerCreate, EmployerUpdate
 from app.tests.utils.base import random_integer
@@ -22,12 +23,12 @@ class TestManagerCreateEmployer:
     ) -> None:
         mocker.patch("app.crud.crud_user.user.get_by_attribute", return_value=False)
         mocker.patch(
-            "app.crud.crud_role.role.get_by_attribute",
-            return_value=expected_role,
+            "app.manager.manager_employer.reference_data.get_by_name",
+            side_effect=lambda model, name: expected_role if model is Role else expected_status_type,
         )
         mocker.patch(
-            "app.crud.crud_status_type.status_type.get_by_attribute",
-            return_value=expected_status_type,
+            "app.manager.manager_employer.password_hasher.hash",
+            return_value="hashed_password",
         )
         mocker.patch(
             "app.crud.crud_user.user.create",
@@ -50,8 +51,8 @@ class TestManagerCreateEmployer:
 
         employer_in_data = copy(employer_data)
         employer_in_data["user"] = user_create_data
-        actual_result = employer.create(
-            EmployerCreate(**employer_in_data), session
+        actual_result = asyncio.run(
+            employer.create(EmployerCreate(**employer_in_data), session)
         )
 
         employer_data["user_id"] = expected_employer.user_id
@@ -75,7 +76,7 @@ class TestManagerCreateEmployer:
         employer_data.pop("user_id")
         employer_data["user"] = user_create_data
         with pytest.raises(HTTPBadRequestException):
-            employer.create(EmployerCreate(**employer_data), session)
+            asyncio.run(employer.create(EmployerCreate(**employer_data), session))
 
 
 class TestManagerGetEmployer:
@@ -92,7 +93,7 @@ class TestManagerGetEmployer:
 
         actual_result = employer.fetch_one(expected_employer.id, session)
 
-        mocked_employer_get.assert_called_once_with(expected_employer.id)
+        mocked_employer_get.assert_called_once_with(expected_employer.id, ())
         assert actual_result == expected_employer
 
 
@@ -132,7 +133,7 @@ class TestManagerSearchEmployerByParameter:
         )
 
         mocked_employer_search.assert_called_once_with(
-            parameter, expected_employer.name, 1
+            parameter, expected_employer.name, 1, after=None, order_by="id"
         )
         assert expected_employer in actual_result
 
@@ -190,6 +191,7 @@ class TestManagerUpdateEmployer:
         mocker,
         monkeypatch,
     ) -> None:
+        expected_employer.user_id = random_user.id + 1
         mocker.patch(
             "app.manager.manager_employer.employer.crud.get",
             return_value=expected_employer,
@@ -0,0 +1,115 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+from pytest_mock import MockerFixture
+
+from app.db.models import AccountType
+from app.manager.manager_roster import roster
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
+
+ROSTER_HEADER = "email,phone,password,fullname,account_name,account_number,account_is_default,account_issuer," \
+                "account_deactivation_date,account_type_id"
+
+
+class TestManagerRoster:
+    def test_successful_validate_roster(self, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "app.crud.crud_user.user.get_ids_by_attribute",
+            return_value={"existing@mail.com": 1},
+        )
+        mocker.patch(
+            "app.manager.manager_roster.reference_data.get",
+            side_effect=lambda model, obj_id: AccountType(id=1) if obj_id == 1 else None,
+        )
+        lines = [
+            (2, {"email": "new@mail.com", "password": "Password1!", "fullname": "John Doe", "account_name": "PB",
+                 "account_number": "1", "account_is_default": "true", "account_issuer": "PB",
+                 "account_deactivation_date": "2100-01-01", "account_type_id": "1"}),
+            (3, {"email": "new@mail.com", "password": "Password1!", "fullname": "Jane Doe"}),
+            (4, {"email": "invalid", "password": "Password1!", "fullname": "Jane Doe"}),
+            (5, {"email": "weak@mail.com", "fullname": "Jane Doe", "password": "password"}),
+            (6, {"email": "account@mail.com", "password": "Password1!", "fullname": "Jane Doe", "account_name": "PB",
+                 "account_number": "1", "account_is_default": "true", "account_issuer": "PB",
+                 "account_deactivation_date": "2100-01-01", "account_type_id": "2"}),
+            (7, {"email": "nopassword@mail.com", "fullname": "Jane Doe", "password": ""}),
+            (8, {"email": "existing@mail.com", "password": "Password1!", "fullname": "Jane Doe", "passport": ""}),
+        ]
+        results = []
+
+        rows = roster.validate_batch(lines, 1, set(), results)
+
+        assert [result.row for result, _, _ in rows] == [2]
+        employee, account = rows[0][1:]
+        assert (employee.user.email, employee.employer_id, account.account_type_id) == ("new@mail.com", 1, 1)
+        assert [result.row for result in results] == [3, 4, 5, 6, 7, 8]
+        assert results[0].errors == ["Email new@mail.com is used more than once"]
+        assert results[1].errors == ["user.email: value is not a valid email address"]
+        assert results[3].errors == ["AccountType with id 2 not found"]
+        assert results[4].errors == ["user.password: field required"]
+        assert results[5].errors == ["Account with email existing@mail.com already exists"]
+
+    def test_successful_upload_roster(self, session, mocker: MockerFixture) -> None:
+        mocker.patch("app.crud.crud_employer.employer.get_missing_ids", return_value=[])
+        mocker.patch("app.crud.crud_user.user.get_ids_by_attribute", return_value={})
+        mocked_hash_many = mocker.patch(
+            "app.manager.manager_roster.password_hasher.hash_many",
+            return_value=["first_hash", "second_hash"],
+        )
+        mocked_insert_batch = mocker.patch(
+            "app.manager.manager_roster.roster.insert_batch",
+            side_effect=lambda rows, password_hashes: [setattr(result, "is_created", True) for result, _, _ in rows],
+        )
+        file = UploadFile(
+            "roster.csv",
+            io.BytesIO(
+                f"{ROSTER_HEADER}\n"
+                "first@mail.com,,Password1!,John Doe,,,,,,\n"
+                "second@mail.com,,Password1@,Jane Doe,,,,,,\n"
+                "invalid,,Password1!,Jane Doe,,,,,,\n".encode()
+            ),
+        )
+
+        actual_result = asyncio.run(roster.upload(1, file, session))
+
+        mocked_hash_many.assert_called_once_with(["Password1!", "Password1@"])
+        assert mocked_insert_batch.call_args.args[1] == ["first_hash", "second_hash"]
+        assert (actual_result.created, actual_result.rejected) == (2, 1)
+        assert [result.row for result in actual_result.rows] == [2, 3, 4]
+
+    def test_failed_upload_roster_employer_not_found(self, session, mocker: MockerFixture) -> None:
+        mocker.patch("app.crud.crud_employer.employer.get_missing_ids", return_value=[1])
+
+        with pytest.raises(HTTPNotFoundException):
+            asyncio.run(roster.upload(1, UploadFile("roster.csv", io.BytesIO(b"")), session))
+
+    @pytest.mark.parametrize(
+        "content, detail",
+        [
+            (
+                f"{ROSTER_HEADER}\nfirst@mail.com,,Password1!,John Doe,,,,,,\nsecond@mail.com,,Password1!,"
+                "Jos\u00e9 Doe,,,,,,\n".encode("latin-1"),
+                "Roster file is not UTF-8 encoded in line 3",
+            ),
+            (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "Roster file is not UTF-8 encoded in line 1"),
+            (
+                f'{ROSTER_HEADER}\nfirst@mail.com,,Password1!,"John" Doe,,,,,,\n'.encode(),
+                "Invalid CSV in line 2 of roster file: ',' expected after '\"'",
+            ),
+            (b"", "Roster file header misses columns: email, password, fullname"),
+            (b"email,phone,fullname\n", "Roster file header misses columns: password"),
+            (f"{ROSTER_HEADER}\n".encode(), "Roster file has no rows"),
+        ],
+    )
+    def test_failed_upload_roster_invalid_file(self, session, content, detail, mocker: MockerFixture) -> None:
+        mocker.patch("app.crud.crud_employer.employer.get_missing_ids", return_value=[])
+        mocker.patch("app.crud.crud_user.user.get_ids_by_attribute", return_value={})
+        mocker.patch("app.manager.manager_roster.password_hasher.hash_many", return_value=["hashed_password"])
+        mocked_insert_batch = mocker.patch("app.manager.manager_roster.roster.insert_batch")
+
+        with pytest.raises(HTTPBadRequestException) as exc_info:
+            asyncio.run(roster.upload(1, UploadFile("roster.csv", io.BytesIO(content)), session))
+
+        assert exc_info.value.detail == detail
+        mocked_insert_batch.assert_not_called()
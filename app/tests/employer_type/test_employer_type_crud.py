@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.crud.crud_employer_type import employer_type
 from app.schemas.schema_employer_type import EmployerTypeCreate, EmployerTypeUpdate
-from app.tests.utils.base import random_string
+from app.tests.utils.base import mssql_only, random_string
 
 
 class TestCRUDCreateEmployerType:
@@ -48,6 +48,7 @@ class TestCRUDCreateEmployerType:
     def test_success_create_employer_type_is_flush(
         self,
         crud_employer_type,
+        random_employer_types,
         db: Session,
         monkeypatch,
         mocker: MockFixture,
@@ -109,6 +110,7 @@ class TestCRUDGetEmployerType:
         spy_employer_type_get.assert_called_once_with(random_employer_type.id)
         assert employer_type_in_db == random_employer_type
 
+    @mssql_only
     def test_failed_get_employer_type(
         self,
         crud_employer_type,
@@ -144,6 +146,7 @@ class TestCRUDGetMultipleEmployerTypes:
         for random_employer_type in random_employer_types:
             assert random_employer_type in employer_types_in_db
 
+    @mssql_only
     def test_failed_get_multiple_employer_types(
         self,
         crud_employer_type,
@@ -183,6 +186,7 @@ class TestCRUDGetEmployerTypeByAttribute:
         )
         assert employer_type_in_db == random_employer_type
 
+    @mssql_only
     def test_failed_get_employer_type_by_attribute(
         self,
         crud_employer_type,
@@ -348,6 +352,7 @@ class TestCRUDDeleteEmployerType:
         spy_employer_type_delete.assert_called_once_with(random_employer_type.id)
         assert not employer_type_in_db
 
+    @mssql_only
     def test_failed_delete_employer_type(
         self,
         crud_employer_type,
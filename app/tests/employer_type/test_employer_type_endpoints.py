@@ -60,6 +60,7 @@ class TestEndpointGetMultipleEmployerTypes:
     def test_successful_get_multiple_employer_type(
         self,
         session,
+        pagination,
         expected_employer_types,
         monkeypatch,
         mocker: MockerFixture,
@@ -72,9 +73,11 @@ class TestEndpointGetMultipleEmployerTypes:
             return_value=expected_employer_types,
         )
 
-        actual_result = endpoints.fetch_employer_types(session)
+        actual_result = endpoints.fetch_employer_types(session, pagination)
 
-        mocked_employer_type_fetch_all.assert_called_once_with(session)
+        mocked_employer_type_fetch_all.assert_called_once_with(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by
+        )
         assert actual_result == expected_employer_types
 
 
@@ -82,6 +85,7 @@ class TestEndpointSearchEmployerTypeByParameter:
     def test_successful_search_employer_types_by_parameter(
         self,
         session,
+        pagination,
         expected_employer_type,
         monkeypatch,
         mocker: MockerFixture,
@@ -96,11 +100,11 @@ class TestEndpointSearchEmployerTypeByParameter:
 
         parameter = "name"
         actual_result = endpoints.search_employer_types(
-            parameter, expected_employer_type.name, 1, session
+            parameter, expected_employer_type.name, 1, session, pagination
         )
 
         mocked_employer_type_search.assert_called_once_with(
-            parameter, expected_employer_type.name, 1, session
+            parameter, expected_employer_type.name, 2, session, pagination.after, pagination.order_by
         )
         assert expected_employer_type in actual_result
 
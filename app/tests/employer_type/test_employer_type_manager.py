@@ -33,13 +33,13 @@ class TestManagerGetEmployerType:
         mocker: MockerFixture,
     ) -> None:
         mocked_employer_type_get = mocker.patch(
-            "app.manager.manager_employer_type.employer_type.crud.get",
+            "app.manager.manager_reference.reference_data.get",
             return_value=expected_employer_type,
         )
 
         actual_result = employer_type.fetch_one(expected_employer_type.id, session)
 
-        mocked_employer_type_get.assert_called_once_with(expected_employer_type.id)
+        mocked_employer_type_get.assert_called_once_with(EmployerType, expected_employer_type.id)
         assert actual_result == expected_employer_type
 
 
@@ -51,7 +51,7 @@ class TestManagerGetMultipleEmployerTypes:
         mocker: MockerFixture,
     ) -> None:
         mocked_employer_type_get_multi = mocker.patch(
-            "app.manager.manager_employer_type.employer_type.crud.get_multi",
+            "app.manager.manager_reference.reference_data.get_all",
             return_value=expected_employer_types,
         )
 
@@ -79,7 +79,7 @@ class TestManagerSearchEmployerTypeByParameter:
         )
 
         mocked_employer_type_search.assert_called_once_with(
-            parameter, expected_employer_type.name, 1
+            parameter, expected_employer_type.name, 1, after=None, order_by="id"
         )
         assert expected_employer_type in actual_result
 
@@ -0,0 +1,87 @@
+import zlib
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import skip_compression
+from app.middleware.middleware_compression import CompressionMiddleware, negotiate
+from app.utils.http_metrics import CompressionMetrics
+
+ROWS = [b'{"id":%d,"name":"row %d"}\n' % (i, i) for i in range(200)]
+
+
+def create_client(metrics: CompressionMetrics) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    def fetch_items() -> list:
+        return [{"id": i, "name": f"item {i}"} for i in range(100)]
+
+    @app.get("/items/1")
+    def fetch_item() -> dict:
+        return {"id": 1}
+
+    @app.get("/export")
+    def export_items():
+        chunks = (b"".join(ROWS[i:i + 50]) for i in range(0, len(ROWS), 50))
+        return StreamingResponse(chunks, media_type="text/csv")
+
+    @app.get("/raw", dependencies=[Depends(skip_compression)])
+    def fetch_raw():
+        return PlainTextResponse("x" * 5000)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, metrics=metrics)
+    return TestClient(app)
+
+
+def raw_body(response) -> bytes:
+    return b"".join(response.raw.stream(1024, decode_content=False))
+
+
+class TestCompression:
+    def test_successful_compress_response(self) -> None:
+        metrics = CompressionMetrics()
+        client = create_client(metrics)
+
+        response = client.get("/items", headers={"Accept-Encoding": "gzip"}, stream=True)
+        body = raw_body(response)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Content-Length"] == str(len(body))
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert zlib.decompress(body, 31).startswith(b'[{"id":0,"name":"item 0"}')
+        stats = metrics.stats()["encodings"]["gzip"]
+        assert (stats["responses"], stats["encoded_bytes"]) == (1, len(body))
+        assert stats["saved_bytes"] > 0
+
+    def test_successful_compress_streamed_response(self) -> None:
+        metrics = CompressionMetrics()
+        client = create_client(metrics)
+
+        response = client.get("/export", headers={"Accept-Encoding": "gzip"}, stream=True)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert zlib.decompress(raw_body(response), 31) == b"".join(ROWS)
+        assert metrics.stats()["encodings"]["gzip"]["identity_bytes"] == len(b"".join(ROWS))
+
+    def test_successful_skip_compression(self) -> None:
+        metrics = CompressionMetrics()
+        client = create_client(metrics)
+
+        small = client.get("/items/1", headers={"Accept-Encoding": "gzip"})
+        opted_out = client.get("/raw", headers={"Accept-Encoding": "gzip"})
+        not_accepted = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+        assert "Content-Encoding" not in small.headers
+        assert "Content-Encoding" not in opted_out.headers
+        assert "Content-Encoding" not in not_accepted.headers
+        assert metrics.stats() == {"encodings": {}, "skipped": {"route": 1, "size": 1}}
+
+    def test_successful_negotiate(self) -> None:
+        assert negotiate("gzip, br", ("br", "gzip")) == "br"
+        assert negotiate("gzip;q=1.0, br;q=0.5", ("br", "gzip")) == "gzip"
+        assert negotiate("*", ("gzip",)) == "gzip"
+        assert negotiate("br, gzip;q=0", ("gzip",)) is None
+        assert negotiate("", ("gzip",)) is None
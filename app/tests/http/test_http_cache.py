@@ -0,0 +1,89 @@
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.api.dependencies import HTTPCache, ReferenceETag, get_session
+from app.constansts.constants_role import ConstantRole
+from app.db.models import Role
+from app.middleware.middleware_etag import ETagMiddleware
+from app.security.permissions import permission
+from app.security.principal import Principal
+from app.utils.etag import etag_matches
+from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+
+
+def create_client(mocker, role: str = ConstantRole.admin) -> TestClient:
+    mocker.patch("app.api.dependencies.reference_data.etag", return_value='W/"role-1"')
+    fetch_all = mocker.Mock(return_value={"name": "admin"})
+    router = InferringRouter(
+        route_class=ExceptionRouteHandler,
+        dependencies=[Depends(HTTPCache("private, no-cache"))],
+    )
+
+    @router.get("/items/{item_id}")
+    def fetch_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @router.get("/items")
+    def export_items():
+        return StreamingResponse(iter([b"1\n", b"2\n"]), headers={"Cache-Control": "private, no-cache"})
+
+    @router.get("/roles", dependencies=[Depends(ReferenceETag(Role))])
+    @permission({ConstantRole.admin})
+    def fetch_roles(session: Principal = Depends(get_session)) -> dict:
+        return fetch_all()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ETagMiddleware)
+    app.dependency_overrides[get_session] = lambda: Principal(
+        id=1, token="token", status="logged_in", user_id=1, role=role
+    )
+    client = TestClient(app)
+    client.fetch_all = fetch_all
+    return client
+
+
+class TestHTTPCache:
+    def test_successful_content_etag(self, mocker) -> None:
+        client = create_client(mocker)
+
+        response = client.get("/items/1")
+        not_modified = client.get("/items/1", headers={"If-None-Match": response.headers["ETag"]})
+
+        assert response.headers["ETag"].startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        assert (not_modified.status_code, not_modified.content) == (304, b"")
+        assert not_modified.headers["ETag"] == response.headers["ETag"]
+        assert client.get("/items/2", headers={"If-None-Match": response.headers["ETag"]}).status_code == 200
+
+    def test_successful_skip_streamed_response(self, mocker) -> None:
+        response = create_client(mocker).get("/items", headers={"If-None-Match": "*"})
+
+        assert (response.status_code, response.content) == (200, b"1\n2\n")
+        assert "ETag" not in response.headers
+
+    def test_successful_reference_etag(self, mocker) -> None:
+        client = create_client(mocker)
+        assert client.get("/roles").headers["ETag"] == 'W/"role-1"'
+
+        response = client.get("/roles", headers={"If-None-Match": 'W/"other", "role-1"'})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == 'W/"role-1"'
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        client.fetch_all.assert_called_once()
+
+    def test_failed_reference_etag_forbidden(self, mocker) -> None:
+        client = create_client(mocker, role=ConstantRole.employee)
+
+        response = client.get("/roles", headers={"If-None-Match": 'W/"role-1"'})
+
+        assert response.status_code == 403
+
+    def test_successful_etag_matches(self) -> None:
+        assert etag_matches('"abc"', 'W/"abc"')
+        assert etag_matches("*", 'W/"abc"')
+        assert not etag_matches(None, 'W/"abc"')
+        assert not etag_matches('W/"abd"', 'W/"abc"')
@@ -0,0 +1,37 @@
+from fastapi import Response
+
+from app.api.dependencies import CursorPagination, SearchPagination
+from app.db.models import Bank, Role
+from app.db.search_index import page_ids
+from app.utils.pagination import SEARCH_RANK, encode_cursor
+
+
+class TestCursorPagination:
+    def test_successful_set_cursor_of_next_page(self) -> None:
+        pagination = CursorPagination(Response(), after=None, limit=2, order_by="id")
+        roles = [Role(id=i, name=f"role {i}") for i in range(1, 4)]
+
+        page = pagination.paginate(roles[:pagination.fetch_limit])
+
+        assert page == roles[:2]
+        assert pagination.response.headers[CursorPagination.header] == encode_cursor("id", 2, 2)
+
+    def test_successful_skip_cursor_of_last_full_page(self) -> None:
+        pagination = CursorPagination(Response(), after=None, limit=2, order_by="id")
+        roles = [Role(id=i, name=f"role {i}") for i in range(1, 3)]
+
+        assert pagination.paginate(roles) == roles
+        assert CursorPagination.header not in pagination.response.headers
+
+    def test_successful_set_rank_cursor_of_next_page(self) -> None:
+        pagination = SearchPagination(Response(), after=None, limit=2, order_by=SEARCH_RANK, parameter="name",
+                                      keyword="Bank")
+        banks = [Bank(id=3, name="Bank"), Bank(id=4, name="Bank of Kyiv"), Bank(id=1, name="Privat Bank")]
+        hits = [(bank.id, bank.name.lower()) for bank in banks]
+
+        page = pagination.paginate(banks)
+        cursor = pagination.response.headers[CursorPagination.header]
+
+        assert page == banks[:2]
+        assert cursor == encode_cursor(SEARCH_RANK, [1, len("bank of kyiv")], 4)
+        assert page_ids(hits, "Bank", limit=2, after=cursor) == [1]
@@ -0,0 +1,61 @@
+from anyio.abc import CapacityLimiter
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.middleware.middleware_metrics import MetricsMiddleware
+from app.utils.exceptions.common_exceptions import HTTPNotFoundException
+from app.utils.exceptions.exception_route_handler import ExceptionRouteHandler
+from app.utils.http_metrics import HTTPMetrics
+from app.utils.prometheus import PrometheusWriter, write_http_metrics, write_threadpool_metrics
+
+
+class TestHTTPMetrics:
+    def test_successful_record_route_metrics(self, mocker) -> None:
+        metrics = HTTPMetrics()
+        mocker.patch("app.utils.exceptions.exception_route_handler.http_metrics", metrics)
+        router = InferringRouter(route_class=ExceptionRouteHandler)
+
+        @router.get("/items/{item_id}")
+        def fetch_item(item_id: int) -> dict:
+            if item_id > 1:
+                raise HTTPNotFoundException("Item", item_id)
+            return {"id": item_id}
+
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        client = TestClient(app)
+
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/unknown")
+
+        assert [(labels["route"], labels["status"], counter.value) for labels, counter in metrics.requests.items()] == [
+            ("/items/{item_id}", "200", 1),
+            ("/items/{item_id}", "404", 1),
+            ("unmatched", "404", 1),
+        ]
+        assert metrics.duration.labels("GET", "/items/{item_id}").count == 2
+        assert metrics.response_size.labels("GET", "/items/{item_id}").sum == len(b'{"id":1}') + len(
+            b'{"detail":"Item with id 2 not found"}'
+        )
+        assert metrics.exceptions.labels("GET", "/items/{item_id}", "HTTPNotFoundException").value == 1
+        assert metrics.in_flight.value == 0
+
+    def test_successful_write_prometheus_text(self, mocker) -> None:
+        metrics = HTTPMetrics()
+        metrics.observe("GET", "/items/{item_id}", 200, 0.003, 512)
+        limiter = mocker.Mock(spec=CapacityLimiter)
+        limiter.statistics.return_value = mocker.Mock(total_tokens=40, borrowed_tokens=3, tasks_waiting=1)
+        writer = PrometheusWriter()
+
+        write_http_metrics(writer, metrics)
+        write_threadpool_metrics(writer, limiter, mocker.Mock(workers=2, pending=0))
+        lines = writer.text().splitlines()
+
+        assert "# TYPE http_request_duration_seconds histogram" in lines
+        assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 1' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",le="0.005"} 1' in lines
+        assert 'http_response_size_bytes_bucket{method="GET",route="/items/{item_id}",le="100"} 0' in lines
+        assert "threadpool_threads_busy 3" in lines and "threadpool_tasks_waiting 1" in lines
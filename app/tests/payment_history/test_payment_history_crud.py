@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import select
+
+from app.constansts.constants_payment_type import ConstantPaymentType
+from app.db.models import PaymentHistory
+
+
+def payments(crud_payment_history) -> List[Tuple[int, int, int, int, date, str]]:
+    return crud_payment_history.session.execute(
+        select(
+            PaymentHistory.employee_account_id,
+            PaymentHistory.employer_payment_method_id,
+            PaymentHistory.amount,
+            PaymentHistory.payment_status_type_id,
+            PaymentHistory.run_date,
+            PaymentHistory.payment_type,
+        ).order_by(PaymentHistory.id)
+    ).all()
+
+
+class TestCRUDPaymentHistoryPayroll:
+    @staticmethod
+    def create_payroll(crud_payment_history, payroll, run_date=None, payment_type=None, employer_id=None,
+                       creation_date=datetime(2022, 1, 10, 9)) -> int:
+        return crud_payment_history.create_payroll(
+            employer_id, run_date or payroll.run_date, payment_type, 100, payroll.status_in_process.id, creation_date
+        )
+
+    def test_successful_pay_latest_default_active_account_and_latest_active_method(
+        self, crud_payment_history, payroll
+    ) -> None:
+        count = self.create_payroll(crud_payment_history, payroll)
+
+        assert count == 1
+        assert payments(crud_payment_history) == [
+            (payroll.paid_account.id, payroll.salary_method.id, 100, payroll.status_in_process.id, payroll.run_date,
+             "salary")
+        ]
+
+    def test_successful_skip_employees_without_account_or_method(self, crud_payment_history, payroll) -> None:
+        summary = crud_payment_history.get_payroll_summary(None, payroll.run_date, None)
+
+        assert summary == {
+            "employers": 2,
+            "employees": 3,
+            "payments": 1,
+            "skipped_no_account": 1,
+            "skipped_no_payment_method": 1,
+            "skipped_already_paid": 0,
+        }
+
+    def test_successful_pay_nobody_twice_for_same_run_date(self, crud_payment_history, payroll) -> None:
+        self.create_payroll(crud_payment_history, payroll)
+
+        repeated = self.create_payroll(crud_payment_history, payroll, creation_date=datetime(2022, 1, 12, 9))
+        summary = crud_payment_history.get_payroll_summary(None, payroll.run_date, None)
+        next_month = self.create_payroll(
+            crud_payment_history, payroll, run_date=date(2022, 2, 10), creation_date=datetime(2022, 2, 10, 9)
+        )
+
+        assert repeated == 0
+        assert summary["payments"] == 0
+        assert summary["skipped_already_paid"] == 1
+        assert next_month == 1
+        assert [payment[-2:] for payment in payments(crud_payment_history)] == [
+            (payroll.run_date, "salary"),
+            (date(2022, 2, 10), "salary"),
+        ]
+
+    def test_successful_pay_salary_and_prepayment_due_on_same_day(self, crud_payment_history, payroll) -> None:
+        payroll.salary.prepayment_date = date(2021, 12, 10)
+        crud_payment_history.session.flush()
+
+        salary = self.create_payroll(crud_payment_history, payroll, payment_type=ConstantPaymentType.salary)
+        prepayment = self.create_payroll(crud_payment_history, payroll, payment_type=ConstantPaymentType.prepayment)
+        repeated = self.create_payroll(crud_payment_history, payroll)
+
+        assert (salary, prepayment, repeated) == (1, 1, 0)
+        assert [payment[-1] for payment in payments(crud_payment_history)] == ["salary", "prepayment"]
+
+    def test_successful_pay_all_payment_types_due_in_one_run(self, crud_payment_history, payroll) -> None:
+        payroll.salary.prepayment_date = date(2021, 12, 10)
+        crud_payment_history.session.flush()
+
+        summary = crud_payment_history.get_payroll_summary(None, payroll.run_date, None)
+        count = self.create_payroll(crud_payment_history, payroll)
+
+        assert (summary["employees"], summary["payments"]) == (3, 2)
+        assert count == 2
+        assert sorted(payment[-1] for payment in payments(crud_payment_history)) == ["prepayment", "salary"]
+
+    @pytest.mark.parametrize(
+        "run_date, payment_type, due",
+        [
+            (date(2022, 1, 10), None, ["salary", "prepayment"]),
+            (date(2022, 3, 10), None, ["salary", "prepayment"]),
+            (date(2022, 1, 10), ConstantPaymentType.salary, ["salary"]),
+            (date(2022, 1, 10), ConstantPaymentType.prepayment, ["prepayment"]),
+            (date(2022, 1, 25), None, ["salary", "prepayment", "other"]),
+            (date(2022, 1, 25), ConstantPaymentType.prepayment, ["salary"]),
+            (date(2022, 1, 11), None, []),
+        ],
+    )
+    def test_successful_select_employers_by_day_of_salary_or_prepayment_date(
+        self, crud_payment_history, payroll, run_date, payment_type, due
+    ) -> None:
+        rows = crud_payment_history.session.execute(crud_payment_history.payroll_query(None, run_date, payment_type))
+
+        assert {row.employer_id for row in rows} == {getattr(payroll, name).id for name in due}
+
+    def test_successful_select_employers_due_past_end_of_month(self, crud_payment_history, payroll) -> None:
+        payroll.other.salary_date = date(2021, 12, 31)
+        crud_payment_history.session.flush()
+
+        def employer_ids(run_date: date) -> List[int]:
+            rows = crud_payment_history.session.execute(crud_payment_history.payroll_query(None, run_date))
+            return sorted({row.employer_id for row in rows})
+
+        assert employer_ids(date(2022, 2, 28)) == [payroll.other.id]
+        assert employer_ids(date(2022, 2, 27)) == []
+        assert employer_ids(date(2022, 1, 31)) == [payroll.other.id]
+        assert employer_ids(date(2022, 1, 30)) == []
+
+    def test_successful_pay_employer_not_due_on_run_date(self, crud_payment_history, payroll) -> None:
+        count = self.create_payroll(crud_payment_history, payroll, employer_id=payroll.other.id)
+
+        assert count == 1
+        assert payments(crud_payment_history) == [
+            (payroll.other_account.id, payroll.other_method.id, 100, payroll.status_in_process.id, payroll.run_date,
+             "salary")
+        ]
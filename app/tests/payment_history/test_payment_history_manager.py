@@ -0,0 +1,54 @@
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import func, select
+
+from app.db.models import PaymentHistory
+from app.manager.manager_payment_history import payment_history
+from app.schemas.schema_payment_history import PayrollRunCreate
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+
+
+class TestManagerRunPayroll:
+    @pytest.fixture(autouse=True)
+    def status_in_process(self, payroll, mocker: MockerFixture) -> None:
+        mocker.patch(
+            "app.manager.manager_payment_history.reference_data.get_by_name",
+            return_value=payroll.status_in_process,
+        )
+
+    @staticmethod
+    def count_payments(db) -> int:
+        return db.execute(select(func.count(PaymentHistory.id))).scalar()
+
+    def test_successful_dry_run_same_summary_without_payments(self, session, db, payroll) -> None:
+        dry_run = payment_history.run_payroll(
+            PayrollRunCreate(run_date=payroll.run_date, amount=100, dry_run=True), session
+        )
+        assert self.count_payments(db) == 0
+
+        run = payment_history.run_payroll(PayrollRunCreate(run_date=payroll.run_date, amount=100), session)
+
+        ignored = {"dry_run", "duration"}
+        assert {key: value for key, value in dry_run.items() if key not in ignored} == {
+            key: value for key, value in run.items() if key not in ignored
+        }
+        assert run["payments"] == 1
+        assert run["amount_total"] == 100
+        assert self.count_payments(db) == 1
+
+    def test_successful_repeated_run_pays_nobody_twice(self, session, db, payroll) -> None:
+        obj_in = PayrollRunCreate(run_date=payroll.run_date, amount=100)
+        payment_history.run_payroll(obj_in, session)
+
+        repeated = payment_history.run_payroll(obj_in, session)
+
+        assert repeated["payments"] == 0
+        assert repeated["skipped_already_paid"] == 1
+        assert self.count_payments(db) == 1
+
+    def test_failed_run_payroll_without_in_process_status(self, session, db, payroll, mocker: MockerFixture) -> None:
+        mocker.patch("app.manager.manager_payment_history.reference_data.get_by_name", return_value=None)
+
+        with pytest.raises(HTTPBadRequestException):
+            payment_history.run_payroll(PayrollRunCreate(run_date=payroll.run_date, amount=100), session)
+        assert self.count_payments(db) == 0
@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 
 from app.crud.crud_role import role
 from app.schemas.schema_role import RoleCreate, RoleUpdate
-from app.tests.utils.base import random_string
+from app.tests.utils.base import mssql_only, random_string
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException, HTTPNotFoundException
+from app.utils.pagination import encode_cursor
 
 
 class TestCRUDCreateRole:
@@ -42,6 +44,7 @@ class TestCRUDCreateRole:
     def test_successful_create_role_is_flush(
         self,
         crud_role,
+        random_roles,
         db: Session,
         monkeypatch,
         mocker: MockFixture,
@@ -90,6 +93,7 @@ class TestCRUDGetRole:
         spy_role_get.assert_called_once_with(random_role.id)
         assert role_in_db == random_role
 
+    @mssql_only
     def test_failed_get_role(
         self,
         crud_role,
@@ -121,6 +125,35 @@ class TestCRUDGetMultipleRoles:
         for random_role in random_roles:
             assert random_role in roles_in_db
 
+    def test_successful_get_multiple_roles_after_cursor(
+        self,
+        crud_role,
+        random_roles,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(
+            "app.crud.crud_role.role.get_multi", crud_role.get_multi
+        )
+
+        first_role, *next_roles = sorted(random_roles, key=lambda obj: obj.id)
+        cursor = encode_cursor("id", first_role.id, first_role.id)
+        roles_in_db = role.get_multi(limit=len(next_roles), after=cursor)
+
+        assert roles_in_db == next_roles
+
+    def test_failed_get_multiple_roles_after_invalid_cursor(
+        self,
+        crud_role,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(
+            "app.crud.crud_role.role.get_multi", crud_role.get_multi
+        )
+
+        with pytest.raises(HTTPBadRequestException):
+            role.get_multi(after=random_string())
+
+    @mssql_only
     def test_failed_get_multiple_roles(
         self,
         crud_role,
@@ -154,6 +187,7 @@ class TestCRUDGetRoleByAttribute:
         spy_role_get_by_attribute.assert_called_once_with(name=random_role.name)
         assert role_in_db == random_role
 
+    @mssql_only
     def test_failed_get_role_by_attribute(
         self,
         crud_role,
@@ -289,6 +323,7 @@ class TestCRUDDeleteRole:
         spy_role_delete.assert_called_once_with(random_role.id)
         assert not role_in_db
 
+    @mssql_only
     def test_failed_delete_role(
         self,
         crud_role,
@@ -303,3 +338,75 @@ class TestCRUDDeleteRole:
 
         with pytest.raises(DataError):
             role.delete(random_role.name)
+
+
+class TestCRUDBulkRoles:
+    def test_successful_create_many_roles(
+        self,
+        crud_role,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_role.role.create_many", crud_role.create_many)
+        monkeypatch.setattr(
+            "app.crud.crud_role.role.get_multi_by_attribute", crud_role.get_multi_by_attribute
+        )
+
+        names = [random_string() for _ in range(3)]
+        count = role.create_many([RoleCreate(name=name) for name in names])
+        roles_in_db = role.get_multi_by_attribute("name", names)
+
+        assert count == 3
+        assert sorted(role_in_db.name for role_in_db in roles_in_db) == sorted(names)
+
+    def test_failed_create_many_roles(
+        self,
+        crud_role,
+        random_role,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_role.role.create_many", crud_role.create_many)
+
+        with pytest.raises(HTTPBadRequestException):
+            role.create_many([RoleCreate(name=random_role.name)])
+
+    def test_successful_update_many_roles(
+        self,
+        crud_role,
+        random_roles,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_role.role.update_many", crud_role.update_many)
+        monkeypatch.setattr("app.crud.crud_role.role.get", crud_role.get)
+
+        roles_in = [RoleUpdate(id=random_role.id, name=random_string()) for random_role in random_roles]
+        count = role.update_many(roles_in)
+
+        assert count == len(roles_in)
+        for role_in in roles_in:
+            assert role.get(role_in.id).name == role_in.name
+
+    def test_successful_delete_many_roles(
+        self,
+        crud_role,
+        random_roles,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_role.role.delete_many", crud_role.delete_many)
+        monkeypatch.setattr("app.crud.crud_role.role.get_missing_ids", crud_role.get_missing_ids)
+
+        ids = [random_role.id for random_role in random_roles]
+        count = role.delete_many(ids)
+
+        assert count == len(ids)
+        assert role.get_missing_ids(ids) == sorted(ids)
+
+    def test_failed_delete_many_roles(
+        self,
+        crud_role,
+        random_role,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_role.role.delete_many", crud_role.delete_many)
+
+        with pytest.raises(HTTPNotFoundException):
+            role.delete_many([random_role.id, random_role.id + 1000])
@@ -60,6 +60,7 @@ class TestEndpointGetMultipleRoles:
     def test_successful_get_multiple_roles(
         self,
         session,
+        pagination,
         expected_roles,
         monkeypatch,
         mocker: MockerFixture,
@@ -72,9 +73,11 @@ class TestEndpointGetMultipleRoles:
             return_value=expected_roles,
         )
 
-        actual_result = endpoints.fetch_roles(session)
+        actual_result = endpoints.fetch_roles(session, pagination)
 
-        mocked_role_fetch_all.assert_called_once_with(session)
+        mocked_role_fetch_all.assert_called_once_with(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by
+        )
         assert actual_result == expected_roles
 
 
@@ -82,6 +85,7 @@ class TestEndpointSearchRoleByParameter:
     def test_successful_search_roles_by_parameter(
         self,
         session,
+        pagination,
         expected_role,
         monkeypatch,
         mocker: MockerFixture,
@@ -98,11 +102,11 @@ class TestEndpointSearchRoleByParameter:
 
         parameter = "name"
         actual_result = endpoints.search_roles(
-            parameter, expected_role.name, 1, session
+            parameter, expected_role.name, 1, session, pagination
         )
 
         mocked_role_search.assert_called_once_with(
-            parameter, expected_role.name, 1, session
+            parameter, expected_role.name, 2, session, pagination.after, pagination.order_by
         )
         assert expected_role in actual_result
 
@@ -33,13 +33,13 @@ class TestManagerGetRole:
         mocker: MockerFixture,
     ) -> None:
         mocked_role_get = mocker.patch(
-            "app.manager.manager_role.role.crud.get",
+            "app.manager.manager_reference.reference_data.get",
             return_value=expected_role,
         )
 
         actual_result = role.fetch_one(expected_role.id, session)
 
-        mocked_role_get.assert_called_once_with(expected_role.id)
+        mocked_role_get.assert_called_once_with(Role, expected_role.id)
         assert actual_result == expected_role
 
 
@@ -51,7 +51,7 @@ class TestManagerGetMultipleRoles:
         mocker: MockerFixture,
     ) -> None:
         mocked_role_get_multi = mocker.patch(
-            "app.manager.manager_role.role.crud.get_multi",
+            "app.manager.manager_reference.reference_data.get_all",
             return_value=expected_roles,
         )
 
@@ -87,6 +87,8 @@ class TestManagerSearchRoleByParameter:
             parameter,
             expected_role.name,
             1,
+            after=None,
+            order_by="id",
         )
         assert expected_role in actual_result
 
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app.db.models import User
+from app.security.passwords import (PasswordHasher, hash_password,
+                                    verify_and_update_password)
+from app.utils.exceptions.common_exceptions import HTTPServiceUnavailableException
+
+
+class TestPasswordRehash:
+    def test_successful_keep_hash_with_same_cost(self) -> None:
+        is_valid, new_hash = verify_and_update_password("password", hash_password("password"))
+
+        assert is_valid
+        assert new_hash is None
+
+    def test_successful_rehash_with_other_cost(self) -> None:
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password")
+        is_valid, new_hash = verify_and_update_password("password", old_hash)
+
+        assert is_valid
+        assert new_hash is not None and new_hash != old_hash
+
+    def test_failed_verify_wrong_password(self) -> None:
+        assert verify_and_update_password("wrong", hash_password("password")) == (False, None)
+
+
+class TestPasswordHasher:
+    def test_failed_hash_over_max_pending(self) -> None:
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        hasher.pending = 1
+
+        with pytest.raises(HTTPServiceUnavailableException):
+            asyncio.run(hasher.hash("password"))
+        with pytest.raises(HTTPServiceUnavailableException):
+            asyncio.run(hasher.hash_many(["password"]))
+        assert hasher.rejected.value == 2
+        assert hasher.pending == 1
+
+    def test_failed_hash_many_admitted_by_passwords(self) -> None:
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        hasher.pending = 3
+
+        with pytest.raises(HTTPServiceUnavailableException):
+            asyncio.run(hasher.hash_many(["first", "second"]))
+        assert hasher.rejected.value == 2
+        assert hasher.pending == 3
+
+    def test_failed_login_over_max_pending_retry_after(self, app, mocker) -> None:
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        hasher.pending = 1
+        mocker.patch("app.manager.manager_auth.password_hasher", hasher)
+        mocker.patch("app.crud.user.get_by_attribute", return_value=User(id=1, password=hash_password("password")))
+
+        response = TestClient(app).post("/auth/login", data={"username": "user@example.com", "password": "password"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_successful_hash_many_in_process_pool(self) -> None:
+        hasher = PasswordHasher(workers=2, max_pending=4)
+        try:
+            hashes = asyncio.run(hasher.hash_many(["first", "second", "third"]))
+        finally:
+            hasher.shutdown()
+
+        assert [verify_and_update_password(p, h)[0] for p, h in zip(["first", "second", "third"], hashes)] == [
+            True, True, True
+        ]
+        assert (hasher.pending, hasher.completed.value) == (0, 3)
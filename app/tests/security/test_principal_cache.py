@@ -0,0 +1,152 @@
+from datetime import datetime
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.api.dependencies import get_session
+from app.constansts.constants_session import ConstantSessionStatus
+from app.db.models import Session
+from app.schemas.schema_session import SessionCreate
+from app.security.digest import token_digest
+from app.security.principal import (Principal, invalidate_principal,
+                                    invalidate_user_principals,
+                                    principal_cache)
+from app.utils.cache import TTLCache
+from app.utils.exceptions.common_exceptions import HTTPUnauthorizedException
+
+
+class TestTTLCache:
+    def test_successful_get_cached_value(self) -> None:
+        cache = TTLCache("test", maxsize=2, ttl=60)
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+        assert cache.get("missing") is None
+        assert (cache.hits.value, cache.misses.value) == (1, 1)
+
+    def test_successful_evict_least_recently_used(self) -> None:
+        cache = TTLCache("test", maxsize=2, ttl=60)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+
+        assert cache.get("second") is None
+        assert cache.get("first") == 1
+        assert cache.get("third") == 3
+
+    def test_failed_get_expired_value(self) -> None:
+        cache = TTLCache("test", maxsize=2, ttl=0)
+        cache.set("key", "value")
+
+        assert cache.get("key") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestPrincipalCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self) -> None:
+        principal_cache.clear()
+        yield
+        principal_cache.clear()
+
+    def test_successful_get_session_cached(self, mocker: MockerFixture) -> None:
+        mocker.patch("app.api.dependencies.decode_jwt", return_value={"user_id": 1})
+        mocked_get_by_token = mocker.patch(
+            "app.crud.session.get_by_token_with_role",
+            return_value=(
+                Session(id=1, token="token", status=ConstantSessionStatus.logged_in, user_id=1),
+                "admin",
+            ),
+        )
+
+        principal = get_session("token")
+
+        assert get_session("token") == principal
+        mocked_get_by_token.assert_called_once_with("token")
+        assert principal.role == "admin"
+
+    def test_successful_invalidate_user_principals(self, mocker: MockerFixture) -> None:
+        principal_cache.set(
+            "token", Principal(id=1, token="token", status=ConstantSessionStatus.logged_in, user_id=1, role="admin")
+        )
+
+        invalidate_user_principals(1)
+
+        assert principal_cache.get("token") is None
+
+    def test_successful_invalidate_principals_on_commit(self, db) -> None:
+        principal = Principal(id=1, token="token", status=ConstantSessionStatus.logged_in, user_id=1, role="admin")
+        invalidate_user_principals(1)
+        invalidate_principal("other")
+        # cached by a concurrent request from the rows read before the commit
+        principal_cache.set("token", principal)
+        principal_cache.set("other", principal.copy(update={"token": "other", "user_id": 2}))
+
+        db.commit()
+
+        assert principal_cache.get("token") is None
+        assert principal_cache.get("other") is None
+
+    def test_failed_get_session_logged_out(self, mocker: MockerFixture) -> None:
+        mocker.patch("app.api.dependencies.decode_jwt", return_value={"user_id": 1})
+        mocker.patch(
+            "app.crud.session.get_by_token_with_role",
+            return_value=(
+                Session(id=1, token="token", status=ConstantSessionStatus.logged_out, user_id=1),
+                "admin",
+            ),
+        )
+
+        with pytest.raises(HTTPUnauthorizedException):
+            get_session("token")
+        assert principal_cache.get("token") is None
+
+
+class TestSessionLookup:
+    def test_successful_get_by_token_with_role(self, crud_session, random_user, random_role, query_budget) -> None:
+        for token in ("first", "second"):
+            crud_session.create(
+                SessionCreate(
+                    token=token,
+                    creation_date=datetime.utcnow(),
+                    status=ConstantSessionStatus.logged_in,
+                    user_id=random_user.id,
+                )
+            )
+
+        with query_budget(1):
+            session, role_name = crud_session.get_by_token_with_role("first")
+
+        assert (session.token, session.token_digest) == ("first", token_digest("first"))
+        assert role_name == random_role.name
+        assert crud_session.get_by_token_with_role("missing") is None
+
+    def test_successful_log_out_user(self, crud_session, random_user) -> None:
+        session = crud_session.create(
+            SessionCreate(
+                token="token",
+                creation_date=datetime.utcnow(),
+                status=ConstantSessionStatus.logged_in,
+                user_id=random_user.id,
+            )
+        )
+
+        assert crud_session.log_out_user(random_user.id) == 1
+        crud_session.session.refresh(session)
+        assert session.status == ConstantSessionStatus.logged_out
+        assert crud_session.log_out_user(random_user.id) == 0
+
+    def test_failed_get_session_of_another_user(self, mocker: MockerFixture) -> None:
+        principal_cache.clear()
+        mocker.patch("app.api.dependencies.decode_jwt", return_value={"user_id": 2})
+        mocker.patch(
+            "app.crud.session.get_by_token_with_role",
+            return_value=(
+                Session(id=1, token="token", status=ConstantSessionStatus.logged_in, user_id=1),
+                "admin",
+            ),
+        )
+
+        with pytest.raises(HTTPUnauthorizedException):
+            get_session("token")
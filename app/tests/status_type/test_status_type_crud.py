@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.crud.crud_status_type import status_type
 from app.schemas.schema_status_type import StatusTypeCreate, StatusTypeUpdate
-from app.tests.utils.base import random_string
+from app.tests.utils.base import mssql_only, random_string
 
 
 class TestCRUDCreateStatusType:
@@ -48,6 +48,7 @@ class TestCRUDCreateStatusType:
     def test_success_create_status_type_is_flush(
         self,
         crud_status_type,
+        random_status_types,
         db: Session,
         monkeypatch,
         mocker: MockFixture,
@@ -109,6 +110,7 @@ class TestCRUDGetStatusType:
         spy_status_type_get.assert_called_once_with(random_status_type.id)
         assert status_type_in_db == random_status_type
 
+    @mssql_only
     def test_failed_get_status_type(
         self,
         crud_status_type,
@@ -144,6 +146,7 @@ class TestCRUDGetMultipleStatusTypes:
         for random_status_type in random_status_types:
             assert random_status_type in status_types_in_db
 
+    @mssql_only
     def test_failed_get_multiple_status_types(
         self,
         crud_status_type,
@@ -180,6 +183,7 @@ class TestCRUDGetStatusTypeByAttribute:
         )
         assert status_type_in_db == random_status_type
 
+    @mssql_only
     def test_failed_get_status_type_by_attribute(
         self,
         crud_status_type,
@@ -343,6 +347,7 @@ class TestCRUDDeleteStatusType:
         spy_status_type_delete.assert_called_once_with(random_status_type.id)
         assert not status_type_in_db
 
+    @mssql_only
     def test_failed_delete_status_type(
         self,
         crud_status_type,
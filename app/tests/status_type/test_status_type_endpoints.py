@@ -60,6 +60,7 @@ class TestEndpointGetMultipleStatusTypes:
     def test_successful_get_multiple_status_type(
         self,
         session,
+        pagination,
         expected_status_types,
         monkeypatch,
         mocker: MockerFixture,
@@ -72,9 +73,11 @@ class TestEndpointGetMultipleStatusTypes:
             return_value=expected_status_types,
         )
 
-        actual_result = endpoints.fetch_status_types(session)
+        actual_result = endpoints.fetch_status_types(session, pagination)
 
-        mocked_status_type_fetch_all.assert_called_once_with(session)
+        mocked_status_type_fetch_all.assert_called_once_with(
+            session, pagination.after, pagination.fetch_limit, pagination.order_by
+        )
         assert actual_result == expected_status_types
 
 
@@ -82,6 +85,7 @@ class TestEndpointSearchStatusTypeByParameter:
     def test_successful_search_status_types_by_parameter(
         self,
         session,
+        pagination,
         expected_status_type,
         monkeypatch,
         mocker: MockerFixture,
@@ -96,11 +100,11 @@ class TestEndpointSearchStatusTypeByParameter:
 
         parameter = "name"
         actual_result = endpoints.search_status_types(
-            parameter, expected_status_type.name, 1, session
+            parameter, expected_status_type.name, 1, session, pagination
         )
 
         mocked_status_type_search.assert_called_once_with(
-            parameter, expected_status_type.name, 1, session
+            parameter, expected_status_type.name, 2, session, pagination.after, pagination.order_by
         )
         assert expected_status_type in actual_result
 
@@ -33,13 +33,13 @@ class TestManagerGetStatusType:
         mocker: MockerFixture,
     ) -> None:
         mocked_status_type_get = mocker.patch(
-            "app.manager.manager_status_type.status_type.crud.get",
+            "app.manager.manager_reference.reference_data.get",
             return_value=expected_status_type,
         )
 
         actual_result = status_type.fetch_one(expected_status_type.id, session)
 
-        mocked_status_type_get.assert_called_once_with(expected_status_type.id)
+        mocked_status_type_get.assert_called_once_with(StatusType, expected_status_type.id)
         assert actual_result == expected_status_type
 
 
@@ -51,7 +51,7 @@ class TestManagerGetMultipleStatusTypes:
         mocker: MockerFixture,
     ) -> None:
         mocked_status_type_get_multi = mocker.patch(
-            "app.manager.manager_status_type.status_type.crud.get_multi",
+            "app.manager.manager_reference.reference_data.get_all",
             return_value=expected_status_types,
         )
 
@@ -79,7 +79,7 @@ class TestManagerSearchStatusTypeByParameter:
         )
 
         mocked_status_type_search.assert_called_once_with(
-            parameter, expected_status_type.name, 1
+            parameter, expected_status_type.name, 1, after=None, order_by="id"
         )
         assert expected_status_type in actual_result
 
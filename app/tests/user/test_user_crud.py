@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.crud.crud_user import user
 from app.schemas.schema_user import UserCreate, UserUpdate
 from app.security.passwords import hash_password
-from app.tests.utils.base import random_string, random_password, random_email
+from app.tests.utils.base import mssql_only, random_string, random_password, random_email
 from app.utils.exceptions.common_exceptions import HTTPBadRequestException
 
 
@@ -44,6 +44,7 @@ class TestCRUDCreateUser:
     def test_successful_create_user_is_flush(
         self,
         crud_user,
+        random_users,
         user_create_data,
         db: Session,
         monkeypatch,
@@ -79,6 +80,18 @@ class TestCRUDCreateUser:
         with pytest.raises(TypeError):
             user.create(**user_create_data)
 
+    def test_failed_create_user_duplicate_email(
+        self,
+        crud_user,
+        random_user,
+        user_create_data,
+        monkeypatch,
+    ) -> None:
+        monkeypatch.setattr("app.crud.crud_user.user.create", crud_user.create)
+
+        with pytest.raises(HTTPBadRequestException):
+            user.create({**user_create_data, "email": random_user.email}, is_flush=True)
+
 
 class TestCRUDGetUser:
     def test_successful_get_user(
@@ -96,6 +109,7 @@ class TestCRUDGetUser:
         spy_user_get.assert_called_once_with(random_user.id)
         assert user_in_db == random_user
 
+    @mssql_only
     def test_failed_get_user(
         self,
         crud_user,
@@ -127,6 +141,7 @@ class TestCRUDGetMultipleUsers:
         for random_user in random_users:
             assert random_user in users_in_db
 
+    @mssql_only
     def test_failed_get_multiple_users(
         self,
         crud_user,
@@ -159,6 +174,7 @@ class TestCRUDGetUserByAttribute:
         spy_user_get_by_attribute.assert_called_once_with(email=random_user.email)
         assert user_in_db == random_user
 
+    @mssql_only
     def test_failed_get_user_by_attribute(
         self,
         crud_user,
@@ -345,6 +361,7 @@ class TestCRUDDeleteUser:
         spy_user_delete.assert_called_once_with(random_user.id)
         assert not user_in_db
 
+    @mssql_only
     def test_failed_delete_user(
         self,
         crud_user,
@@ -2,10 +2,18 @@ import random
 import string
 from datetime import date, timedelta
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
 
+from app.config.db_config import db_cfg
 from app.config.superuser_config import superuser_cfg
 
+# tests of the errors which SQL Server raises for invalid values and SQLite accepts
+mssql_only = pytest.mark.skipif(
+    make_url(db_cfg.DB_URL_TEST).get_backend_name() != "mssql", reason="SQL Server errors"
+)
+
 
 def random_string(length: int = 10) -> str:
     return "".join(random.choices(string.ascii_letters, k=length))
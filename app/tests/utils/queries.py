@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Generator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.query_stats import QueryStats
+
+
+@contextmanager
+def query_budget(engine: Engine, max_queries: int) -> Generator[QueryStats, None, None]:
+    """
+    Fail the test if the block executes more statements on the engine than its budget, e.g. lazy loads in a loop.
+    The failure lists the statements by count, all threads of the engine are counted (TestClient included)
+    """
+    stats = QueryStats()
+    started = []
+
+    def before_cursor_execute(*args) -> None:
+        started.append(perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, *args) -> None:
+        stats.record(statement, perf_counter() - started.pop())
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+    assert stats.count <= max_queries, f"{stats.count} statements over the budget of {max_queries}:\n{stats.report()}"
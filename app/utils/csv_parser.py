@@ -1,59 +1,316 @@
+"""
+Load seed data from CSV files, one file per model named after it, e.g. `app/db/data/Role.csv`.
+
+Tables are loaded by levels of foreign key dependencies, the tables of one level in parallel,
+each with its own connections. Rows are streamed in chunks, each chunk is inserted with a single executemany
+(fast_executemany on pyodbc) and committed. Rows which can not be converted or inserted are written
+to `<Model>.rejected.csv` in the rejects directory with the error, the rest of the chunk is still loaded.
+Nonunique indexes can be turned off during the load and rebuilt afterwards with `--disable-indexes`.
+
+Usage: python -m app.utils.csv_parser --chunk-size 10000 --workers 4 --disable-indexes --rejects-dir rejects
+"""
+import argparse
 import csv
 import logging
-from datetime import datetime
-
-from sqlalchemy import Boolean, Date, DateTime
-from sqlalchemy.orm import Session
-
-from app.db.session import get_session
-from app.db.models import (AccountType, Bank, Employee, EmployeeAccount, Employer,
-                           EmployerType, EmployerPaymentMethod, PaymentHistory,
-                           PaymentStatusType, Role, StatusType, User)
-
-
-def parsing(session: Session = next(get_session())) -> None:
-    for model in [
-        Role,
-        StatusType,
-        User,
-        EmployerType,
-        Employer,
-        Bank,
-        EmployerPaymentMethod,
-        Employee,
-        AccountType,
-        EmployeeAccount,
-        PaymentStatusType,
-        PaymentHistory,
-    ]:
-        with open(f"app/db/data/{model.__name__}.csv", "r") as csv_file:
-            column_types = {
-                column.key: column.type for column in model.__table__.columns
-            }
-            for data in csv.DictReader(csv_file):
-                converted_data = convert_data_types(column_types, data)
-                obj = model(**converted_data)
-                session.add(obj)
-                try:
-                    session.commit()
-                except Exception as exc:
-                    logging.exception(exc)
-                    session.rollback()
-
-
-def convert_data_types(column_types: dict, data: dict) -> dict:
-    for key, value in data.items():
-        if isinstance(column_types[key], Date):
-            data[key] = datetime.strptime(value, "%Y-%m-%d").date()
-            continue
-        if isinstance(column_types[key], DateTime):
-            data[key] = datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
-            continue
-        if isinstance(column_types[key], Boolean):
-            data[key] = True if value == 'true' else False
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, Table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db import models  # noqa: F401 register the models in the metadata
+from app.db.base import Base
+from app.db.session import engine as default_engine
+
+DATA_DIR = "app/db/data"
+CHUNK_SIZE = 10000
+BOOLEAN_VALUES = {"true": True, "false": False}
+
+# nonclustered indexes of a table, except unique ones which reject duplicated rows
+MSSQL_NONCLUSTERED_INDEXES = """
+SELECT i.name FROM sys.indexes i
+JOIN sys.tables t ON t.object_id = i.object_id
+WHERE t.name = :table AND i.type_desc = 'NONCLUSTERED' AND i.is_unique = 0 AND i.is_disabled = 0
+"""
+
+Converter = Callable[[str], Any]
+# raw CSV row and its converted values
+Row = Tuple[List[str], Dict[str, Any]]
+
+
+@dataclass
+class LoadReport:
+    table: str
+    rows: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table:<25} {self.rows:>10} rows {self.rejected:>8} rejected "
+            f"{self.seconds:>9.2f} s {self.rows_per_second:>12.1f} rows/s"
+        )
+
+
+def column_converter(column: Column) -> Converter:
+    """
+    Get the converter of CSV values of the column, chosen once by the column type. Empty values are NULL
+    except for strings
+    """
+    column_type = column.type
+    if isinstance(column_type, DateTime):
+        parse: Converter = datetime.fromisoformat
+    elif isinstance(column_type, Date):
+        parse = date.fromisoformat
+    elif isinstance(column_type, Boolean):
+        parse = BOOLEAN_VALUES.__getitem__
+    elif isinstance(column_type, Integer):
+        parse = int
+    else:
+        return str
+
+    def convert(value: str) -> Any:
+        return parse(value) if value != "" else None
+
+    return convert
+
+
+def row_converter(table: Table, header: Sequence[str]) -> Callable[[List[str]], Dict[str, Any]]:
+    """
+    Get the converter of CSV rows with the given header into column values of the table
+    """
+    unknown = [key for key in header if key not in table.columns]
+    if unknown:
+        raise ValueError(f"Unknown columns of {table.name}: {', '.join(unknown)}")
+    plan = [(index, key, column_converter(table.columns[key])) for index, key in enumerate(header)]
+    size = len(header)
+
+    def convert(row: List[str]) -> Dict[str, Any]:
+        if len(row) != size:
+            raise ValueError(f"Expected {size} values, got {len(row)}")
+        return {key: converter(row[index]) for index, key, converter in plan}
+
+    return convert
+
+
+class RejectWriter:
+    """
+    Write rejected rows with the error to a side file, created on the first rejected row
+    """
+
+    def __init__(self, path: Optional[str], header: Sequence[str]):
+        self.path = path
+        self.header = header
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._writer = None
+
+    def write(self, row: List[str], error: str) -> None:
+        self.count += 1
+        if self.path is None:
+            logging.warning("Rejected row %s: %s", row, error)
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([*self.header, "error"])
+        self._writer.writerow([*row, error])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def read_chunks(
+    reader: Iterator[List[str]],
+    convert: Callable[[List[str]], Dict[str, Any]],
+    rejects: RejectWriter,
+    chunk_size: int,
+) -> Iterator[List[Row]]:
+    chunk: List[Row] = []
+    for row in reader:
+        try:
+            chunk.append((row, convert(row)))
+        except (ValueError, KeyError) as err:
+            rejects.write(row, f"{type(err).__name__}: {err}")
             continue
-    return data
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def insert_chunk(engine: Engine, table: Table, chunk: List[Row], rejects: RejectWriter) -> int:
+    """
+    Insert the chunk in one transaction. A failed chunk is split in halves and retried,
+    so the bad rows are found with a few statements instead of one per row
+    """
+    try:
+        with engine.begin() as connection:
+            connection.execute(table.insert(), [values for _, values in chunk])
+        return len(chunk)
+    except SQLAlchemyError as err:
+        if len(chunk) == 1:
+            rejects.write(chunk[0][0], str(getattr(err, "orig", err)).splitlines()[0])
+            return 0
+        middle = len(chunk) // 2
+        return insert_chunk(engine, table, chunk[:middle], rejects) + insert_chunk(
+            engine, table, chunk[middle:], rejects
+        )
+
+
+@contextmanager
+def indexes_disabled(engine: Engine, table: Table) -> Iterator[None]:
+    """
+    Turn off the nonunique indexes of the table during the load and rebuild them afterwards.
+    SQL Server disables the nonclustered indexes found in the database, other databases drop and create
+    the indexes of the model
+    """
+    if engine.dialect.name == "mssql":
+        quote = engine.dialect.identifier_preparer.quote
+        with engine.begin() as connection:
+            names = connection.execute(text(MSSQL_NONCLUSTERED_INDEXES), {"table": table.name}).scalars().all()
+            for name in names:
+                connection.execute(text(f"ALTER INDEX {quote(name)} ON {quote(table.name)} DISABLE"))
+        try:
+            yield
+        finally:
+            with engine.begin() as connection:
+                for name in names:
+                    connection.execute(text(f"ALTER INDEX {quote(name)} ON {quote(table.name)} REBUILD"))
+        return
+    indexes = [index for index in table.indexes if not index.unique]
+    with engine.begin() as connection:
+        for index in indexes:
+            index.drop(connection)
+    try:
+        yield
+    finally:
+        with engine.begin() as connection:
+            for index in indexes:
+                index.create(connection)
+
+
+def table_levels(tables: Sequence[Table]) -> List[List[Table]]:
+    """
+    Group the tables by levels of foreign key dependencies, a table only refers to the tables of previous levels
+    """
+    levels: Dict[Table, int] = {}
+
+    def level(table: Table) -> int:
+        if table not in levels:
+            # guards against circular references
+            levels[table] = 0
+            levels[table] = max(
+                (level(key.column.table) + 1 for key in table.foreign_keys if key.column.table is not table),
+                default=0,
+            )
+        return levels[table]
+
+    grouped: Dict[int, List[Table]] = {}
+    for table in tables:
+        grouped.setdefault(level(table), []).append(table)
+    return [grouped[index] for index in sorted(grouped)]
+
+
+def load_table(
+    table: Table,
+    path: str,
+    engine: Engine = default_engine,
+    chunk_size: int = CHUNK_SIZE,
+    rejects_dir: Optional[str] = None,
+    disable_indexes: bool = False,
+) -> LoadReport:
+    report = LoadReport(table.name)
+    started = time.perf_counter()
+    with open(path, "r", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header is None:
+            return report
+        convert = row_converter(table, header)
+        rejects_path = None
+        if rejects_dir:
+            name = os.path.splitext(os.path.basename(path))[0]
+            rejects_path = os.path.join(rejects_dir, f"{name}.rejected.csv")
+        rejects = RejectWriter(rejects_path, header)
+        try:
+            with indexes_disabled(engine, table) if disable_indexes else nullcontext():
+                # blank lines, e.g. at the end of the file, are not rows
+                rows = (row for row in reader if row)
+                for chunk in read_chunks(rows, convert, rejects, chunk_size):
+                    report.rows += insert_chunk(engine, table, chunk, rejects)
+        finally:
+            rejects.close()
+    report.rejected = rejects.count
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def parsing(
+    data_dir: str = DATA_DIR,
+    engine: Engine = default_engine,
+    chunk_size: int = CHUNK_SIZE,
+    rejects_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    disable_indexes: bool = False,
+) -> List[LoadReport]:
+    """
+    Load the CSV files of the models found in the data directory, the tables of one dependency level in parallel
+    """
+    if rejects_dir:
+        os.makedirs(rejects_dir, exist_ok=True)
+    paths = {}
+    for mapper in Base.registry.mappers:
+        path = os.path.join(data_dir, f"{mapper.class_.__name__}.csv")
+        if os.path.exists(path):
+            paths[mapper.local_table] = path
+    reports = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for level in table_levels(list(paths)):
+            futures = [
+                executor.submit(
+                    load_table, table, paths[table], engine, chunk_size, rejects_dir, disable_indexes
+                )
+                for table in level
+            ]
+            for future in futures:
+                report = future.result()
+                logging.info("%s", report)
+                reports.append(report)
+    return reports
 
 
 if __name__ == "__main__":
-    parsing()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Tables loaded in parallel, CPU count by default")
+    parser.add_argument("--disable-indexes", action="store_true", help="Rebuild nonunique indexes after the load")
+    parser.add_argument("--rejects-dir", default=None, help="Directory of rejected rows, logged if not set")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    total = LoadReport("total")
+    for table_report in parsing(
+        args.data_dir,
+        chunk_size=args.chunk_size,
+        rejects_dir=args.rejects_dir,
+        workers=args.workers,
+        disable_indexes=args.disable_indexes,
+    ):
+        print(table_report)
+        total.rows += table_report.rows
+        total.rejected += table_report.rejected
+    total.seconds = time.perf_counter() - started
+    print(total)
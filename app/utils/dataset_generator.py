@@ -0,0 +1,387 @@
+"""
+Generate a synthetic, referentially consistent dataset at a configurable scale for benchmarking.
+
+Employer sizes and bank choice follow a Zipf distribution, employee names are drawn from small pools so common
+names repeat, recent months hold more payments and most payments succeed. Every payment is made from an account
+of an employee through the active payment method of the employer of that employee. All users share one password.
+Rows are streamed to CSV files in the format read by `csv_parser` or inserted straight into the database in chunks,
+into empty tables as IDs are generated.
+
+Usage: python -m app.utils.dataset_generator --employers 10000 --employees 1000000 --payments 20000000 --csv-dir data
+       python -m app.utils.dataset_generator --employees 100000 --payments 1000000 --url sqlite:///bench.db
+"""
+import argparse
+import csv
+import os
+import random
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.constansts.constants_account_type import ConstantAccountType
+from app.constansts.constants_payment_status_type import ConstantPaymentStatusType
+from app.constansts.constants_role import ConstantRole
+from app.constansts.constants_status_type import ConstantStatusType
+from app.db.base import Base
+from app.db.models import (AccountType, Bank, Employee, EmployeeAccount, Employer, EmployerPaymentMethod,
+                           EmployerType, PaymentHistory, PaymentStatusType, Role, StatusType, User)
+from app.db.session import engine as default_engine
+from app.security.passwords import hash_password
+from app.utils.batching import chunked
+from app.utils.csv_parser import LoadReport
+
+DEFAULT_PASSWORD = "Password1!"
+# random draws are made in blocks, `random.choices` is much faster for many values at once
+DRAW_SIZE = 10000
+
+EMPLOYER_TYPES = ["DAT", "FOP", "TOV", "PP", "PAT", "KP"]
+FIRST_NAMES = ["John", "Mary", "Olena", "Ivan", "Anna", "Petro", "Maria", "Oleh", "Iryna", "Andrii", "Nataliia",
+               "Serhii", "Tetiana", "Dmytro", "Yuliia", "Mykola", "Oksana", "Taras", "Lora", "Bohdan"]
+LAST_NAMES = ["Doe", "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Palmer", "Melnyk",
+              "Oliinyk", "Lysenko", "Moroz", "Marchenko", "Rudenko", "Savchenko", "Petrenko", "Boiko"]
+COMPANY_WORDS = ["Lion", "Tiger", "Steppe", "River", "Grain", "Sun", "Forge", "Harbor", "Oak", "Falcon", "Amber",
+                 "Granite", "Maple", "Delta", "North", "Silver"]
+STREETS = ["Sumska", "Pushkinska", "Khreshchatyk", "Shevchenka", "Franka", "Hrushevskoho", "Sadova", "Lvivska"]
+CITIES = ["Kharkiv", "Kyiv", "Lviv", "Odesa", "Dnipro", "Poltava"]
+ISSUERS = ["PB", "OB", "MB", "UB", "AB"]
+PAYMENT_STATUS_WEIGHTS = {
+    ConstantPaymentStatusType.success: 90,
+    ConstantPaymentStatusType.in_process: 7,
+    ConstantPaymentStatusType.error: 3,
+}
+
+Rows = Iterator[Tuple[Any, ...]]
+
+
+@dataclass
+class Scale:
+    employers: int = 100
+    employees: int = 10000
+    payments: int = 100000
+    banks: int = 20
+    accounts_per_employee: float = 1.3
+    months: int = 24
+    skew: float = 1.1
+
+
+def zipf_weights(size: int, skew: float) -> List[float]:
+    """
+    Get cumulative weights of ranks 1..size, the weight of rank k is 1 / k^skew
+    """
+    return list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+
+
+class DatasetGenerator:
+    """
+    Generate the rows of each table, parents first. The rows of a table must be consumed before the next table
+    is generated, children refer to the IDs recorded while their parents were generated
+    """
+
+    def __init__(self, scale: Scale, seed: int = 0, password: str = DEFAULT_PASSWORD, today: Optional[date] = None):
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.password_hash = hash_password(password)
+        self.today = today or date.today()
+        self.now = datetime.combine(self.today, datetime.min.time())
+        # employer of each employee, active payment method of each employer and employee of each account,
+        # index 0 is unused as IDs start with 1
+        self.employee_employers = array("I", [0])
+        self.employer_methods = array("I", [0])
+        self.account_employees = array("I", [0])
+
+    def tables(self) -> Iterator[Tuple[Type[Base], Sequence[str], Rows]]:
+        yield Role, ("id", "name"), self.enumerate_names(ConstantRole)
+        yield StatusType, ("id", "name"), self.enumerate_names(ConstantStatusType)
+        yield EmployerType, ("id", "name"), self.enumerate_names(EMPLOYER_TYPES)
+        yield AccountType, ("id", "name"), self.enumerate_names(ConstantAccountType)
+        yield PaymentStatusType, ("id", "name"), self.enumerate_names(ConstantPaymentStatusType)
+        yield Bank, ("id", "name", "mfo", "is_active", "creation_date", "deactivation_date"), self.banks()
+        yield User, (
+            "id", "email", "password", "phone", "creation_date", "activation_date", "role_id", "status_type_id"
+        ), self.users()
+        yield Employer, (
+            "id", "name", "address", "edrpou", "expire_contract_date", "salary_date", "prepayment_date", "user_id",
+            "employer_type_id",
+        ), self.employers()
+        yield EmployerPaymentMethod, (
+            "id", "iban", "is_active", "creation_date", "deactivation_date", "employer_id", "bank_id"
+        ), self.employer_payment_methods()
+        yield Employee, (
+            "id", "fullname", "passport", "tax_id", "birth_date", "user_id", "employer_id"
+        ), self.employees()
+        yield EmployeeAccount, (
+            "id", "name", "number", "is_active", "is_default", "issuer", "creation_date", "deactivation_date",
+            "employee_id", "account_type_id",
+        ), self.employee_accounts()
+        yield PaymentHistory, (
+            "id", "amount", "creation_date", "employee_account_id", "employer_payment_method_id",
+            "payment_status_type_id",
+        ), self.payment_histories()
+
+    @staticmethod
+    def enumerate_names(names: Iterable[Any]) -> Rows:
+        for obj_id, name in enumerate(names, start=1):
+            yield obj_id, getattr(name, "value", name)
+
+    @staticmethod
+    def reference_id(names: Iterable[Any], name: Any) -> int:
+        """
+        Get the ID of the name in the reference table generated by `enumerate_names`
+        """
+        return list(names).index(name) + 1
+
+    def skewed_draws(self, size: int, count: int, skew: float) -> Iterator[int]:
+        """
+        Draw `count` values of 1..size, value k is drawn with probability proportional to 1 / k^skew
+        """
+        population = range(1, size + 1)
+        cum_weights = zipf_weights(size, skew)
+        for block in range(0, count, DRAW_SIZE):
+            yield from self.random.choices(population, cum_weights=cum_weights, k=min(DRAW_SIZE, count - block))
+
+    def past_datetime(self, max_days: int) -> datetime:
+        return self.now - timedelta(days=self.random.randrange(max_days), seconds=self.random.randrange(86400))
+
+    def banks(self) -> Rows:
+        for bank_id in range(1, self.scale.banks + 1):
+            yield (
+                bank_id,
+                f"{self.random.choice(COMPANY_WORDS)} Bank {bank_id}",
+                f"{self.random.randrange(10 ** 6):06d}",
+                self.random.random() < 0.9,
+                self.past_datetime(3650),
+                self.today + timedelta(days=self.random.randrange(365, 3650)),
+            )
+
+    def users(self) -> Rows:
+        role_employer = self.reference_id(ConstantRole, ConstantRole.employer)
+        role_employee = self.reference_id(ConstantRole, ConstantRole.employee)
+        status_active = self.reference_id(ConstantStatusType, ConstantStatusType.active)
+        status_inactive = self.reference_id(ConstantStatusType, ConstantStatusType.inactive)
+        for user_id in range(1, self.scale.employers + self.scale.employees + 1):
+            is_employer = user_id <= self.scale.employers
+            creation_date = self.past_datetime(1825)
+            is_active = self.random.random() < 0.95
+            yield (
+                user_id,
+                f"employer{user_id}@example.com" if is_employer else f"employee{user_id}@example.com",
+                self.password_hash,
+                f"+380{user_id:09d}",
+                creation_date,
+                creation_date + timedelta(hours=2) if is_active else None,
+                role_employer if is_employer else role_employee,
+                status_active if is_active else status_inactive,
+            )
+
+    def employers(self) -> Rows:
+        for employer_id in range(1, self.scale.employers + 1):
+            salary_day = self.random.randrange(15, 29)
+            yield (
+                employer_id,
+                f"{self.random.choice(COMPANY_WORDS)} {self.random.choice(COMPANY_WORDS)} {employer_id}",
+                f"{self.random.randrange(1, 200)} {self.random.choice(STREETS)} st. {self.random.choice(CITIES)}",
+                f"{employer_id:08d}",
+                self.today + timedelta(days=self.random.randrange(30, 1825)),
+                self.today.replace(day=salary_day),
+                self.today.replace(day=salary_day - 14),
+                employer_id,
+                self.random.randrange(1, len(EMPLOYER_TYPES) + 1),
+            )
+
+    def employer_payment_methods(self) -> Rows:
+        """
+        One to three payment methods per employer, the last one is active
+        """
+        method_id = 0
+        banks = self.skewed_draws(self.scale.banks, self.scale.employers * 3, self.scale.skew)
+        for employer_id in range(1, self.scale.employers + 1):
+            count = self.random.choices((1, 2, 3), weights=(70, 25, 5))[0]
+            for index in range(count):
+                method_id += 1
+                is_active = index == count - 1
+                yield (
+                    method_id,
+                    f"UA{self.random.randrange(10 ** 27):027d}",
+                    is_active,
+                    self.past_datetime(1825),
+                    self.today + timedelta(days=self.random.randrange(365, 1825)),
+                    employer_id,
+                    next(banks),
+                )
+            self.employer_methods.append(method_id)
+
+    def employees(self) -> Rows:
+        employers = self.skewed_draws(self.scale.employers, self.scale.employees, self.scale.skew)
+        first_names = self.skewed_draws(len(FIRST_NAMES), self.scale.employees, 1.0)
+        last_names = self.skewed_draws(len(LAST_NAMES), self.scale.employees, 1.0)
+        for employee_id in range(1, self.scale.employees + 1):
+            employer_id = next(employers)
+            self.employee_employers.append(employer_id)
+            yield (
+                employee_id,
+                f"{FIRST_NAMES[next(first_names) - 1]} {LAST_NAMES[next(last_names) - 1]}",
+                f"{chr(65 + employee_id % 26)}{chr(65 + employee_id // 26 % 26)}{employee_id:08d}",
+                f"{employee_id:010d}",
+                date(self.random.randrange(1960, 2005), self.random.randrange(1, 13), self.random.randrange(1, 29)),
+                self.scale.employers + employee_id,
+                employer_id,
+            )
+
+    def employee_accounts(self) -> Rows:
+        """
+        At least one account per employee, the first one is active and default
+        """
+        account_id = 0
+        extra_account = max(self.scale.accounts_per_employee - 1, 0)
+        for employee_id in range(1, self.scale.employees + 1):
+            count = 1 + int(extra_account) + (self.random.random() < extra_account % 1)
+            for index in range(count):
+                account_id += 1
+                self.account_employees.append(employee_id)
+                yield (
+                    account_id,
+                    self.random.choice(ISSUERS),
+                    f"{self.random.randrange(10 ** 16):016d}",
+                    index == 0 or self.random.random() < 0.3,
+                    index == 0,
+                    self.random.choice(ISSUERS),
+                    self.past_datetime(1825),
+                    self.today + timedelta(days=self.random.randrange(365, 1825)),
+                    employee_id,
+                    self.random.randrange(1, len(ConstantAccountType) + 1),
+                )
+
+    def payment_histories(self) -> Rows:
+        """
+        Payments of random accounts, month m ago is chosen with weight proportional to `months - m`
+        """
+        accounts = len(self.account_employees) - 1
+        if not accounts:
+            return
+        months = self.scale.months
+        month_weights = list(accumulate(range(months, 0, -1)))
+        statuses = [self.reference_id(ConstantPaymentStatusType, status) for status in PAYMENT_STATUS_WEIGHTS]
+        status_weights = list(accumulate(PAYMENT_STATUS_WEIGHTS.values()))
+        payment_id = 0
+        for block in chunked(range(self.scale.payments), DRAW_SIZE):
+            size = len(block)
+            months_ago = self.random.choices(range(months), cum_weights=month_weights, k=size)
+            status_ids = self.random.choices(statuses, cum_weights=status_weights, k=size)
+            for month_ago, status_id in zip(months_ago, status_ids):
+                payment_id += 1
+                account_id = self.random.randrange(1, accounts + 1)
+                employer_id = self.employee_employers[self.account_employees[account_id]]
+                yield (
+                    payment_id,
+                    int(self.random.lognormvariate(10, 0.5)),
+                    self.now - timedelta(days=30 * month_ago + self.random.randrange(28)) + timedelta(hours=10),
+                    account_id,
+                    self.employer_methods[employer_id],
+                    status_id,
+                )
+
+
+def format_value(value: Any) -> Any:
+    """
+    Format the value as `csv_parser` reads it
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return value
+
+
+class CSVSink:
+    """
+    Write the rows of each model to `<Model>.csv` in the directory
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, model: Type[Base], columns: Sequence[str], rows: Rows) -> int:
+        count = 0
+        with open(os.path.join(self.directory, f"{model.__name__}.csv"), "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([format_value(value) for value in row])
+                count += 1
+        return count
+
+
+class DBSink:
+    """
+    Insert the rows with one executemany per chunk, each chunk is committed
+    """
+
+    def __init__(self, engine: Engine, chunk_size: int = 10000):
+        self.engine = engine
+        self.chunk_size = chunk_size
+
+    def write(self, model: Type[Base], columns: Sequence[str], rows: Rows) -> int:
+        count = 0
+        for chunk in chunked(rows, self.chunk_size):
+            with self.engine.begin() as connection:
+                connection.execute(model.__table__.insert(), [dict(zip(columns, row)) for row in chunk])
+            count += len(chunk)
+        return count
+
+
+def generate(generator: DatasetGenerator, sink: Any) -> List[LoadReport]:
+    reports = []
+    for model, columns, rows in generator.tables():
+        started = time.perf_counter()
+        count = sink.write(model, columns, rows)
+        reports.append(LoadReport(model.__table__.name, rows=count, seconds=time.perf_counter() - started))
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employers", type=int, default=Scale.employers)
+    parser.add_argument("--employees", type=int, default=Scale.employees)
+    parser.add_argument("--payments", type=int, default=Scale.payments)
+    parser.add_argument("--banks", type=int, default=Scale.banks)
+    parser.add_argument("--accounts-per-employee", type=float, default=Scale.accounts_per_employee)
+    parser.add_argument("--months", type=int, default=Scale.months, help="Months of payment history")
+    parser.add_argument("--skew", type=float, default=Scale.skew, help="Zipf exponent of employer sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of all users")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--csv-dir", default=None, help="Write CSV files for csv_parser instead of the database")
+    output.add_argument("--url", default=None, help="Database URL, the configured database by default")
+    args = parser.parse_args()
+
+    if args.csv_dir:
+        dataset_sink: Any = CSVSink(args.csv_dir)
+    else:
+        sink_engine = create_engine(args.url) if args.url else default_engine
+        Base.metadata.create_all(sink_engine)
+        dataset_sink = DBSink(sink_engine, args.chunk_size)
+    dataset_scale = Scale(
+        employers=args.employers,
+        employees=args.employees,
+        payments=args.payments,
+        banks=args.banks,
+        accounts_per_employee=args.accounts_per_employee,
+        months=args.months,
+        skew=args.skew,
+    )
+    total = LoadReport("total")
+    for table_report in generate(DatasetGenerator(dataset_scale, args.seed, args.password), dataset_sink):
+        print(table_report)
+        total.rows += table_report.rows
+        total.seconds += table_report.seconds
+    print(total)
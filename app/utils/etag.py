@@ -0,0 +1,20 @@
+from hashlib import blake2b
+from typing import Optional
+
+
+def content_etag(body: bytes) -> str:
+    return f'W/"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of the ETag with the `If-None-Match` list, `*` matches any
+    """
+    if not if_none_match:
+        return False
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque_tag:
+            return True
+    return False
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from fastapi import HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 
@@ -27,6 +29,11 @@ class HTTPInternalServerException(HTTPException):
         super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class HTTPNotModifiedException(HTTPException):
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
 class HTTPBadRequestException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -46,3 +53,12 @@ class HTTPForbiddenException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied",
         )
+
+
+class HTTPServiceUnavailableException(HTTPException):
+    def __init__(self, detail: str, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -7,8 +7,10 @@ from fastapi.routing import APIRoute
 
 from app.utils.exceptions.common_exceptions import (
     HTTPInternalServerException,
+    HTTPNotModifiedException,
     HTTPUnprocessableEntityException,
 )
+from app.utils.http_metrics import http_metrics
 
 
 class ExceptionRouteHandler(APIRoute):
@@ -18,9 +20,13 @@ class ExceptionRouteHandler(APIRoute):
         async def exception_route_handler(request: Request) -> Response:
             try:
                 return await original_route_handler(request)
+            except HTTPNotModifiedException as exc:
+                return Response(status_code=exc.status_code, headers=exc.headers)
             except Exception as exc:
+                # counted by class only on the error path, successful requests are not slowed down
+                http_metrics.exceptions.labels(request.method, self.path, type(exc).__name__).inc()
                 if isinstance(exc, HTTPException):
-                    raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+                    raise HTTPException(status_code=exc.status_code, detail=exc.detail, headers=exc.headers)
                 if isinstance(exc, RequestValidationError):
                     raise HTTPUnprocessableEntityException(
                         exception=exc, body=await request.body()
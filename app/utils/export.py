@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Iterable, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from app.constansts.constants_export_format import ConstantExportFormat
+
+MEDIA_TYPES = {
+    ConstantExportFormat.csv: "text/csv",
+    ConstantExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def encode_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def encode_csv(columns: Sequence[str], partitions: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """
+    Encode the header and then each partition of rows as one CSV chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[encode_value(value) for value in row] for row in rows])
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(columns: Sequence[str], partitions: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """
+    Encode each partition of rows as one chunk of JSON objects, one per line
+    """
+    for rows in partitions:
+        yield "".join(
+            json.dumps({column: encode_value(value) for column, value in zip(columns, row)}) + "\n"
+            for row in rows
+        ).encode()
+
+
+def streaming_export(
+    name: str,
+    export_format: ConstantExportFormat,
+    columns: Sequence[str],
+    partitions: Iterable[Sequence[Sequence[Any]]],
+) -> StreamingResponse:
+    """
+    Stream the rows as a file attachment, chunks are sent as the partitions are fetched
+    """
+    encode = encode_csv if export_format == ConstantExportFormat.csv else encode_ndjson
+    return StreamingResponse(
+        encode(columns, partitions),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'},
+    )
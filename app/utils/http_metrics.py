@@ -0,0 +1,70 @@
+from typing import Any, Dict
+
+from app.utils.metrics import Counter, Family, Gauge, Histogram
+
+# bytes, from empty responses to large exports
+RESPONSE_SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class HTTPMetrics:
+    """
+    Requests by route: count by status, latency, response size, requests in flight and exceptions by class
+    """
+
+    def __init__(self):
+        self.in_flight = Gauge()
+        self.requests: Family[Counter] = Family(("method", "route", "status"), Counter)
+        self.duration: Family[Histogram] = Family(("method", "route"), Histogram)
+        self.response_size: Family[Histogram] = Family(
+            ("method", "route"), lambda: Histogram(RESPONSE_SIZE_BUCKETS)
+        )
+        self.exceptions: Family[Counter] = Family(("method", "route", "exception"), Counter)
+
+    def observe(self, method: str, route: str, status: int, duration: float, size: int) -> None:
+        self.requests.labels(method, route, str(status)).inc()
+        self.duration.labels(method, route).observe(duration)
+        self.response_size.labels(method, route).observe(size)
+
+
+http_metrics = HTTPMetrics()
+
+
+class CompressionMetrics:
+    """
+    Compressed responses by encoding: bytes before and after compression and CPU time spent compressing
+    """
+
+    def __init__(self):
+        self.responses: Family[Counter] = Family(("encoding",), Counter)
+        self.identity_bytes: Family[Counter] = Family(("encoding",), Counter)
+        self.encoded_bytes: Family[Counter] = Family(("encoding",), Counter)
+        self.cpu_time: Family[Counter] = Family(("encoding",), Counter)
+        self.skipped: Family[Counter] = Family(("reason",), Counter)
+
+    def observe(self, encoding: str, identity_size: int, encoded_size: int, cpu_time: float) -> None:
+        self.responses.labels(encoding).inc()
+        self.identity_bytes.labels(encoding).inc(identity_size)
+        self.encoded_bytes.labels(encoding).inc(encoded_size)
+        self.cpu_time.labels(encoding).inc(cpu_time)
+
+    def stats(self) -> Dict[str, Any]:
+        encodings = {}
+        for labels, responses in self.responses.items():
+            encoding = labels["encoding"]
+            identity_size = self.identity_bytes.labels(encoding).value
+            encoded_size = self.encoded_bytes.labels(encoding).value
+            encodings[encoding] = {
+                "responses": responses.value,
+                "identity_bytes": identity_size,
+                "encoded_bytes": encoded_size,
+                "saved_bytes": identity_size - encoded_size,
+                "ratio": round(encoded_size / identity_size, 4) if identity_size else None,
+                "cpu_time": round(self.cpu_time.labels(encoding).value, 6),
+            }
+        return {
+            "encodings": encodings,
+            "skipped": {labels["reason"]: counter.value for labels, counter in self.skipped.items()},
+        }
+
+
+compression_metrics = CompressionMetrics()
@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+from starlette.types import Scope
+
+MetricType = TypeVar("MetricType")
+
+# seconds, from sub-millisecond pool checkouts to slow requests
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Thread-safe histogram of observed durations with cumulative buckets
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative(self) -> Dict[str, int]:
+        """
+        Get the amount of observations less than or equal to each bucket bound, `+Inf` included
+        """
+        with self._lock:
+            counts = list(self._counts)
+        result, total = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            total += count
+            result[bound] = total
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"buckets": self.cumulative(), "count": self.count, "sum": self.sum}
+
+
+class Counter:
+    """
+    Thread-safe monotonic counter
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """
+    Thread-safe value which goes up and down, e.g. requests in flight
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Family(Generic[MetricType]):
+    """
+    Metrics of one kind by label values, e.g. a histogram per route, created on first use.
+    Label values must be bounded (route templates, status codes), each one keeps a metric forever
+    """
+
+    def __init__(self, label_names: Tuple[str, ...], factory: Callable[[], MetricType]):
+        self.label_names = label_names
+        self.factory = factory
+        self._metrics: Dict[Tuple[str, ...], MetricType] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> MetricType:
+        metric = self._metrics.get(values)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(values, self.factory())
+        return metric
+
+    def items(self) -> List[Tuple[Dict[str, str], MetricType]]:
+        with self._lock:
+            items = sorted(self._metrics.items())
+        return [(dict(zip(self.label_names, values)), metric) for values, metric in items]
+
+
+# path templates of the route endpoints, routes are not changed after startup
+_route_paths: Dict[Any, str] = {}
+
+
+def route_path(scope: Scope) -> str:
+    """
+    Get the path template of the route which handled the request, e.g. `/employer/{id}`.
+    Paths are templates so that labels do not grow with IDs, requests without a route are `unmatched`
+    """
+    endpoint = scope.get("endpoint")
+    router = scope.get("router")
+    if endpoint is None or router is None:
+        return "unmatched"
+    path = _route_paths.get(endpoint)
+    if path is None:
+        paths = (route.path for route in router.routes if getattr(route, "endpoint", None) is endpoint)
+        path = _route_paths[endpoint] = next(paths, "unmatched")
+    return path
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Get the method and path template of the route which handled the request, e.g. `GET /employer/{id}`
+    """
+    return f"{scope['method']} {route_path(scope)}"
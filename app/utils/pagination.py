@@ -0,0 +1,130 @@
+import base64
+import binascii
+import heapq
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+
+from app.utils.exceptions.common_exceptions import HTTPBadRequestException
+
+QueryType = TypeVar("QueryType", Query, Select)
+
+# sort parameter of search results ordered by relevance
+SEARCH_RANK = "rank"
+
+
+def encode_cursor(order_by: str, value: Any, obj_id: int) -> str:
+    """
+    Get opaque keyset cursor pointing right after the row with given sort value and ID
+    """
+    if isinstance(value, date):
+        value = value.isoformat()
+    data = json.dumps([order_by, value, obj_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    """
+    Get sort parameter, sort value and ID from keyset cursor
+    """
+    try:
+        order_by, value, obj_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPBadRequestException(detail="Invalid cursor")
+    if not isinstance(order_by, str) or not isinstance(obj_id, int):
+        raise HTTPBadRequestException(detail="Invalid cursor")
+    return order_by, value, obj_id
+
+
+def rank_cursor(after: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    Get the rank key of the last search result of the previous page: rank category, value length and ID.
+    Relevance is not stored in the table, so rank cursor keeps the rank of the row (see search_index.rank)
+    """
+    if not after:
+        return None
+    order_by, value, obj_id = decode_cursor(after)
+    if (
+        order_by != SEARCH_RANK
+        or not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(item, int) and item >= 0 for item in value)
+    ):
+        raise HTTPBadRequestException(detail="Invalid cursor")
+    return value[0], value[1], obj_id
+
+
+def keyset_paginate(model: Any, query: QueryType, after: Optional[str], order_by: str = "id") -> QueryType:
+    """
+    Order the query (ORM query or select) by indexed column and ID, and seek past the row encoded in keyset cursor.
+    Unlike offset, seeking costs the same for any page depth
+    """
+    column = _sort_column(model, order_by)
+    sort_column, id_column = getattr(model, order_by), model.id
+    if after:
+        cursor_order_by, value, last_id = decode_cursor(after)
+        if cursor_order_by != order_by:
+            raise HTTPBadRequestException(detail="Invalid cursor")
+        if column.primary_key:
+            query = query.filter(id_column > last_id)
+        elif value is None:
+            # NULLs are sorted first, so the rest of NULLs and all NOT NULLs remain
+            query = query.filter(
+                or_(and_(sort_column.is_(None), id_column > last_id), sort_column.isnot(None))
+            )
+        else:
+            value = _parse_cursor_value(column, value)
+            query = query.filter(
+                or_(sort_column > value, and_(sort_column == value, id_column > last_id))
+            )
+    if column.primary_key:
+        return query.order_by(id_column)
+    return query.order_by(sort_column, id_column)
+
+
+def keyset_page(
+    model: Any, objs: Iterable[Any], after: Optional[str], order_by: str = "id", limit: int = 100, skip: int = 0
+) -> List[Any]:
+    """
+    Get the page of objects held in memory, sorted and sought like `keyset_paginate` does in the database
+    """
+    column = _sort_column(model, order_by)
+
+    def sort_key(obj: Any) -> Tuple:
+        value = getattr(obj, order_by)
+        # NULLs are sorted first
+        return value is not None, value, obj.id
+
+    if after:
+        cursor_order_by, value, last_id = decode_cursor(after)
+        if cursor_order_by != order_by:
+            raise HTTPBadRequestException(detail="Invalid cursor")
+        if value is not None:
+            value = _parse_cursor_value(column, value)
+        cursor_key = (value is not None, value, last_id)
+        objs = (obj for obj in objs if sort_key(obj) > cursor_key)
+        skip = 0
+    return heapq.nsmallest(skip + limit, objs, key=sort_key)[skip:]
+
+
+def _sort_column(model: Any, order_by: str) -> Any:
+    column = model.__table__.columns.get(order_by)
+    if column is None or not (column.primary_key or column.index or column.unique):
+        raise HTTPBadRequestException(detail="Invalid sort parameter")
+    return column
+
+
+def _parse_cursor_value(column: Any, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
+    except (NotImplementedError, TypeError, ValueError):
+        raise HTTPBadRequestException(detail="Invalid cursor")
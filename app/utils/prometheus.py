@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from anyio.abc import CapacityLimiter
+
+from app.db.pool import PoolMetrics, async_pool_metrics, pool_metrics
+from app.db.query_stats import QueryMetrics, query_metrics
+from app.db.session_purge import SessionPurge, session_purge
+from app.security.passwords import PasswordHasher, password_hasher
+from app.utils.http_metrics import CompressionMetrics, HTTPMetrics, compression_metrics, http_metrics
+from app.utils.metrics import Counter, Family, Histogram
+
+# the response adds the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+Labels = Optional[Dict[str, str]]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusWriter:
+    """
+    Write metrics in the Prometheus text exposition format, one HELP/TYPE header per metric name
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def header(self, name: str, kind: str, description: str) -> None:
+        self.lines.append(f"# HELP {name} {escape(description)}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: Union[int, float], labels: Labels = None) -> None:
+        self.lines.append(f"{name}{format_labels(labels)} {value}")
+
+    def gauge(self, name: str, description: str, samples: Iterable[Tuple[Labels, Union[int, float]]]) -> None:
+        self.header(name, "gauge", description)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def counter(self, name: str, description: str, samples: Iterable[Tuple[Labels, Union[int, float]]]) -> None:
+        self.header(name, "counter", description)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def histogram(self, name: str, description: str, samples: Iterable[Tuple[Labels, Histogram]]) -> None:
+        self.header(name, "histogram", description)
+        for labels, histogram in samples:
+            for bound, count in histogram.cumulative().items():
+                self.sample(f"{name}_bucket", count, {**(labels or {}), "le": bound})
+            self.sample(f"{name}_sum", histogram.sum, labels)
+            self.sample(f"{name}_count", histogram.count, labels)
+
+    def counter_family(self, name: str, description: str, family: Family[Counter]) -> None:
+        self.counter(name, description, ((labels, counter.value) for labels, counter in family.items()))
+
+    def histogram_family(self, name: str, description: str, family: Family[Histogram]) -> None:
+        self.histogram(name, description, family.items())
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def write_http_metrics(writer: PrometheusWriter, metrics: HTTPMetrics) -> None:
+    writer.gauge("http_requests_in_flight", "Requests being served", [(None, metrics.in_flight.value)])
+    writer.counter_family("http_requests_total", "Requests by route and status", metrics.requests)
+    writer.histogram_family(
+        "http_request_duration_seconds", "Request latency by route, until the last body chunk", metrics.duration
+    )
+    writer.histogram_family("http_response_size_bytes", "Response body size by route", metrics.response_size)
+    writer.counter_family("http_exceptions_total", "Exceptions raised by route handlers by class", metrics.exceptions)
+
+
+def write_compression_metrics(writer: PrometheusWriter, metrics: CompressionMetrics) -> None:
+    writer.counter_family("http_compressed_responses_total", "Compressed responses by encoding", metrics.responses)
+    writer.counter_family(
+        "http_compression_identity_bytes_total", "Response bytes before compression by encoding", metrics.identity_bytes
+    )
+    writer.counter_family(
+        "http_compression_encoded_bytes_total", "Response bytes after compression by encoding", metrics.encoded_bytes
+    )
+    writer.counter_family(
+        "http_compression_cpu_seconds_total", "CPU time spent compressing responses by encoding", metrics.cpu_time
+    )
+    writer.counter_family(
+        "http_compression_skipped_total",
+        "Responses sent uncompressed to a client accepting compression by reason",
+        metrics.skipped,
+    )
+
+
+def write_pool_metrics(writer: PrometheusWriter, pools: Iterable[PoolMetrics]) -> None:
+    pools = [metrics for metrics in pools if metrics.engine is not None]
+    stats = [({"pool": metrics.name}, metrics.stats()) for metrics in pools]
+    for key, description in (
+        ("size", "Connections kept in the pool"),
+        ("checked_out", "Connections in use"),
+        ("checked_in", "Idle connections in the pool"),
+        ("overflow", "Connections over the pool size, negative while the pool is not filled"),
+    ):
+        writer.gauge(
+            f"db_pool_{key}", description, [(labels, value[key]) for labels, value in stats if value[key] is not None]
+        )
+    writer.counter("db_pool_checkouts_total", "Connection checkouts", [(labels, v["checkouts"]) for labels, v in stats])
+    writer.counter(
+        "db_pool_timeouts_total", "Checkouts failed on pool timeout", [(labels, v["timeouts"]) for labels, v in stats]
+    )
+    writer.histogram(
+        "db_pool_wait_seconds",
+        "Checkout wait time, new connections included",
+        [({"pool": metrics.name}, metrics.wait_time) for metrics in pools],
+    )
+
+
+def write_query_metrics(writer: PrometheusWriter, metrics: QueryMetrics) -> None:
+    writer.histogram("db_statements_per_request", "Statements per request", [(None, metrics.queries)])
+    writer.histogram("db_time_per_request_seconds", "Time spent in the database per request", [(None, metrics.db_time)])
+    writer.counter(
+        "db_repeated_statement_requests_total",
+        "Requests with a repeated statement (N+1) by route",
+        [({"route": route}, counter.value) for route, counter in sorted(metrics.repeated.items())],
+    )
+
+
+def write_session_purge_metrics(writer: PrometheusWriter, purge: SessionPurge) -> None:
+    writer.counter("db_session_purges_total", "Purges of expired and logged out sessions", [(None, purge.runs.value)])
+    writer.counter(
+        "db_session_purge_failures_total", "Purges failed on a database error", [(None, purge.failures.value)]
+    )
+    writer.counter("db_session_purge_batches_total", "DELETE statements of the purges", [(None, purge.batches.value)])
+    writer.counter_family("db_sessions_purged_total", "Deleted sessions by reason", purge.purged)
+    writer.histogram("db_session_purge_duration_seconds", "Purge duration", [(None, purge.duration)])
+    writer.histogram(
+        "db_session_purge_batch_duration_seconds",
+        "Duration of one purge batch, its transaction included",
+        [(None, purge.batch_duration)],
+    )
+
+
+def write_threadpool_metrics(writer: PrometheusWriter, limiter: CapacityLimiter, hasher: PasswordHasher) -> None:
+    statistics = limiter.statistics()
+    writer.gauge("threadpool_threads", "Threads of the threadpool", [(None, statistics.total_tokens)])
+    writer.gauge("threadpool_threads_busy", "Busy threads of the threadpool", [(None, statistics.borrowed_tokens)])
+    writer.gauge("threadpool_tasks_waiting", "Tasks waiting for a thread", [(None, statistics.tasks_waiting)])
+    writer.gauge("password_hasher_workers", "Processes of the password hashing pool", [(None, hasher.workers)])
+    writer.gauge("password_hasher_pending", "Running and queued password hashing jobs", [(None, hasher.pending)])
+
+
+def render_metrics(limiter: CapacityLimiter) -> str:
+    """
+    Get the metrics of the process in the Prometheus text format, the limiter is the one of the threadpool
+    """
+    writer = PrometheusWriter()
+    write_http_metrics(writer, http_metrics)
+    write_compression_metrics(writer, compression_metrics)
+    write_pool_metrics(writer, (pool_metrics, async_pool_metrics))
+    write_query_metrics(writer, query_metrics)
+    write_session_purge_metrics(writer, session_purge)
+    write_threadpool_metrics(writer, limiter, password_hasher)
+    return writer.text()
@@ -0,0 +1,49 @@
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Optional, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.utils.serializers import serialize_many
+
+try:
+    import orjson
+except ImportError:  # the standard library encoder is used instead
+    orjson = None
+
+
+def encode_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson if installed, dates and datetimes are encoded natively
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=encode_default)
+        return json.dumps(content, default=encode_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SerializedResponse(FastJSONResponse):
+    """
+    List of ORM objects serialized with the precompiled serializer of the response schema, skipping the validation
+    and jsonable_encoder of the response model. The schema should be the response model of the route for the docs
+    """
+
+    def __init__(
+        self,
+        objs: Iterable[Any],
+        schema: Type[BaseModel],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(serialize_many(schema, objs), status_code, headers)
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Type
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+from pydantic.utils import lenient_issubclass
+
+Serializer = Callable[[Any], Dict[str, Any]]
+
+
+def to_date(value: Any) -> Any:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def field_expression(field: ModelField, value: str, namespace: Dict[str, Any]) -> str:
+    """
+    Get the expression converting the attribute value like the validation of the field would
+    """
+    if lenient_issubclass(field.type_, BaseModel) and field.shape in (SHAPE_SINGLETON, SHAPE_LIST):
+        name = f"serialize_{field.name}"
+        namespace[name] = serializer(field.type_)
+        if field.shape == SHAPE_LIST:
+            return f"None if {value} is None else [{name}(item) for item in {value}]"
+        return f"None if {value} is None else {name}({value})"
+    if field.shape == SHAPE_SINGLETON and field.type_ is date:
+        return f"to_date({value})"
+    return value
+
+
+def compile_serializer(schema: Type[BaseModel]) -> Serializer:
+    """
+    Generate a function building the dict of the schema from the attributes of an ORM object, without validation.
+    Only for trusted objects, e.g. rows of the database, with the response schema of their own model
+    """
+    namespace: Dict[str, Any] = {"to_date": to_date}
+    lines = []
+    items = []
+    for field in schema.__fields__.values():
+        value = f"obj.{field.name}"
+        expression = field_expression(field, value, namespace)
+        if expression != value:
+            lines.append(f"    {field.name} = {value}")
+            expression = field_expression(field, field.name, namespace)
+        items.append(f"{field.alias!r}: {expression}")
+    source = "def serialize(obj):\n" + "".join(f"{line}\n" for line in lines)
+    source += "    return {" + ", ".join(items) + "}\n"
+    exec(compile(source, f"<serializer of {schema.__name__}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+@lru_cache(maxsize=None)
+def serializer(schema: Type[BaseModel]) -> Serializer:
+    return compile_serializer(schema)
+
+
+def serialize_many(schema: Type[BaseModel], objs: Iterable[Any]) -> List[Dict[str, Any]]:
+    serialize = serializer(schema)
+    return [serialize(obj) for obj in objs]
@@ -27,3 +27,6 @@ GO
 
 ALTER TABLE [dbo].[employee] ADD CONSTRAINT [FK__employee__user__id] FOREIGN KEY ([user_id]) REFERENCES [dbo].[user] ([id]) ON DELETE CASCADE
 GO
+
+CREATE NONCLUSTERED INDEX [ix_employee_employer_id] ON [dbo].[employee] ([employer_id])
+GO
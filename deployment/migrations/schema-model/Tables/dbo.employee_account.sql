@@ -24,3 +24,6 @@ GO
 
 ALTER TABLE [dbo].[employee_account] ADD CONSTRAINT [FK__employee_account__account_type__id] FOREIGN KEY ([account_type_id]) REFERENCES [dbo].[account_type] ([id])
 GO
+
+CREATE NONCLUSTERED INDEX [ix_employee_account_employee_id] ON [dbo].[employee_account] ([employee_id])
+GO
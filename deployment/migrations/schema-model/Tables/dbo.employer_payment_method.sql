@@ -21,3 +21,6 @@ GO
 
 ALTER TABLE [dbo].[employer_payment_method] ADD CONSTRAINT [FK__employer_payment_method__bank__id] FOREIGN KEY ([bank_id]) REFERENCES [dbo].[bank] ([id]) ON DELETE CASCADE
 GO
+
+CREATE NONCLUSTERED INDEX [ix_employer_payment_method_employer_id] ON [dbo].[employer_payment_method] ([employer_id])
+GO
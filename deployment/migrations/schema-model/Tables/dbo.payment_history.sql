@@ -6,6 +6,8 @@ CREATE TABLE [dbo].[payment_history]
 [employee_account_id] [int] NULL,
 [employer_payment_method_id] [int] NULL,
 [payment_status_type_id] [int] NULL,
+[run_date] [date] NULL,
+[payment_type] [varchar] (50) NULL
 )
 GO
 
@@ -23,3 +25,6 @@ GO
 
 ALTER TABLE [dbo].[payment_history] ADD CONSTRAINT [FK__payment_history__payment_status_type__id] FOREIGN KEY ([payment_status_type_id]) REFERENCES [dbo].[payment_status_type] ([id])
 GO
+
+CREATE NONCLUSTERED INDEX [ix_payment_history_employee_account_id_run_date_payment_type] ON [dbo].[payment_history] ([employee_account_id], [run_date], [payment_type])
+GO
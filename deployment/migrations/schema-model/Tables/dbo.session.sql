@@ -2,6 +2,7 @@ CREATE TABLE [dbo].[session]
 (
 [id] [int] NOT NULL IDENTITY(1, 1),
 [token] [varchar] (400) NULL,
+[token_digest] [binary] (32) NULL,
 [creation_date] [datetime] NULL,
 [status] [varchar] (50) NULL,
 [user_id] [int] NULL
@@ -14,5 +15,11 @@ GO
 CREATE NONCLUSTERED INDEX [ix_session_id] ON [dbo].[session] ([id])
 GO
 
+CREATE NONCLUSTERED INDEX [ix_session_token_digest] ON [dbo].[session] ([token_digest])
+GO
+
+CREATE NONCLUSTERED INDEX [ix_session_user_id_creation_date] ON [dbo].[session] ([user_id], [creation_date] DESC)
+GO
+
 ALTER TABLE [dbo].[session] ADD CONSTRAINT [FK__session__user__id] FOREIGN KEY ([user_id]) REFERENCES [dbo].[user] ([id])
 GO
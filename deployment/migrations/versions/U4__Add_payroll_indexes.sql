@@ -0,0 +1,11 @@
+DROP INDEX [ix_employee_employer_id] ON [dbo].[employee]
+GO
+
+DROP INDEX [ix_employee_account_employee_id] ON [dbo].[employee_account]
+GO
+
+DROP INDEX [ix_employer_payment_method_employer_id] ON [dbo].[employer_payment_method]
+GO
+
+DROP INDEX [ix_payment_history_employee_account_id_creation_date] ON [dbo].[payment_history]
+GO
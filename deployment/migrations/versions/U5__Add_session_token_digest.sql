@@ -0,0 +1,8 @@
+DROP INDEX [ix_session_user_id_creation_date] ON [dbo].[session]
+GO
+
+DROP INDEX [ix_session_token_digest] ON [dbo].[session]
+GO
+
+ALTER TABLE [dbo].[session] DROP COLUMN [token_digest]
+GO
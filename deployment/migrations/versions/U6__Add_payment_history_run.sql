@@ -0,0 +1,8 @@
+CREATE NONCLUSTERED INDEX [ix_payment_history_employee_account_id_creation_date] ON [dbo].[payment_history] ([employee_account_id], [creation_date])
+GO
+
+DROP INDEX [ix_payment_history_employee_account_id_run_date_payment_type] ON [dbo].[payment_history]
+GO
+
+ALTER TABLE [dbo].[payment_history] DROP COLUMN [run_date], [payment_type]
+GO
@@ -0,0 +1,11 @@
+CREATE NONCLUSTERED INDEX [ix_employee_employer_id] ON [dbo].[employee] ([employer_id])
+GO
+
+CREATE NONCLUSTERED INDEX [ix_employee_account_employee_id] ON [dbo].[employee_account] ([employee_id])
+GO
+
+CREATE NONCLUSTERED INDEX [ix_employer_payment_method_employer_id] ON [dbo].[employer_payment_method] ([employer_id])
+GO
+
+CREATE NONCLUSTERED INDEX [ix_payment_history_employee_account_id_creation_date] ON [dbo].[payment_history] ([employee_account_id], [creation_date])
+GO
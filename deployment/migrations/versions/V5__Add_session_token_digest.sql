@@ -0,0 +1,23 @@
+ALTER TABLE [dbo].[session] ADD [token_digest] [binary] (32) NULL
+GO
+
+UPDATE [dbo].[session] SET [token_digest] = HASHBYTES('SHA2_256', [token]) WHERE [token] IS NOT NULL
+GO
+
+-- sessions are looked up by token now, the sessions replaced by a later login are logged out explicitly
+UPDATE [s] SET [status] = 'logged-out'
+FROM [dbo].[session] [s]
+WHERE [s].[status] = 'logged-in'
+    AND EXISTS (
+        SELECT 1 FROM [dbo].[session] [later]
+        WHERE [later].[user_id] = [s].[user_id]
+            AND ([later].[creation_date] > [s].[creation_date]
+                OR ([later].[creation_date] = [s].[creation_date] AND [later].[id] > [s].[id]))
+    )
+GO
+
+CREATE NONCLUSTERED INDEX [ix_session_token_digest] ON [dbo].[session] ([token_digest])
+GO
+
+CREATE NONCLUSTERED INDEX [ix_session_user_id_creation_date] ON [dbo].[session] ([user_id], [creation_date] DESC)
+GO
@@ -0,0 +1,10 @@
+ALTER TABLE [dbo].[payment_history] ADD [run_date] [date] NULL, [payment_type] [varchar] (50) NULL
+GO
+
+-- payments of a payroll run are unique by account, run date and payment type, the payments created before
+-- are not part of a run and keep NULL
+CREATE NONCLUSTERED INDEX [ix_payment_history_employee_account_id_run_date_payment_type] ON [dbo].[payment_history] ([employee_account_id], [run_date], [payment_type])
+GO
+
+DROP INDEX [ix_payment_history_employee_account_id_creation_date] ON [dbo].[payment_history]
+GO